@@ -16,9 +16,18 @@ from app.database import Base
 
 # Import all models to ensure they are registered with SQLAlchemy
 from app.users.models import User
-from app.employees.models import Employee
+from app.auth.models import TokenRevocation
+from app.employees.models import Employee, EmployeeArchive
 from app.departments.models import Department
 from app.positions.models import Position
+from app.idempotency.models import IdempotencyRecord
+from app.changes.models import Tombstone
+from app.events.models import OutboxEvent, WebhookEndpoint
+from app.audit.models import AuditRecord
+from app.attendance.models import Punch
+from app.leave.models import LeaveType, LeaveRequest, LeaveLedgerEntry, LeaveBalance
+from app.jobs.models import Job
+from app.counts.models import RowCount
 
 # this is the Alembic Config object
 config = context.config
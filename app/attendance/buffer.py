@@ -0,0 +1,187 @@
+"""
+Group commit of attendance punches.
+
+At shift start thousands of punches arrive per minute. Instead of one
+INSERT and commit per request, punches are appended to an in-memory buffer
+and a flusher task writes everything buffered in a single multi-row INSERT
+every ATTENDANCE_FLUSH_INTERVAL_MS (sooner when ATTENDANCE_BATCH_SIZE
+punches are waiting). Each request waits for the commit that contains its
+punch, so an acknowledged punch is always durable; a failed batch fails
+every request in it and clients retry.
+
+A repeated punch of the same type by the same employee within
+ATTENDANCE_DEDUPE_SECONDS is acknowledged as a duplicate without being
+stored. That check is per process; across processes the unique constraint
+on (employee_id, punch_type, punched_at) still turns replays into no-ops.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple, Union
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.attendance import models
+from app.attendance.schemas import PunchStatus, PunchType
+from app.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Forget per-employee dedupe state for punches older than the window once
+# this many employees are tracked
+DEDUPE_PRUNE_THRESHOLD = 10000
+
+
+class PunchBuffer:
+    """In-memory punch buffer flushed in batched INSERTs."""
+    
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.metrics = {"recorded": 0, "duplicates": 0, "batches": 0, "largest_batch": 0}
+        self._last: Dict[int, Tuple[PunchType, datetime]] = {}
+        self._reset()
+    
+    def _reset(self) -> None:
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._reset()
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+    
+    async def submit(
+        self,
+        employee_id: int,
+        punch_type: PunchType,
+        punched_at: Optional[datetime] = None
+    ) -> Tuple[PunchStatus, datetime]:
+        """
+        Buffer a punch and wait until it is committed.
+        
+        Returns:
+            Whether the punch was recorded or was a duplicate, and its time
+            
+        Raises:
+            HTTPException: 400 if the punch cannot be stored
+        """
+        if punched_at is None:
+            punched_at = datetime.now(timezone.utc)
+        if punched_at.tzinfo is not None:
+            punched_at = punched_at.astimezone(timezone.utc).replace(tzinfo=None)
+        
+        window = timedelta(seconds=settings.ATTENDANCE_DEDUPE_SECONDS)
+        last = self._last.get(employee_id)
+        if last is not None and last[0] == punch_type and abs(punched_at - last[1]) < window:
+            self.metrics["duplicates"] += 1
+            return PunchStatus.DUPLICATE, last[1]
+        self._last[employee_id] = (punch_type, punched_at)
+        
+        self._ensure_running()
+        future = self._loop.create_future()
+        self._pending.append((
+            {"employee_id": employee_id, "punch_type": models.PunchType(punch_type), "punched_at": punched_at},
+            future,
+        ))
+        self._wakeup.set()
+        try:
+            return await future, punched_at
+        except Exception:
+            # Let the client's retry through the dedupe check
+            if self._last.get(employee_id) == (punch_type, punched_at):
+                del self._last[employee_id]
+            raise
+    
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if len(self._pending) < settings.ATTENDANCE_BATCH_SIZE:
+                await asyncio.sleep(settings.ATTENDANCE_FLUSH_INTERVAL_MS / 1000)
+            while self._pending:
+                batch = self._pending[:settings.ATTENDANCE_BATCH_SIZE]
+                self._pending = self._pending[settings.ATTENDANCE_BATCH_SIZE:]
+                await self._flush(batch)
+            self._wakeup.clear()
+            self._prune()
+    
+    async def _flush(self, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+        rows = [row for row, _ in batch]
+        try:
+            results = await run_in_threadpool(self._write, rows)
+        except Exception as exc:
+            logger.exception("Writing %d attendance punches failed", len(rows))
+            results = [exc] * len(rows)
+        
+        self.metrics["batches"] += 1
+        self.metrics["largest_batch"] = max(self.metrics["largest_batch"], len(rows))
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    def _write(self, rows: List[dict]) -> List[Union[PunchStatus, Exception]]:
+        db = self.session_factory()
+        try:
+            try:
+                db.execute(insert(models.Punch), rows)
+                db.commit()
+                self.metrics["recorded"] += len(rows)
+                return [PunchStatus.RECORDED] * len(rows)
+            except IntegrityError:
+                db.rollback()
+            
+            # Isolate the rows that violate a constraint
+            results = []
+            for row in rows:
+                try:
+                    db.execute(insert(models.Punch), [row])
+                    db.commit()
+                    self.metrics["recorded"] += 1
+                    results.append(PunchStatus.RECORDED)
+                except IntegrityError:
+                    db.rollback()
+                    existing = db.query(models.Punch.id).filter_by(**row).first()
+                    if existing is not None:
+                        self.metrics["duplicates"] += 1
+                        results.append(PunchStatus.DUPLICATE)
+                    else:
+                        results.append(HTTPException(status_code=400, detail="Employee not found"))
+            return results
+        finally:
+            db.close()
+    
+    def _prune(self) -> None:
+        if len(self._last) < DEDUPE_PRUNE_THRESHOLD:
+            return
+        horizon = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            seconds=settings.ATTENDANCE_DEDUPE_SECONDS
+        )
+        self._last = {
+            employee_id: last for employee_id, last in self._last.items() if last[1] >= horizon
+        }
+    
+    async def aclose(self) -> None:
+        """Flush buffered punches and stop the flusher."""
+        if self._task is None:
+            return
+        while self._pending and not self._task.done():
+            await asyncio.sleep(settings.ATTENDANCE_FLUSH_INTERVAL_MS / 1000)
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._reset()
+
+
+punch_buffer = PunchBuffer()
@@ -0,0 +1,30 @@
+"""
+SQLAlchemy attendance punch model.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Enum as SQLEnum, Index, UniqueConstraint
+import enum
+from app.database import Base
+
+
+class PunchType(str, enum.Enum):
+    """Punch type enum."""
+    IN = "in"
+    OUT = "out"
+
+
+class Punch(Base):
+    """A single clock-in or clock-out of an employee."""
+    
+    __tablename__ = "attendance_punches"
+    __table_args__ = (
+        # Makes a replayed batch insert a no-op rather than a second punch
+        UniqueConstraint("employee_id", "punch_type", "punched_at", name="uq_attendance_punches_punch"),
+        Index("ix_attendance_punches_punched_at", "punched_at", "employee_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+    punch_type = Column(SQLEnum(PunchType), nullable=False)
+    punched_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
@@ -0,0 +1,74 @@
+"""
+Attendance API routes.
+"""
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.attendance import schemas, service
+from app.attendance.buffer import punch_buffer
+from app.database import get_db
+from app.dependencies import get_current_active_user
+from app.users.schemas import User
+
+router = APIRouter(prefix="/attendance", tags=["attendance"])
+
+
+@router.post("/punches", response_model=schemas.PunchAck, status_code=status.HTTP_201_CREATED)
+async def create_punch(
+    punch: schemas.PunchCreate,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Clock an employee in or out.
+    
+    The punch is written together with other concurrent punches in one
+    batched INSERT; the response is only sent once that batch is committed.
+    A repeated punch of the same type within ATTENDANCE_DEDUPE_SECONDS is
+    acknowledged with status ``duplicate`` and not stored again.
+    
+    Args:
+        punch: Punch data
+        current_user: Current authenticated user
+        
+    Returns:
+        Punch acknowledgement
+    """
+    punch_status, punched_at = await punch_buffer.submit(
+        punch.employee_id, punch.punch_type, punch.punched_at
+    )
+    return schemas.PunchAck(
+        employee_id=punch.employee_id,
+        punch_type=punch.punch_type,
+        punched_at=punched_at,
+        status=punch_status,
+    )
+
+
+@router.get("/punches", response_model=List[schemas.Punch])
+async def list_punches(
+    employee_id: Optional[int] = Query(None),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    List punches in time order.
+    
+    Args:
+        employee_id: Filter by employee ID
+        start: Only punches at or after this time
+        end: Only punches before this time
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        List of punches
+    """
+    return service.AttendanceService.get_punches(db, employee_id, start, end, skip, limit)
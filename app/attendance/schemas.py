@@ -0,0 +1,45 @@
+"""
+Pydantic schemas for attendance punches.
+"""
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from enum import Enum
+
+
+class PunchType(str, Enum):
+    """Punch type enum."""
+    IN = "in"
+    OUT = "out"
+
+
+class PunchStatus(str, Enum):
+    """Outcome of a submitted punch."""
+    RECORDED = "recorded"
+    DUPLICATE = "duplicate"
+
+
+class PunchCreate(BaseModel):
+    """Schema for submitting a punch; punched_at defaults to the server time."""
+    employee_id: int
+    punch_type: PunchType
+    punched_at: Optional[datetime] = None
+
+
+class PunchAck(BaseModel):
+    """Acknowledgement returned once a punch is durably stored."""
+    employee_id: int
+    punch_type: PunchType
+    punched_at: datetime
+    status: PunchStatus
+
+
+class Punch(BaseModel):
+    """Schema for punch response."""
+    id: int
+    employee_id: int
+    punch_type: PunchType
+    punched_at: datetime
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,35 @@
+"""
+Attendance service layer for business logic.
+"""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.orm import Session
+
+from app.attendance import models
+
+
+class AttendanceService:
+    """Service class for attendance operations."""
+    
+    @staticmethod
+    def get_punches(
+        db: Session,
+        employee_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[models.Punch]:
+        """Get punches in time order, optionally for one employee and a [start, end) range."""
+        query = db.query(models.Punch)
+        
+        if employee_id:
+            query = query.filter(models.Punch.employee_id == employee_id)
+        
+        if start:
+            query = query.filter(models.Punch.punched_at >= start)
+        
+        if end:
+            query = query.filter(models.Punch.punched_at < end)
+        
+        return query.order_by(models.Punch.punched_at, models.Punch.id).offset(skip).limit(limit).all()
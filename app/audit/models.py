@@ -0,0 +1,33 @@
+"""
+SQLAlchemy model for the audit trail.
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from app.database import Base
+
+
+class AuditRecord(Base):
+    """
+    Append-only record of one change to one field.
+    
+    Rows are only updated to redact personal data when a retention purge
+    removes it from the audited row. ``period`` (YYYYMM of ``changed_at``) is an
+    indexed month bucket, so retention purges delete whole months by index
+    range. The table itself is not partitioned.
+    """
+    
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_period", "period"),
+        Index("ix_audit_log_entity", "entity", "entity_id", "changed_at"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    period = Column(Integer, nullable=False)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    action = Column(String(20), nullable=False)
+    field = Column(String(100), nullable=True)
+    old_value = Column(Text, nullable=True)
+    new_value = Column(Text, nullable=True)
+    actor_id = Column(Integer, nullable=True)
+    changed_at = Column(DateTime, nullable=False)
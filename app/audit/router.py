@@ -0,0 +1,41 @@
+"""
+Audit trail API routes.
+"""
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.audit import schemas
+from app.audit.service import AuditService
+from app.database import get_db
+from app.dependencies import get_current_superuser
+from app.users.schemas import User
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+
+@router.get("/employees/{employee_id}", response_model=List[schemas.AuditRecord])
+async def get_employee_history(
+    employee_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+):
+    """
+    Get the field-level change history of an employee, newest first.
+    
+    Records are written asynchronously, so a change can take up to
+    AUDIT_FLUSH_INTERVAL_SECONDS to appear.
+    
+    Args:
+        employee_id: Employee ID
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        db: Database session
+        current_user: Current superuser
+        
+    Returns:
+        List of audit records
+    """
+    return AuditService.get_history(db, "employee", employee_id, skip, limit)
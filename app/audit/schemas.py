@@ -0,0 +1,21 @@
+"""
+Pydantic schemas for the audit trail.
+"""
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class AuditRecord(BaseModel):
+    """Schema for audit record response."""
+    id: int
+    entity: str
+    entity_id: int
+    action: str
+    field: Optional[str] = None
+    old_value: Optional[str] = None
+    new_value: Optional[str] = None
+    actor_id: Optional[int] = None
+    changed_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
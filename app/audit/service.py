@@ -0,0 +1,136 @@
+"""
+Audit trail service layer.
+"""
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydantic_core import to_jsonable_python
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.audit import models
+from app.audit.writer import audit_writer
+from app.config import settings
+
+
+def _encode(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return json.dumps(to_jsonable_python(value))
+
+
+def period_of(moment: datetime) -> int:
+    """Partition key (YYYYMM) for a timestamp."""
+    return moment.year * 100 + moment.month
+
+
+class AuditService:
+    """Service class for audit trail operations."""
+    
+    @staticmethod
+    def record(
+        entity: str,
+        entity_id: int,
+        action: str,
+        actor_id: Optional[int],
+        changes: Optional[Dict[str, tuple]] = None,
+        snapshot: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Queue audit records for one change; they are written asynchronously.
+        
+        Updates produce one record per field whose value actually changed.
+        Creates and deletes produce a single record holding the full row.
+        
+        Args:
+            entity: Entity name, e.g. ``employee``
+            entity_id: ID of the changed row
+            action: ``create``, ``update`` or ``delete``
+            actor_id: ID of the user making the change
+            changes: Field name to (old value, new value) for updates
+            snapshot: Row contents for creates and deletes
+        """
+        if not settings.AUDIT_ENABLED:
+            return
+        
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        base = {
+            "period": period_of(now),
+            "entity": entity,
+            "entity_id": entity_id,
+            "action": action,
+            "actor_id": actor_id,
+            "changed_at": now,
+        }
+        if changes is None:
+            encoded = _encode(snapshot)
+            audit_writer.submit([{
+                **base,
+                "field": None,
+                "old_value": encoded if action == "delete" else None,
+                "new_value": encoded if action != "delete" else None,
+            }])
+            return
+        
+        audit_writer.submit([
+            {**base, "field": field, "old_value": _encode(old), "new_value": _encode(new)}
+            for field, (old, new) in changes.items()
+            if old != new
+        ])
+    
+    @staticmethod
+    def diff(previous: Any, update_data: Dict[str, Any]) -> Dict[str, tuple]:
+        """Pair each updated field's loaded value with its new value."""
+        return {field: (getattr(previous, field), value) for field, value in update_data.items()}
+    
+    @staticmethod
+    def get_history(
+        db: Session,
+        entity: str,
+        entity_id: int,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[models.AuditRecord]:
+        """Get audit records for an entity, newest first."""
+        return (
+            db.query(models.AuditRecord)
+            .filter(models.AuditRecord.entity == entity, models.AuditRecord.entity_id == entity_id)
+            .order_by(models.AuditRecord.changed_at.desc(), models.AuditRecord.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+    
+    @staticmethod
+    def redact(db: Session, entity: str, entity_ids: List[int], fields: Iterable[str]) -> int:
+        """
+        Clear recorded values of personal fields in the caller's transaction.
+        
+        Records of the given fields lose their old and new values, and
+        create and delete records lose their row snapshot. Who changed what
+        when is kept.
+        
+        Returns:
+            Number of records redacted
+        """
+        record = models.AuditRecord
+        return db.execute(
+            update(record)
+            .where(
+                record.entity == entity,
+                record.entity_id.in_(entity_ids),
+                or_(record.field.is_(None), record.field.in_(list(fields))),
+            )
+            .values(old_value=None, new_value=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    
+    @staticmethod
+    def purge_before(db: Session, period: int) -> int:
+        """Delete whole periods older than ``period`` (YYYYMM) for retention."""
+        deleted = db.query(models.AuditRecord).filter(
+            models.AuditRecord.period < period
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
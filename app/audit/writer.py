@@ -0,0 +1,152 @@
+"""
+Batched background writer for audit records.
+
+Services hand records to an in-process bounded queue, and a writer thread
+inserts them in batches, so an edit does not wait for its audit rows. When
+the queue is full, AUDIT_BACKPRESSURE decides what happens:
+
+- ``block``: the caller waits up to AUDIT_BLOCK_TIMEOUT_SECONDS for space,
+  then writes its records inline. Nothing is lost. Callers on an event loop
+  write inline straight away rather than stall the loop waiting.
+- ``drop``: the records are discarded and counted in ``metrics``.
+
+A batch whose insert fails is kept and written before anything else on the
+next flush, so a database outage delays audit records but never loses them.
+``stop()`` flushes whatever is still queued, and the app calls it on shutdown.
+"""
+import asyncio
+import logging
+import queue
+import threading
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+
+from app.audit import models
+from app.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class AuditWriter:
+    """Bounded queue of audit records with a batching writer thread."""
+    
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=settings.AUDIT_QUEUE_SIZE)
+        self.metrics = {
+            "written": 0, "dropped": 0, "written_inline": 0, "batches": 0, "failed_batches": 0,
+        }
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+        self._write_lock = threading.Lock()
+        self._failed: List[Dict[str, Any]] = []
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def submit(self, records: List[Dict[str, Any]]) -> None:
+        """Queue records for writing, applying the backpressure policy when full."""
+        for index, record in enumerate(records):
+            try:
+                self.queue.put_nowait(record)
+                continue
+            except queue.Full:
+                pass
+            
+            if settings.AUDIT_BACKPRESSURE == "drop":
+                self.metrics["dropped"] += len(records) - index
+                logger.warning("Audit queue full; dropped %d records", len(records) - index)
+                return
+            if not _on_event_loop():
+                try:
+                    self.queue.put(record, timeout=settings.AUDIT_BLOCK_TIMEOUT_SECONDS)
+                    continue
+                except queue.Full:
+                    pass
+            remaining = records[index:]
+            self._write(remaining)
+            self.metrics["written_inline"] += len(remaining)
+            return
+    
+    def flush(self) -> int:
+        """
+        Write everything currently queued.
+        
+        Returns:
+            Number of records written
+        """
+        written = 0
+        while True:
+            batch, self._failed = self._failed, []
+            while len(batch) < settings.AUDIT_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return written
+            try:
+                self._write(batch)
+            except Exception:
+                # Retried first on the next flush
+                self._failed = batch
+                self.metrics["failed_batches"] += 1
+                raise
+            written += len(batch)
+    
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        with self._write_lock:
+            db = self.session_factory()
+            try:
+                db.execute(insert(models.AuditRecord), batch)
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.exception("Writing %d audit records failed", len(batch))
+                raise
+            finally:
+                db.close()
+        self.metrics["written"] += len(batch)
+        self.metrics["batches"] += 1
+    
+    def _run(self) -> None:
+        while not self._stop.wait(settings.AUDIT_FLUSH_INTERVAL_SECONDS):
+            try:
+                self.flush()
+            except Exception:
+                # Already logged; the failed batch is kept for the next flush
+                pass
+        try:
+            self.flush()
+        except Exception:
+            logger.error("Stopping with %d audit records unwritten", len(self._failed) + self.queue.qsize())
+    
+    def start(self) -> None:
+        """Start the writer thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the writer thread after flushing queued records."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+audit_writer = AuditWriter()
@@ -0,0 +1,134 @@
+"""
+Signing keys for access and refresh tokens.
+
+Tokens are signed with the asymmetric key JWT_ACTIVE_KID from
+JWT_SIGNING_KEYS (key ID -> PEM private key file) and tagged with its
+``kid``. Every configured key verifies tokens and is published at
+``/.well-known/jwks.json``, so keys can be rotated by adding a new key,
+making it active, and removing the old one once its tokens have expired.
+
+Tokens without a ``kid`` were signed with SECRET_KEY (HS256) before the
+switch and are accepted while JWT_ACCEPT_HS256 is set. Without configured
+keys, which settings only allow in development, each process signs with an
+ephemeral key.
+"""
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk
+from jose.backends.base import Key
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512")
+
+
+def _generate_pem(algorithm: str) -> bytes:
+    if algorithm.startswith("ES"):
+        curve = {"ES256": ec.SECP256R1(), "ES384": ec.SECP384R1(), "ES512": ec.SECP521R1()}[algorithm]
+        private_key = ec.generate_private_key(curve)
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+class KeyRing:
+    """Parsed signing and verification keys, loaded once per process."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._private: Dict[str, Key] = {}
+        self._public: Dict[str, Key] = {}
+        self._active_kid: Optional[str] = None
+        self._jwks: Optional[Tuple[str, str]] = None
+    
+    @property
+    def asymmetric(self) -> bool:
+        return settings.ALGORITHM in ASYMMETRIC_ALGORITHMS
+    
+    def _load(self) -> None:
+        with self._lock:
+            if self._active_kid is not None:
+                return
+            pems = {
+                kid: Path(path).read_bytes() for kid, path in settings.JWT_SIGNING_KEYS.items()
+            }
+            if not pems:
+                kid = f"ephemeral-{uuid.uuid4().hex[:8]}"
+                logger.warning(
+                    "No JWT_SIGNING_KEYS configured; signing with an ephemeral key %s. "
+                    "Tokens will not survive a restart or verify in other workers.", kid
+                )
+                pems[kid] = _generate_pem(settings.ALGORITHM)
+            for kid, pem in pems.items():
+                private_key = jwk.construct(pem, settings.ALGORITHM)
+                self._private[kid] = private_key
+                self._public[kid] = private_key.public_key()
+            active = settings.JWT_ACTIVE_KID or list(pems)[-1]
+            if active not in self._private:
+                raise ValueError(f"JWT_ACTIVE_KID {active!r} is not in JWT_SIGNING_KEYS")
+            self._active_kid = active
+    
+    def signing_key(self) -> Tuple[str, Key]:
+        """
+        Key that signs new tokens.
+        
+        Returns:
+            Key ID and private key
+        """
+        self._load()
+        return self._active_kid, self._private[self._active_kid]
+    
+    def verification_key(self, kid: str) -> Optional[Key]:
+        """
+        Public key for a token's ``kid``.
+        
+        Args:
+            kid: Key ID from the token header
+            
+        Returns:
+            Public key, or None for an unknown key ID
+        """
+        self._load()
+        return self._public.get(kid)
+    
+    def jwks(self) -> Tuple[str, str]:
+        """
+        Public keys as a JSON Web Key Set.
+        
+        Returns:
+            Serialized key set and its ETag
+        """
+        if self._jwks is None:
+            keys = []
+            if self.asymmetric:
+                self._load()
+                for kid, public_key in self._public.items():
+                    keys.append({**public_key.to_dict(), "kid": kid, "use": "sig"})
+            body = json.dumps({"keys": keys})
+            self._jwks = (body, f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"')
+        return self._jwks
+    
+    def reset(self) -> None:
+        """Forget loaded keys so the next use reads the settings again."""
+        with self._lock:
+            self._private.clear()
+            self._public.clear()
+            self._active_kid = None
+            self._jwks = None
+
+
+key_ring = KeyRing()
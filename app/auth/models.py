@@ -0,0 +1,22 @@
+"""
+SQLAlchemy model for revoked tokens.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime
+from app.database import Base
+
+
+class TokenRevocation(Base):
+    """
+    A revoked token (``jti:<id>``) or user (``user:<id>``).
+    
+    Revoking a user rejects every token issued to them up to ``revoked_at``.
+    Rows are kept until no token they could match is still valid.
+    """
+    
+    __tablename__ = "token_revocations"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(64), nullable=False, index=True)
+    revoked_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,77 @@
+"""
+Cache of authenticated users.
+
+Resolving the user behind a token is the only database access many
+requests need (``/auth/me``, ``/users/me``), so users are kept for
+AUTH_PRINCIPAL_CACHE_SECONDS as detached copies that routes can read
+without a session.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.users.models import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as described by their token's claims."""
+    id: int
+    is_active: bool
+    is_superuser: bool
+
+
+_principals: Dict[int, Tuple[float, User]] = {}
+_lock = threading.Lock()
+
+
+def _detached_copy(user: User) -> User:
+    return User(**{column.name: getattr(user, column.name) for column in User.__table__.columns})
+
+
+def get_principal(db: Session, user_id: int, cached: bool = True) -> Optional[User]:
+    """
+    Get the user a token belongs to, from the cache when possible.
+    
+    Args:
+        db: Database session, only used on a cache miss
+        user_id: User ID from the token subject
+        cached: Whether a cached copy may be returned; the loaded user
+            replaces it either way
+        
+    Returns:
+        User, or None if it does not exist
+    """
+    ttl = settings.AUTH_PRINCIPAL_CACHE_SECONDS
+    now = time.monotonic()
+    if ttl and cached:
+        with _lock:
+            entry = _principals.get(user_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+    
+    user = db.get(User, user_id)
+    if user is None or not ttl:
+        return user
+    principal = _detached_copy(user)
+    with _lock:
+        _principals[user_id] = (now + ttl, principal)
+    return principal
+
+
+def invalidate_principal(user_id: Optional[int] = None) -> None:
+    """
+    Drop a cached user, or every cached user when no ID is given.
+    
+    Args:
+        user_id: User ID to drop
+    """
+    with _lock:
+        if user_id is None:
+            _principals.clear()
+        else:
+            _principals.pop(user_id, None)
@@ -0,0 +1,215 @@
+"""
+Revocation of stateless tokens.
+
+Tokens carry their user's active and superuser flags, so authorizing a
+request needs no database access. Deactivations, role changes and logouts
+are written to the ``token_revocations`` table and mirrored into a Bloom
+filter in every worker. A request only consults the table when its user or
+token ID is possibly in the filter.
+
+Workers pick up each other's revocations every
+AUTH_REVOCATION_REFRESH_SECONDS; revocations made in this worker apply
+immediately. Each refresh also re-reads the revocations from the last
+AUTH_REVOCATION_COMMIT_LAG_SECONDS, since a transaction can commit a row
+with a lower ID after rows with higher IDs were already loaded. Until the first refresh, or when refreshing is disabled,
+every request consults the table.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.auth.models import TokenRevocation
+from app.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys."""
+    
+    def __init__(self, bits: int, hashes: int):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray(math.ceil(bits / 8))
+    
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.bits for i in range(self.hashes))
+    
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._array[position >> 3] |= 1 << (position & 7)
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self._array[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def _utcnow() -> datetime:
+    # Stored DateTime columns are naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _issued_at(claims: Dict[str, Any]) -> Optional[datetime]:
+    issued_at = claims.get("iat")
+    if issued_at is None:
+        return None
+    return datetime.fromtimestamp(issued_at, timezone.utc).replace(tzinfo=None)
+
+
+class RevocationList:
+    """In-memory Bloom filter of revoked keys, backed by the revocation table."""
+    
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._filter = self._new_filter()
+        self._last_id = 0
+        self._loaded_at: Optional[datetime] = None
+        self._rebuilt_at: Optional[datetime] = None
+    
+    @staticmethod
+    def _new_filter() -> BloomFilter:
+        return BloomFilter(settings.AUTH_REVOCATION_BLOOM_BITS, settings.AUTH_REVOCATION_BLOOM_HASHES)
+    
+    @property
+    def loaded(self) -> bool:
+        return self._rebuilt_at is not None
+    
+    def might_contain(self, key: str) -> bool:
+        return not self.loaded or key in self._filter
+    
+    def add(self, keys: List[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._filter.add(key)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._filter = self._new_filter()
+            self._last_id = 0
+            self._loaded_at = None
+            self._rebuilt_at = None
+    
+    def revoke(self, db: Session, key: str, expires_at: datetime) -> None:
+        """
+        Revoke a key as part of the caller's transaction.
+        
+        Args:
+            db: Database session; the caller commits
+            key: ``user:<id>`` or ``jti:<id>``
+            expires_at: When no token the key matches can still be valid
+        """
+        db.add(TokenRevocation(key=key, revoked_at=_utcnow(), expires_at=expires_at))
+        self.add([key])
+    
+    def revoke_user(self, db: Session, user_id: int) -> None:
+        """Revoke every token issued to a user so far."""
+        expires_at = _utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        self.revoke(db, f"user:{user_id}", expires_at)
+    
+    def is_revoked(self, db: Session, claims: Dict[str, Any]) -> bool:
+        """
+        Check token claims against the revocation list.
+        
+        Args:
+            db: Database session, only used when the filter may match
+            claims: Verified token claims
+            
+        Returns:
+            True if the token or every token of its user issued up to it
+            has been revoked
+        """
+        jti = claims.get("jti")
+        if jti is not None and self.might_contain(f"jti:{jti}"):
+            exists = db.query(TokenRevocation.id).filter(
+                TokenRevocation.key == f"jti:{jti}"
+            ).first()
+            if exists is not None:
+                return True
+        
+        user_key = f"user:{claims.get('sub')}"
+        if not self.might_contain(user_key):
+            return False
+        revoked_at = db.query(func.max(TokenRevocation.revoked_at)).filter(
+            TokenRevocation.key == user_key,
+            TokenRevocation.expires_at > _utcnow(),
+        ).scalar()
+        if revoked_at is None:
+            return False
+        issued_at = _issued_at(claims)
+        # iat has whole-second precision, so tokens issued in the same second
+        # as the revocation are rejected too
+        return issued_at is None or issued_at <= revoked_at.replace(microsecond=0)
+    
+    def refresh(self) -> int:
+        """
+        Load revocations written since the last refresh.
+        
+        Revocations from the commit lag window before the last refresh are
+        read again, so rows committed out of ID order are not skipped.
+        
+        Every AUTH_REVOCATION_REBUILD_SECONDS the filter is rebuilt from the
+        unexpired rows and expired rows are deleted, since entries cannot be
+        removed from a Bloom filter.
+        
+        Returns:
+            Number of revocations read
+        """
+        db = self.session_factory()
+        try:
+            now = _utcnow()
+            rebuild = (
+                self._rebuilt_at is None
+                or now - self._rebuilt_at >= timedelta(seconds=settings.AUTH_REVOCATION_REBUILD_SECONDS)
+            )
+            if rebuild:
+                db.query(TokenRevocation).filter(
+                    TokenRevocation.expires_at <= now
+                ).delete(synchronize_session=False)
+                db.commit()
+            query = db.query(TokenRevocation.id, TokenRevocation.key).filter(
+                TokenRevocation.expires_at > now
+            )
+            if not rebuild:
+                lag = timedelta(seconds=settings.AUTH_REVOCATION_COMMIT_LAG_SECONDS)
+                query = query.filter(or_(
+                    TokenRevocation.id > self._last_id,
+                    TokenRevocation.revoked_at >= self._loaded_at - lag,
+                ))
+            rows = query.order_by(TokenRevocation.id).all()
+        finally:
+            db.close()
+        
+        with self._lock:
+            if rebuild:
+                self._filter = self._new_filter()
+                self._rebuilt_at = now
+            for _, key in rows:
+                self._filter.add(key)
+            if rows:
+                self._last_id = max(self._last_id, rows[-1][0])
+            self._loaded_at = now
+        return len(rows)
+    
+    async def run(self) -> None:
+        """Refresh every AUTH_REVOCATION_REFRESH_SECONDS until cancelled."""
+        while True:
+            try:
+                await run_in_threadpool(self.refresh)
+            except Exception:
+                logger.exception("Refreshing token revocations failed")
+            await asyncio.sleep(settings.AUTH_REVOCATION_REFRESH_SECONDS)
+
+
+revocation_list = RevocationList()
@@ -1,12 +1,16 @@
 """
 Authentication API routes.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
+from app.auth.revocation import revocation_list
 from app.database import get_db
-from app.dependencies import get_current_active_user
+from app.dependencies import get_current_user, get_token_claims
 from app.auth import schemas, service
 from app.users import schemas as user_schemas
 from app.users import service as user_service
@@ -80,28 +84,49 @@ async def login(
             detail="Inactive user"
         )
     
-    return service.AuthService.create_tokens(user.id)
+    return service.AuthService.create_tokens(user)
 
 
 @router.post("/refresh", response_model=schemas.Token)
 async def refresh_token(
-    current_user: user_schemas.User = Depends(get_current_active_user),
+    current_user: user_schemas.User = Depends(get_current_user),
 ):
     """
     Refresh access token using a valid refresh token.
     
+    The new tokens carry the user's current active and superuser flags.
+    
     Args:
         current_user: Current authenticated user
         
     Returns:
         New access and refresh tokens
     """
-    return service.AuthService.create_tokens(current_user.id)
+    return service.AuthService.create_tokens(current_user)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    claims: Dict[str, Any] = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke the presented token.
+    
+    Args:
+        claims: Verified token claims
+        db: Database session
+    """
+    if claims.get("jti"):
+        expires_at = datetime.fromtimestamp(claims["exp"], timezone.utc).replace(tzinfo=None)
+        revocation_list.revoke(db, f"jti:{claims['jti']}", expires_at)
+        db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/me", response_model=user_schemas.User)
 async def get_current_user_info(
-    current_user: user_schemas.User = Depends(get_current_active_user),
+    current_user: user_schemas.User = Depends(get_current_user),
 ):
     """
     Get current user information.
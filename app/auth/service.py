@@ -30,22 +30,22 @@ class AuthService:
         return user_service.UserService.authenticate(db, email, password)
     
     @staticmethod
-    def create_tokens(user_id: int) -> schemas.Token:
+    def create_tokens(user: User) -> schemas.Token:
         """
         Create access and refresh tokens for user.
         
+        The tokens carry the user's active and superuser flags so requests
+        can be authorized without loading the user.
+        
         Args:
-            user_id: User ID
+            user: User to issue tokens for
             
         Returns:
             Token object containing access and refresh tokens
         """
-        access_token = utils.create_access_token(
-            data={"sub": str(user_id)}
-        )
-        refresh_token = utils.create_refresh_token(
-            data={"sub": str(user_id)}
-        )
+        claims = {"sub": str(user.id), "active": user.is_active, "su": user.is_superuser}
+        access_token = utils.create_access_token(data=claims)
+        refresh_token = utils.create_refresh_token(data=claims)
         return schemas.Token(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -1,12 +1,22 @@
 """
 JWT token utilities for authentication.
 """
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import jwt
+from fastapi import Request
+from jose import JWTError, jwt
+from app.auth.keys import key_ring
 from app.config import settings
 
 
+def _encode(claims: dict) -> str:
+    if not key_ring.asymmetric:
+        return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    kid, key = key_ring.signing_key()
+    return jwt.encode(claims, key, algorithm=settings.ALGORITHM, headers={"kid": kid})
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token.
@@ -19,14 +29,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         Encoded JWT token
     """
     to_encode = data.copy()
+    now = datetime.now(timezone.utc)
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    to_encode.update({"exp": expire, "iat": now, "jti": uuid.uuid4().hex})
+    return _encode(to_encode)
 
 
 def create_refresh_token(data: dict) -> str:
@@ -40,7 +50,66 @@ def create_refresh_token(data: dict) -> str:
         Encoded JWT refresh token
     """
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode.update({"exp": expire, "iat": now, "jti": uuid.uuid4().hex})
+    return _encode(to_encode)
+
+
+def decode_token(token: str) -> dict:
+    """
+    Verify a JWT and return its claims.
+    
+    Tokens are verified with the public key named by their ``kid`` header;
+    tokens without one with SECRET_KEY, if HS256 tokens are accepted.
+    
+    Args:
+        token: Encoded JWT token
+        
+    Returns:
+        Token claims
+        
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is None:
+        if not key_ring.asymmetric:
+            return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if not settings.JWT_ACCEPT_HS256:
+            raise JWTError("Token has no key ID")
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    if not key_ring.asymmetric:
+        raise JWTError("Asymmetric tokens are not enabled")
+    key = key_ring.verification_key(kid)
+    if key is None:
+        raise JWTError(f"Unknown key ID {kid!r}")
+    return jwt.decode(token, key, algorithms=[settings.ALGORITHM])
+
+
+def request_claims(request: Request) -> Optional[dict]:
+    """
+    Verify a request's bearer token, once however many layers ask.
+    
+    The claims are kept on ``request.state``, with the subject as
+    ``token_subject`` for layers that must not depend on auth, such as
+    read-after-write routing in ``app.database``.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        Token claims, or None without a valid bearer token
+    """
+    state = request.state
+    if not hasattr(state, "token_claims"):
+        claims = None
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                claims = decode_token(token)
+            except JWTError:
+                pass
+        state.token_claims = claims
+        state.token_subject = None if claims is None else claims.get("sub")
+    return state.token_claims
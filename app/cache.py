@@ -0,0 +1,49 @@
+"""
+Shared Redis client.
+"""
+import time
+from typing import Optional
+
+import redis
+
+from app.config import settings
+
+# Seconds to wait before trying an unreachable Redis again
+RETRY_INTERVAL = 30
+
+_client: Optional[redis.Redis] = None
+_unavailable_until = 0.0
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """
+    Get a connected Redis client.
+    
+    Returns:
+        Redis client, or None when Redis is disabled or unreachable so
+        callers can fall back to an in-process or database implementation
+    """
+    global _client, _unavailable_until
+    
+    if not settings.REDIS_ENABLED:
+        return None
+    if _client is not None:
+        return _client
+    if time.monotonic() < _unavailable_until:
+        return None
+    
+    client = redis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD or None,
+        socket_connect_timeout=0.5,
+        socket_timeout=1.0,
+    )
+    try:
+        client.ping()
+    except redis.RedisError:
+        _unavailable_until = time.monotonic() + RETRY_INTERVAL
+        return None
+    _client = client
+    return _client
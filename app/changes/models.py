@@ -0,0 +1,20 @@
+"""
+SQLAlchemy model for deleted-entity tombstones.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.database import Base
+
+
+class Tombstone(Base):
+    """Record of a deleted employee, department or position for the change feed."""
+    
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_entity_deleted_at", "entity", "deleted_at", "entity_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
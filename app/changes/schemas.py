@@ -0,0 +1,19 @@
+"""
+Pydantic schemas for the change feed.
+"""
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+
+
+class Deletion(BaseModel):
+    """An entity removed since the previous cursor."""
+    id: int
+    deleted_at: datetime
+
+
+class ChangePage(BaseModel):
+    """Fields shared by every entity's change feed response."""
+    deletes: List[Deletion]
+    next_cursor: str
+    has_more: bool
@@ -0,0 +1,128 @@
+"""
+Change feed service: incremental sync by (updated_at, id) cursor.
+"""
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, true
+from sqlalchemy.orm import Session
+
+from app.changes import models
+from app.config import settings
+
+Position = Tuple[datetime, int]
+
+
+def encode_cursor(position: Optional[Position]) -> str:
+    """Encode a feed position as an opaque cursor."""
+    if position is None:
+        return ""
+    payload = json.dumps({"t": position[0].isoformat(), "id": position[1]})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Position]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid change feed cursor")
+
+
+def _after(timestamp_column: Any, id_column: Any, position: Optional[Position]):
+    if position is None:
+        return true()
+    timestamp, last_id = position
+    return or_(
+        timestamp_column > timestamp,
+        and_(timestamp_column == timestamp, id_column > last_id),
+    )
+
+
+class ChangeFeedService:
+    """Service class for change feed operations."""
+    
+    @staticmethod
+    def record_delete(db: Session, entity: str, entity_id: int) -> None:
+        """Add a tombstone for a deleted row; committed with the caller's delete."""
+        db.add(models.Tombstone(entity=entity, entity_id=entity_id))
+    
+    @staticmethod
+    def get_changes(
+        db: Session,
+        model: Any,
+        entity: str,
+        cursor: Optional[str] = None,
+        limit: int = 500,
+    ) -> Dict[str, Any]:
+        """
+        Get rows changed and deleted after a cursor, in (timestamp, id) order.
+        
+        Changes newer than CHANGE_FEED_LAG_SECONDS are held back so that
+        transactions which stamped an earlier time but commit late are not
+        skipped by consumers that have already moved past them.
+        
+        Args:
+            db: Database session
+            model: Mapped class with ``updated_at`` and ``id``
+            entity: Entity name used for tombstones
+            cursor: Cursor from a previous page, or None to start from the beginning
+            limit: Maximum number of changes to return
+            
+        Returns:
+            Dict with ``upserts``, ``deletes``, ``next_cursor`` and ``has_more``
+        """
+        position = decode_cursor(cursor)
+        horizon = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            seconds=settings.CHANGE_FEED_LAG_SECONDS
+        )
+        
+        upserts = (
+            db.query(model)
+            .filter(_after(model.updated_at, model.id, position), model.updated_at <= horizon)
+            .order_by(model.updated_at, model.id)
+            .limit(limit + 1)
+            .all()
+        )
+        tombstones = (
+            db.query(models.Tombstone)
+            .filter(
+                models.Tombstone.entity == entity,
+                _after(models.Tombstone.deleted_at, models.Tombstone.entity_id, position),
+                models.Tombstone.deleted_at <= horizon,
+            )
+            .order_by(models.Tombstone.deleted_at, models.Tombstone.entity_id)
+            .limit(limit + 1)
+            .all()
+        )
+        
+        # Merge both streams and keep the first `limit` changes overall
+        merged: List[Tuple[Position, Any, bool]] = sorted(
+            [((row.updated_at, row.id), row, False) for row in upserts]
+            + [((row.deleted_at, row.entity_id), row, True) for row in tombstones],
+            key=lambda change: change[0],
+        )
+        page = merged[:limit]
+        next_position = page[-1][0] if page else position
+        
+        return {
+            "upserts": [row for _, row, deleted in page if not deleted],
+            "deletes": [
+                {"id": row.entity_id, "deleted_at": row.deleted_at}
+                for _, row, deleted in page if deleted
+            ],
+            "next_cursor": encode_cursor(next_position),
+            "has_more": len(merged) > limit,
+        }
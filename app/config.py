@@ -1,9 +1,9 @@
 """
 Configuration settings for the JHRIS application.
 """
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
-from pydantic import field_validator
+from pydantic import field_validator, model_validator
 
 
 class Settings(BaseSettings):
@@ -20,18 +20,133 @@ class Settings(BaseSettings):
     
     # Security
     SECRET_KEY: str
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "RS256"
+    JWT_SIGNING_KEYS: Dict[str, str] = {}
+    JWT_ACTIVE_KID: str = ""
+    JWT_ACCEPT_HS256: bool = False
+    JWT_JWKS_MAX_AGE_SECONDS: int = 300
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    AUTH_PRINCIPAL_CACHE_SECONDS: int = 30
+    AUTH_REVOCATION_REFRESH_SECONDS: float = 1.0
+    AUTH_REVOCATION_REBUILD_SECONDS: int = 3600
+    AUTH_REVOCATION_COMMIT_LAG_SECONDS: int = 5
+    AUTH_REVOCATION_BLOOM_BITS: int = 1048576
+    AUTH_REVOCATION_BLOOM_HASHES: int = 7
     
     # Database
     DATABASE_URL: str
+    DATABASE_REPLICA_URLS: List[str] = []
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_RECYCLE: int = 3600
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 0
+    DATABASE_REPLICA_HEALTH_INTERVAL: int = 10
+    DATABASE_READ_AFTER_WRITE_SECONDS: int = 5
     
     # Redis
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
+    REDIS_ENABLED: bool = True
+    
+    # Idempotency
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS: int = 30
+    
+    # Change feed
+    CHANGE_FEED_LAG_SECONDS: int = 2
+    
+    # Outbox and webhooks
+    WEBHOOK_DISPATCH_ENABLED: bool = True
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = 1.0
+    WEBHOOK_BATCH_SIZE: int = 100
+    WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    WEBHOOK_BACKOFF_BASE_SECONDS: float = 2.0
+    WEBHOOK_BACKOFF_MAX_SECONDS: float = 300.0
+    WEBHOOK_LEASE_SECONDS: int = 60
+    WEBHOOK_COMMIT_LAG_SECONDS: int = 2
+    OUTBOX_RETENTION_HOURS: int = 72
+    
+    # Event stream (SSE)
+    SSE_QUEUE_SIZE: int = 100
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_REDIS_CHANNEL: str = "jhris:events"
+    SSE_REPLAY_MAX_EVENTS: int = 5000
+    
+    # Audit trail
+    AUDIT_ENABLED: bool = True
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_BACKPRESSURE: str = "block"
+    AUDIT_BLOCK_TIMEOUT_SECONDS: float = 1.0
+    
+    # Employee archive
+    EMPLOYEE_ARCHIVE_ENABLED: bool = True
+    EMPLOYEE_ARCHIVE_AFTER_DAYS: int = 365
+    EMPLOYEE_ARCHIVE_INTERVAL_SECONDS: int = 3600
+    EMPLOYEE_ARCHIVE_BATCH_SIZE: int = 500
+    
+    # List totals (X-Total-Count)
+    COUNTS_RECONCILE_ENABLED: bool = True
+    COUNTS_RECONCILE_INTERVAL_SECONDS: int = 3600
+    
+    # Employee retention purge
+    EMPLOYEE_RETENTION_YEARS: int = 7
+    EMPLOYEE_RETENTION_MODE: str = "anonymize"
+    EMPLOYEE_RETENTION_BATCH_SIZE: int = 200
+    EMPLOYEE_RETENTION_PAUSE_MS: int = 100
+    EMPLOYEE_RETENTION_REASSIGN_REPORTS: bool = True
+    
+    # Attendance
+    ATTENDANCE_FLUSH_INTERVAL_MS: int = 5
+    ATTENDANCE_BATCH_SIZE: int = 1000
+    ATTENDANCE_DEDUPE_SECONDS: int = 60
+    
+    # Timesheets
+    TIMESHEET_DAILY_HOURS: float = 8.0
+    TIMESHEET_SHIFT_START: str = "09:00"
+    TIMESHEET_LATE_GRACE_MINUTES: int = 5
+    TIMESHEET_MAX_SHIFT_HOURS: int = 16
+    TIMESHEET_CACHE_SIZE: int = 24
+    
+    # Leave
+    LEAVE_CALENDAR_REFRESH_SECONDS: int = 30
+    
+    # Org snapshot
+    ORG_SNAPSHOT_MAX_AGE_SECONDS: int = 300
+    
+    # Background jobs
+    JOBS_ENABLED: bool = True
+    JOBS_MAX_WORKERS: int = 2
+    JOBS_POLL_INTERVAL_SECONDS: float = 1.0
+    JOBS_LEASE_SECONDS: int = 60
+    JOBS_CONCURRENCY: Dict[str, int] = {}
+    
+    # Warehouse export
+    EXPORT_BATCH_SIZE: int = 10000
+    EXPORT_COMPRESSION: str = "zstd"
+    
+    # Rate limiting and load shedding
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN_PER_MINUTE: float = 10
+    RATE_LIMIT_LOGIN_BURST: int = 5
+    RATE_LIMIT_READ_PER_MINUTE: float = 600
+    RATE_LIMIT_READ_BURST: int = 100
+    RATE_LIMIT_WRITE_PER_MINUTE: float = 120
+    RATE_LIMIT_WRITE_BURST: int = 30
+    LOAD_SHED_POOL_WAIT_MS: int = 500
+    LOAD_SHED_RETRY_AFTER_SECONDS: int = 1
+    
+    # Server
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 1
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    WARMUP_ON_STARTUP: bool = True
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = []
@@ -39,16 +154,27 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
     
-    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    @field_validator("BACKEND_CORS_ORIGINS", "DATABASE_REPLICA_URLS", mode="before")
     @classmethod
     def assemble_cors_origins(cls, v: str | List[str]) -> List[str]:
-        """Parse CORS origins from string or list."""
+        """Parse CORS origins and replica URLs from string or list."""
         if isinstance(v, str) and not v.startswith("["):
             return [i.strip() for i in v.split(",")]
         elif isinstance(v, (list, str)):
             return v
         raise ValueError(v)
     
+    @model_validator(mode="after")
+    def require_signing_keys(self) -> "Settings":
+        """Refuse to start without signing keys outside development."""
+        asymmetric = self.ALGORITHM.startswith(("RS", "ES"))
+        if asymmetric and not self.JWT_SIGNING_KEYS and self.ENVIRONMENT != "development":
+            raise ValueError(
+                f"JWT_SIGNING_KEYS is required for {self.ALGORITHM} outside development; "
+                "configure keys or set ALGORITHM=HS256"
+            )
+        return self
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,27 @@
+"""
+SQLAlchemy model for maintained list totals.
+"""
+from sqlalchemy import Column, Integer, String, Index
+from app.database import Base
+
+
+class RowCount(Base):
+    """
+    Number of rows of a listed table that fall into one filter cell.
+    
+    Services adjust the cell of every row they create, delete or move in the
+    same transaction as the write, so a list total is a sum over a handful of
+    cells instead of a scan. Concurrent writers may each create a row for a
+    new cell; totals always sum, and reconciliation folds them back together.
+    """
+    
+    __tablename__ = "row_counts"
+    __table_args__ = (
+        Index("ix_row_counts_cell", "entity", "department_id", "status"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String(50), nullable=False)
+    department_id = Column(Integer, nullable=True)
+    status = Column(String(50), nullable=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,40 @@
+"""
+Background reconciliation of maintained list totals.
+"""
+import asyncio
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.counts.service import CountService
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_once(session_factory=SessionLocal) -> dict:
+    """
+    Recompute every counter from the counted tables.
+    
+    Returns:
+        Sum of absolute corrections per entity
+    """
+    db = session_factory()
+    try:
+        return CountService.reconcile(db)
+    finally:
+        db.close()
+
+
+async def run_reconciler(session_factory=SessionLocal) -> None:
+    """Reconcile counters now and every COUNTS_RECONCILE_INTERVAL_SECONDS until cancelled."""
+    while True:
+        try:
+            drift = await run_in_threadpool(reconcile_once, session_factory)
+            corrected = {entity: amount for entity, amount in drift.items() if amount}
+            if corrected:
+                logger.info("Corrected row counts: %s", corrected)
+        except Exception:
+            logger.exception("Row count reconciliation failed")
+        await asyncio.sleep(settings.COUNTS_RECONCILE_INTERVAL_SECONDS)
@@ -0,0 +1,150 @@
+"""
+Maintained row counts behind the X-Total-Count header of list endpoints.
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.counts import models
+from app.departments.models import Department
+from app.employees.models import Employee, EmployeeArchive
+from app.positions.models import Position
+
+# Counted tables and the columns their list filters use, as (department, status)
+ENTITIES = {
+    "employees": (Employee.__table__, ("department_id", "employment_status")),
+    "employees_archive": (EmployeeArchive.__table__, ("department_id", "employment_status")),
+    "departments": (Department.__table__, ()),
+    "positions": (Position.__table__, ()),
+}
+
+Cell = Tuple[Optional[int], Optional[str]]
+
+
+def _status(value: Any) -> Optional[str]:
+    """Store enum members by value so cells match the filters clients send."""
+    return getattr(value, "value", value)
+
+
+def _grouped(db: Session, entity: str, *criteria) -> Dict[Cell, int]:
+    """Count the rows of a counted table per cell."""
+    table, dimensions = ENTITIES[entity]
+    columns = [table.c[name] for name in dimensions]
+    statement = select(*columns, func.count()).select_from(table).where(*criteria)
+    if columns:
+        statement = statement.group_by(*columns)
+    return {
+        (row[0], _status(row[1])) if columns else (None, None): row[-1]
+        for row in db.execute(statement).all()
+    }
+
+
+def _cell_filter(entity: str, department_id: Optional[int], status: Optional[str]) -> list:
+    return [
+        models.RowCount.entity == entity,
+        models.RowCount.department_id.is_not_distinct_from(department_id),
+        models.RowCount.status.is_not_distinct_from(status),
+    ]
+
+
+class CountService:
+    """Service class for maintained list totals."""
+    
+    @staticmethod
+    def adjust(
+        db: Session,
+        entity: str,
+        delta: int,
+        department_id: Optional[int] = None,
+        status: Any = None
+    ) -> None:
+        """
+        Add ``delta`` to a cell in the caller's transaction.
+        
+        Only one row of the cell is updated, so a cell split by concurrent
+        writers is never adjusted twice. The row is locked and its ID read
+        first, since MySQL cannot update a table filtered by a subquery on
+        the same table.
+        """
+        if not delta:
+            return
+        status = _status(status)
+        cell = _cell_filter(entity, department_id, status)
+        first = db.execute(
+            select(models.RowCount.id).where(*cell).order_by(models.RowCount.id).limit(1).with_for_update()
+        ).scalar()
+        result = None
+        if first is not None:
+            result = db.execute(
+                update(models.RowCount).where(models.RowCount.id == first)
+                .values(count=models.RowCount.count + delta)
+                .execution_options(synchronize_session=False)
+            )
+        # The row may have been replaced by reconciliation since it was read
+        if result is None or not result.rowcount:
+            db.add(models.RowCount(entity=entity, department_id=department_id, status=status, count=delta))
+            db.flush()
+    
+    @staticmethod
+    def adjust_cells(db: Session, entity: str, cells: Dict[Cell, int], sign: int = 1) -> None:
+        """Adjust several cells, e.g. by ``sign`` times the cells of rows moved elsewhere."""
+        for (department_id, status), count in cells.items():
+            CountService.adjust(db, entity, sign * count, department_id, status)
+    
+    @staticmethod
+    def cells_of(db: Session, entity: str, ids: Iterable[int]) -> Dict[Cell, int]:
+        """Get the cells the given rows of a counted table fall into."""
+        table, _ = ENTITIES[entity]
+        return _grouped(db, entity, table.c.id.in_(list(ids)))
+    
+    @staticmethod
+    def total(
+        db: Session,
+        entity: str,
+        department_id: Optional[int] = None,
+        status: Any = None
+    ) -> int:
+        """Get the number of rows matching the filters that are set."""
+        criteria = [models.RowCount.entity == entity]
+        if department_id is not None:
+            criteria.append(models.RowCount.department_id == department_id)
+        if status is not None:
+            criteria.append(models.RowCount.status == _status(status))
+        return db.execute(select(func.coalesce(func.sum(models.RowCount.count), 0)).where(*criteria)).scalar()
+    
+    @staticmethod
+    def reconcile(db: Session) -> Dict[str, int]:
+        """
+        Recompute every cell from the counted tables.
+        
+        Each entity is rebuilt in its own transaction that first locks the
+        entity's counter rows, so writers adjusting them wait instead of
+        being lost.
+        
+        Returns:
+            Sum of absolute corrections per entity
+        """
+        drift = {}
+        for entity in ENTITIES:
+            try:
+                stored: Dict[Cell, int] = {}
+                for department_id, status, count in db.execute(
+                    select(models.RowCount.department_id, models.RowCount.status, models.RowCount.count)
+                    .where(models.RowCount.entity == entity).with_for_update()
+                ):
+                    stored[(department_id, status)] = stored.get((department_id, status), 0) + count
+                actual = _grouped(db, entity)
+                drift[entity] = sum(
+                    abs(actual.get(key, 0) - stored.get(key, 0)) for key in set(actual) | set(stored)
+                )
+                db.execute(delete(models.RowCount).where(models.RowCount.entity == entity))
+                if actual:
+                    db.execute(insert(models.RowCount), [
+                        {"entity": entity, "department_id": department_id, "status": status, "count": count}
+                        for (department_id, status), count in actual.items()
+                    ])
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+        return drift
@@ -1,33 +1,479 @@
 """
 Database connection and session management.
 """
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+import redis
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine, event, text, update
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.pool import QueuePool
+from app.cache import get_redis
 from app.config import settings
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600,
+
+class PoolWaitMonitor:
+    """
+    Tracks how long requests wait for a pooled connection.
+    
+    The wait time is a moving average of completed checkouts that decays
+    while nothing checks out, or the age of the oldest checkout still
+    waiting if that is longer.
+    """
+    
+    def __init__(self, half_life: float = 1.0):
+        self.half_life = half_life
+        self._lock = threading.Lock()
+        self._average = 0.0
+        self._updated = time.monotonic()
+        self._waiting: Dict[int, float] = {}
+        self._next_token = 0
+    
+    def _decayed(self, now: float) -> float:
+        return self._average * 0.5 ** ((now - self._updated) / self.half_life)
+    
+    def start(self) -> int:
+        with self._lock:
+            self._next_token += 1
+            self._waiting[self._next_token] = time.monotonic()
+            return self._next_token
+    
+    def finish(self, token: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            wait = now - self._waiting.pop(token, now)
+            self._average = self._decayed(now) * 0.8 + wait * 0.2
+            self._updated = now
+    
+    def wait_seconds(self) -> float:
+        """
+        Current pool wait time.
+        
+        Returns:
+            Seconds a checkout currently waits for a connection
+        """
+        now = time.monotonic()
+        with self._lock:
+            oldest = min(self._waiting.values(), default=now)
+            return max(self._decayed(now), now - oldest)
+
+
+# Shared by every engine the app creates
+pool_wait = PoolWaitMonitor()
+
+
+class MonitoredQueuePool(QueuePool):
+    """QueuePool that reports checkout wait times to ``pool_wait``."""
+    
+    def _do_get(self):
+        token = pool_wait.start()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait.finish(token)
+
+
+def create_db_engine(url: str) -> Engine:
+    """
+    Create an engine using the pool and timeout settings.
+    
+    Args:
+        url: Database URL
+        
+    Returns:
+        SQLAlchemy engine
+    """
+    database_url = make_url(url)
+    options: Dict[str, Any] = {
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    }
+    # In-memory SQLite uses a single-connection pool without sizing options
+    if database_url.get_backend_name() != "sqlite" or database_url.database not in (None, "", ":memory:"):
+        options.update(
+            poolclass=MonitoredQueuePool,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        )
+    db_engine = create_engine(url, **options)
+    
+    timeout = settings.DATABASE_STATEMENT_TIMEOUT_MS
+    backend = database_url.get_backend_name()
+    if timeout and backend in ("mysql", "postgresql"):
+        statement = (
+            f"SET SESSION max_execution_time = {int(timeout)}"
+            if backend == "mysql"
+            else f"SET statement_timeout = {int(timeout)}"
+        )
+        
+        @event.listens_for(db_engine, "connect")
+        def set_statement_timeout(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(statement)
+            cursor.close()
+    
+    return db_engine
+
+
+class ReplicaSet:
+    """Round-robin selection over read replicas with periodic health checks."""
+    
+    def __init__(self, engines: List[Engine], health_interval: float = 10):
+        self.engines = engines
+        self.health_interval = health_interval
+        self._lock = threading.Lock()
+        self._next = 0
+        self._healthy = [True] * len(engines)
+        self._checked_at = [float("-inf")] * len(engines)
+    
+    def _is_healthy(self, index: int) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at[index] >= self.health_interval:
+            self._checked_at[index] = now
+            try:
+                with self.engines[index].connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                self._healthy[index] = True
+            except SQLAlchemyError:
+                self._healthy[index] = False
+        return self._healthy[index]
+    
+    def choose(self) -> Optional[Engine]:
+        """
+        Pick the next healthy replica.
+        
+        Returns:
+            Replica engine, or None if no replica is healthy
+        """
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = self._next
+                self._next = (self._next + 1) % len(self.engines)
+            if self._is_healthy(index):
+                return self.engines[index]
+        return None
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica when marked read-only.
+    
+    Writes always use the primary, and once a session has written, its
+    later reads use the primary too so it sees its own changes.
+    """
+    
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.read_only = False
+        self.wrote = False
+        self.checked_out = False
+        self._replica: Optional[Engine] = None
+    
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        is_read = clause is not None and getattr(clause, "is_select", False)
+        if self._flushing or (clause is not None and not is_read):
+            self.wrote = True
+        elif is_read and self.read_only and not self.wrote and self.replicas:
+            if self._replica is None:
+                # Stay on one replica for the whole session
+                self._replica = self.replicas.choose()
+            if self._replica is not None:
+                return self._replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+# Create database engines
+engine = create_db_engine(settings.DATABASE_URL)
+replica_set = (
+    ReplicaSet(
+        [create_db_engine(url) for url in settings.DATABASE_REPLICA_URLS],
+        settings.DATABASE_REPLICA_HEALTH_INTERVAL,
+    )
+    if settings.DATABASE_REPLICA_URLS
+    else None
 )
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    replicas=replica_set,
+)
 
 # Create Base class for models
 Base = declarative_base()
 
 
-def get_db():
+class RecentWriters:
+    """
+    Callers that wrote within DATABASE_READ_AFTER_WRITE_SECONDS.
+    
+    Kept in Redis when it is reachable, so a caller's reads go to the
+    primary on every worker, not only the one that served the write, and in
+    this process otherwise.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._until: Dict[str, float] = {}
+    
+    def is_recent(self, caller: str) -> bool:
+        """
+        Check whether a caller wrote recently.
+        
+        Args:
+            caller: Caller key, e.g. ``user:42``
+            
+        Returns:
+            True if the caller's reads should use the primary
+        """
+        client = get_redis()
+        if client is not None:
+            try:
+                return bool(client.exists(f"recent-write:{caller}"))
+            except redis.RedisError:
+                pass
+        with self._lock:
+            return self._until.get(caller, 0.0) > time.monotonic()
+    
+    def record(self, caller: str) -> None:
+        """
+        Remember that a caller wrote.
+        
+        Args:
+            caller: Caller key, e.g. ``user:42``
+        """
+        seconds = settings.DATABASE_READ_AFTER_WRITE_SECONDS
+        if not seconds:
+            return
+        client = get_redis()
+        if client is not None:
+            try:
+                client.set(f"recent-write:{caller}", 1, ex=seconds)
+                return
+            except redis.RedisError:
+                pass
+        now = time.monotonic()
+        with self._lock:
+            for key in [k for k, until in self._until.items() if until < now]:
+                del self._until[key]
+            self._until[caller] = now + seconds
+
+
+recent_writers = RecentWriters()
+
+
+def _caller(request: Request) -> Optional[str]:
+    # The token subject verified by the auth layer, so every token of the
+    # same user shares read-after-write stickiness
+    subject = getattr(request.state, "token_subject", None)
+    return None if subject is None else f"user:{subject}"
+
+
+class PoolMetrics:
+    """Counts requests by whether they checked out a database connection."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.requests_without_checkout = 0
+    
+    def record(self, checked_out: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            if not checked_out:
+                self.requests_without_checkout += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current pool and request counters.
+        
+        Returns:
+            Pool size and usage of the primary engine, request counts and
+            the current pool wait time
+        """
+        pool = engine.pool
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "requests": self.requests,
+                "requests_without_checkout": self.requests_without_checkout,
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        stats["wait_ms"] = round(pool_wait.wait_seconds() * 1000, 3)
+        return stats
+
+
+pool_metrics = PoolMetrics()
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _mark_checked_out(session, transaction, connection):
+    session.checked_out = True
+
+
+class LazySession:
+    """
+    Request session that is only created when first used.
+    
+    Dependencies and the route share one instance per request, so requests
+    answered without querying (from the principal or a cache) never create
+    a session or check out a connection.
+    """
+    
+    def __init__(self, read_only: Optional[Callable[[], bool]] = None):
+        self._read_only = read_only
+        self._session: Optional[RoutingSession] = None
+    
+    @property
+    def session(self) -> RoutingSession:
+        if self._session is None:
+            self._session = SessionLocal()
+            self._session.read_only = self._read_only is not None and self._read_only()
+        return self._session
+    
+    @property
+    def wrote(self) -> bool:
+        return self._session is not None and self._session.wrote
+    
+    @property
+    def checked_out(self) -> bool:
+        return self._session is not None and self._session.checked_out
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+    
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+def get_db(request: Request):
     """
     Dependency function to get database session.
     
+    The session is created lazily on first use. When replicas are
+    configured, GET and HEAD requests read from one unless the same user
+    wrote within DATABASE_READ_AFTER_WRITE_SECONDS, on any worker. The user
+    is the token subject the auth layer left on ``request.state``, which is
+    known by the time a dependency first uses the session.
+    
+    Args:
+        request: Incoming request
+    
     Yields:
         Database session
     """
-    db = SessionLocal()
+    if replica_set is None:
+        db = LazySession()
+        try:
+            yield db
+        finally:
+            pool_metrics.record(db.checked_out)
+            db.close()
+        return
+    
+    def read_only() -> bool:
+        if request.method not in ("GET", "HEAD"):
+            return False
+        caller = _caller(request)
+        return caller is None or not recent_writers.is_recent(caller)
+    
+    db = LazySession(read_only=read_only)
     try:
         yield db
     finally:
+        caller = _caller(request)
+        if db.wrote and caller is not None:
+            recent_writers.record(caller)
+        pool_metrics.record(db.checked_out)
         db.close()
+
+
+def versioned_update(
+    db: Session,
+    model: Any,
+    entity_id: int,
+    values: Dict[str, Any],
+    expected_version: Optional[int] = None,
+    before_commit: Optional[Callable[[Any], None]] = None,
+) -> Optional[Any]:
+    """
+    Update a versioned row, bumping its version and ``updated_at``.
+    
+    On backends with UPDATE ... RETURNING the change is a single statement
+    and the new row comes back with it, so there is no SELECT before the
+    update and no refresh after the commit. Other backends fall back to the
+    ORM's ``version_id_col`` check.
+    
+    Args:
+        db: Database session
+        model: Mapped class with a ``version`` column
+        entity_id: Primary key of the row to update
+        values: Column values to set
+        expected_version: Version the client last saw (from If-Match)
+        before_commit: Called with the updated instance inside the transaction
+        
+    Returns:
+        Updated instance, or None if the row does not exist
+        
+    Raises:
+        HTTPException: 412 if the row was modified since expected_version
+    """
+    conflict = HTTPException(
+        status_code=412,
+        detail=f"{model.__name__} has been modified by another request",
+    )
+    
+    if not db.get_bind().dialect.update_returning:
+        instance = db.query(model).filter(model.id == entity_id).first()
+        if instance is None:
+            return None
+        if expected_version is not None and instance.version != expected_version:
+            raise conflict
+        for field, value in values.items():
+            setattr(instance, field, value)
+        try:
+            db.flush()
+        except StaleDataError:
+            db.rollback()
+            raise conflict
+        if before_commit is not None:
+            before_commit(instance)
+        db.commit()
+        db.refresh(instance)
+        return instance
+    
+    table = model.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == entity_id)
+        .values(**values, version=table.c.version + 1, updated_at=datetime.now(timezone.utc))
+        .returning(*table.columns)
+    )
+    if expected_version is not None:
+        statement = statement.where(table.c.version == expected_version)
+    
+    row = db.execute(statement).first()
+    if row is None:
+        exists = db.query(model.id).filter(model.id == entity_id).first()
+        db.rollback()
+        if exists is None:
+            return None
+        raise conflict
+    # Built from the RETURNING row rather than loaded into the session, so
+    # the commit does not expire it and serializing it needs no extra SELECT.
+    instance = model(**row._mapping)
+    if before_commit is not None:
+        before_commit(instance)
+    db.commit()
+    return instance
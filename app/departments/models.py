@@ -2,7 +2,7 @@
 SQLAlchemy Department model.
 """
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -11,6 +11,9 @@ class Department(Base):
     """Department model."""
     
     __tablename__ = "departments"
+    __table_args__ = (
+        Index("ix_departments_updated_at_id", "updated_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -20,6 +23,9 @@ class Department(Base):
     manager_id = Column(Integer, ForeignKey("employees.id"), nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    version = Column(Integer, nullable=False, default=1)
+    
+    __mapper_args__ = {"version_id_col": version}
     
     # Relationships
     parent_department = relationship("Department", remote_side=[id], backref="subdepartments")
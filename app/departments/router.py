@@ -1,13 +1,14 @@
 """
 Department API routes.
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_active_user
+from app.dependencies import get_current_active_user, get_idempotency, get_if_match_version
 from app.departments import schemas, service
+from app.idempotency.service import IdempotencyGuard
 from app.users.schemas import User
 
 router = APIRouter(prefix="/departments", tags=["departments"])
@@ -15,29 +16,89 @@ router = APIRouter(prefix="/departments", tags=["departments"])
 
 @router.get("/", response_model=List[schemas.Department])
 async def list_departments(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """List all departments with pagination."""
+    """List all departments with pagination; ``include_total`` adds an X-Total-Count header."""
     departments = service.DepartmentService.get_all(db, skip=skip, limit=limit)
+    if include_total:
+        response.headers["X-Total-Count"] = str(service.DepartmentService.count(db))
     return departments
 
 
+@router.get("/changes", response_model=schemas.DepartmentChanges)
+async def get_department_changes(
+    since: Optional[str] = Query(None, description="Cursor from a previous page"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get departments created, updated or deleted since a cursor.
+    
+    Start without ``since`` for a full sync, then pass ``next_cursor`` from
+    each page. Keep paging while ``has_more`` is true.
+    
+    Args:
+        since: Cursor from a previous page
+        limit: Maximum number of changes to return
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Changed departments, deleted IDs and the cursor to resume from
+    """
+    return service.DepartmentService.get_changes(db, since, limit)
+
+
 @router.post("/", response_model=schemas.Department, status_code=status.HTTP_201_CREATED)
 async def create_department(
     department: schemas.DepartmentCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    idempotency: IdempotencyGuard = Depends(get_idempotency),
+):
+    """
+    Create a new department.
+    
+    Retries carrying the same Idempotency-Key get the original response.
+    """
+    db_department = service.DepartmentService.create(db, department)
+    idempotency.save(db_department, schemas.Department, status.HTTP_201_CREATED)
+    return db_department
+
+
+@router.post("/batch-get", response_model=schemas.DepartmentBatchGetResponse)
+async def batch_get_departments(
+    request: schemas.DepartmentBatchGetRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
 ):
-    """Create a new department."""
-    return service.DepartmentService.create(db, department)
+    """
+    Get many departments by ID in a single request.
+    
+    Args:
+        request: IDs to resolve
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Found departments in request order and the IDs that do not exist
+    """
+    items = service.DepartmentService.get_by_ids(db, request.ids)
+    found_ids = {item.id for item in items}
+    missing = [department_id for department_id in dict.fromkeys(request.ids) if department_id not in found_ids]
+    return {"items": items, "missing": missing}
 
 
 @router.get("/{department_id}", response_model=schemas.Department)
 async def get_department(
     department_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -45,6 +106,7 @@ async def get_department(
     department = service.DepartmentService.get_by_id(db, department_id)
     if not department:
         raise HTTPException(status_code=404, detail="Department not found")
+    response.headers["ETag"] = f'"{department.version}"'
     return department
 
 
@@ -52,13 +114,21 @@ async def get_department(
 async def update_department(
     department_id: int,
     department: schemas.DepartmentUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(get_if_match_version),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Update a department."""
-    updated_department = service.DepartmentService.update(db, department_id, department)
+    """
+    Update a department.
+    
+    Send the ETag from a previous GET as If-Match to reject the update
+    with 412 if someone else changed the department in the meantime.
+    """
+    updated_department = service.DepartmentService.update(db, department_id, department, expected_version)
     if not updated_department:
         raise HTTPException(status_code=404, detail="Department not found")
+    response.headers["ETag"] = f'"{updated_department.version}"'
     return updated_department
 
 
@@ -2,8 +2,10 @@
 Pydantic schemas for Department model.
 """
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict
+
+from app.changes.schemas import ChangePage
 
 
 class DepartmentBase(BaseModel):
@@ -34,5 +36,22 @@ class Department(DepartmentBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    version: int
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class DepartmentBatchGetRequest(BaseModel):
+    """Schema for resolving many departments by ID in one request."""
+    ids: List[int] = Field(..., min_length=1, max_length=5000)
+
+
+class DepartmentBatchGetResponse(BaseModel):
+    """Schema for batch get response."""
+    items: List[Department]
+    missing: List[int]
+
+
+class DepartmentChanges(ChangePage):
+    """Schema for a page of the department change feed."""
+    upserts: List[Department]
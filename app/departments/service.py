@@ -1,12 +1,20 @@
 """
 Department service layer for business logic.
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
+from app.changes.service import ChangeFeedService
+from app.counts.service import CountService
+from app.database import versioned_update
+from app.events.service import OutboxService
 from app.departments import models, schemas
 
+# Keep IN lists well under backend bind-parameter limits (SQLite: 999)
+BATCH_CHUNK_SIZE = 500
+
 
 class DepartmentService:
     """Service class for department operations."""
@@ -16,6 +24,43 @@ class DepartmentService:
         """Get department by ID."""
         return db.query(models.Department).filter(models.Department.id == department_id).first()
     
+    @staticmethod
+    def get_by_ids(db: Session, department_ids: List[int]) -> List[models.Department]:
+        """
+        Get departments by a list of IDs using chunked IN queries.
+        
+        Results follow the order of the requested IDs; duplicates are
+        collapsed and unknown IDs are skipped.
+        """
+        unique_ids = list(dict.fromkeys(department_ids))
+        found = {}
+        for start in range(0, len(unique_ids), BATCH_CHUNK_SIZE):
+            chunk = unique_ids[start:start + BATCH_CHUNK_SIZE]
+            for row in db.query(models.Department).filter(models.Department.id.in_(chunk)):
+                found[row.id] = row
+        return [found[department_id] for department_id in unique_ids if department_id in found]
+    
+    @staticmethod
+    def get_with_ancestors(db: Session, department_ids: List[int]) -> List[models.Department]:
+        """
+        Get departments and all of their parent departments in one query.
+        
+        Uses a recursive CTE that walks ``parent_department_id`` upwards.
+        """
+        if not department_ids:
+            return []
+        Department = models.Department
+        chain = (
+            select(Department.id, Department.parent_department_id)
+            .where(Department.id.in_(list(dict.fromkeys(department_ids))))
+            .cte("chain", recursive=True)
+        )
+        chain = chain.union(
+            select(Department.id, Department.parent_department_id)
+            .join(chain, Department.id == chain.c.parent_department_id)
+        )
+        return db.query(Department).filter(Department.id.in_(select(chain.c.id))).all()
+    
     @staticmethod
     def get_by_code(db: Session, code: str) -> Optional[models.Department]:
         """Get department by code."""
@@ -26,6 +71,16 @@ class DepartmentService:
         """Get all departments with pagination."""
         return db.query(models.Department).offset(skip).limit(limit).all()
     
+    @staticmethod
+    def count(db: Session) -> int:
+        """Get the number of departments, from the maintained row counts."""
+        return CountService.total(db, "departments")
+    
+    @staticmethod
+    def get_changes(db: Session, cursor: Optional[str] = None, limit: int = 500) -> Dict[str, Any]:
+        """Get departments created, updated or deleted after a change feed cursor."""
+        return ChangeFeedService.get_changes(db, models.Department, "departments", cursor, limit)
+    
     @staticmethod
     def create(db: Session, department: schemas.DepartmentCreate) -> models.Department:
         """Create a new department."""
@@ -36,6 +91,9 @@ class DepartmentService:
         
         db_department = models.Department(**department.model_dump())
         db.add(db_department)
+        db.flush()
+        CountService.adjust(db, "departments", 1)
+        OutboxService.append(db, "department.created", db_department.id, schemas.Department.model_validate(db_department))
         db.commit()
         db.refresh(db_department)
         return db_department
@@ -44,20 +102,24 @@ class DepartmentService:
     def update(
         db: Session,
         department_id: int,
-        department: schemas.DepartmentUpdate
+        department: schemas.DepartmentUpdate,
+        expected_version: Optional[int] = None
     ) -> Optional[models.Department]:
-        """Update a department."""
-        db_department = DepartmentService.get_by_id(db, department_id)
-        if not db_department:
-            return None
+        """
+        Update a department.
         
+        Raises:
+            HTTPException: 412 if expected_version no longer matches
+        """
         update_data = department.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_department, field, value)
         
-        db.commit()
-        db.refresh(db_department)
-        return db_department
+        def record_event(db_department: models.Department) -> None:
+            snapshot = schemas.Department.model_validate(db_department)
+            OutboxService.append(db, "department.updated", department_id, snapshot, update_data)
+        
+        return versioned_update(
+            db, models.Department, department_id, update_data, expected_version, before_commit=record_event
+        )
     
     @staticmethod
     def delete(db: Session, department_id: int) -> bool:
@@ -66,6 +128,9 @@ class DepartmentService:
         if not db_department:
             return False
         
+        OutboxService.append(db, "department.deleted", department_id, schemas.Department.model_validate(db_department))
+        CountService.adjust(db, "departments", -1)
         db.delete(db_department)
+        ChangeFeedService.record_delete(db, "departments", department_id)
         db.commit()
         return True
@@ -1,35 +1,42 @@
 """
 Dependency injection utilities.
 """
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from typing import Any, AsyncGenerator, Dict, Generator, Optional, Union
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
+from app.auth.principals import Principal, get_principal
+from app.auth.revocation import revocation_list
+from app.auth.utils import request_claims
 from app.config import settings
 from app.database import get_db
+from app.idempotency.service import IdempotencyGuard, fingerprint_request, get_store
 from app.users.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/login")
 
 
-async def get_current_user(
+async def get_token_claims(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-) -> User:
+) -> Dict[str, Any]:
     """
-    Get current authenticated user from JWT token.
+    Verify the JWT and check it against the revocation list.
+    
+    The token is only decoded if the rate limiter has not done so already.
     
     Args:
-        token: JWT access token
-        db: Database session
+        request: Incoming request
+        token: JWT access token, required by the bearer scheme
+        db: Database session, only used when the token may be revoked
         
     Returns:
-        Current user object
+        Token claims
         
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If the token is invalid or revoked
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,17 +44,43 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+    payload = request_claims(request)
+    if payload is None or payload.get("sub") is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    if revocation_list.is_revoked(db, payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+async def get_current_user(
+    claims: Dict[str, Any] = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Get current authenticated user from JWT token.
+    
+    Args:
+        claims: Verified token claims
+        db: Database session
+        
+    Returns:
+        Current user object
+        
+    Raises:
+        HTTPException: If user not found or inactive
+    """
+    user = get_principal(db, int(claims["sub"]))
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -56,43 +89,129 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    claims: Dict[str, Any] = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+) -> Union[Principal, User]:
     """
     Get current active user.
     
+    Tokens carrying an active claim are trusted without loading the user;
+    deactivating a user revokes their tokens.
+    
     Args:
-        current_user: Current user from token
+        claims: Verified token claims
+        db: Database session, only used for tokens without claims
         
     Returns:
-        Active user object
+        Principal from the token claims, or the user for older tokens
         
     Raises:
         HTTPException: If user is inactive
     """
-    if not current_user.is_active:
-        raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
+    if claims.get("active"):
+        return Principal(int(claims["sub"]), True, bool(claims.get("su")))
+    return await get_current_user(claims, db)
 
 
 async def get_current_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    claims: Dict[str, Any] = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+) -> Union[Principal, User]:
     """
     Get current superuser.
     
+    A superuser claim is trusted as is, since demotions revoke the user's
+    tokens. Otherwise the user is loaded past the principal cache, so
+    promotions and demotions apply at once on every worker.
+    
     Args:
-        current_user: Current user from token
+        claims: Verified token claims
+        db: Database session
         
     Returns:
-        Superuser object
+        Superuser principal or user object
         
     Raises:
-        HTTPException: If user is not a superuser
+        HTTPException: If the user is inactive or not a superuser
     """
+    if claims.get("active") and claims.get("su"):
+        return Principal(int(claims["sub"]), True, True)
+    current_user = get_principal(db, int(claims["sub"]), cached=False)
+    if current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=403,
             detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+async def get_if_match_version(
+    if_match: Optional[str] = Header(None),
+) -> Optional[int]:
+    """
+    Parse the version a client expects from the If-Match header.
+    
+    Args:
+        if_match: ETag previously returned by the API, e.g. ``"3"``
+        
+    Returns:
+        Expected version, or None when the header is absent or ``*``
+        
+    Raises:
+        HTTPException: 412 if the header cannot match any version
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match does not match the current version"
+        )
+
+
+async def get_idempotency(
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> AsyncGenerator[IdempotencyGuard, None]:
+    """
+    Honour the Idempotency-Key header on POST endpoints.
+    
+    Retries of a request whose response is stored are answered with that
+    response, and concurrent requests with the same key wait for the first
+    one. Keys are scoped to the current user.
+    
+    Args:
+        request: Incoming request, hashed to detect key reuse
+        idempotency_key: Client-chosen key for this logical operation
+        db: Database session
+        current_user: Current authenticated user
+        
+    Yields:
+        Guard the route uses to store its response
+    """
+    if not idempotency_key:
+        yield IdempotencyGuard(db)
+        return
+    
+    guard = IdempotencyGuard(db, f"{current_user.id}:{idempotency_key}", get_store())
+    body = await request.body()
+    await guard.acquire(fingerprint_request(request.method, request.url.path, body))
+    try:
+        yield guard
+    finally:
+        guard.finish()
@@ -0,0 +1,41 @@
+"""
+Background archival of long-terminated employees.
+"""
+import asyncio
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import SessionLocal
+from app.employees.service import EmployeeService
+
+logger = logging.getLogger(__name__)
+
+
+def archive_once(session_factory=SessionLocal) -> int:
+    """
+    Archive every eligible employee in chunked transactions.
+    
+    Returns:
+        Number of employees archived
+    """
+    db = session_factory()
+    try:
+        return EmployeeService.archive_terminated(
+            db, settings.EMPLOYEE_ARCHIVE_AFTER_DAYS, settings.EMPLOYEE_ARCHIVE_BATCH_SIZE
+        )
+    finally:
+        db.close()
+
+
+async def run_archiver(session_factory=SessionLocal) -> None:
+    """Archive terminated employees every EMPLOYEE_ARCHIVE_INTERVAL_SECONDS until cancelled."""
+    while True:
+        try:
+            archived = await run_in_threadpool(archive_once, session_factory)
+            if archived:
+                logger.info("Archived %d terminated employees", archived)
+        except Exception:
+            logger.exception("Employee archival failed")
+        await asyncio.sleep(settings.EMPLOYEE_ARCHIVE_INTERVAL_SECONDS)
@@ -2,7 +2,7 @@
 SQLAlchemy Employee model.
 """
 from datetime import datetime, date, timezone
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Enum as SQLEnum, Index, Table
 from sqlalchemy.orm import relationship
 import enum
 from app.database import Base
@@ -44,6 +44,9 @@ class Employee(Base):
     """Employee model."""
     
     __tablename__ = "employees"
+    __table_args__ = (
+        Index("ix_employees_updated_at_id", "updated_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     employee_number = Column(String(50), unique=True, nullable=False, index=True)
@@ -81,9 +84,44 @@ class Employee(Base):
     # Timestamps
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    version = Column(Integer, nullable=False, default=1)
+    # When employment_status last became terminated; cleared on rehire
+    terminated_at = Column(DateTime, nullable=True)
+    # Set when the retention purge anonymized the row
+    purged_at = Column(DateTime, nullable=True)
+    
+    __mapper_args__ = {"version_id_col": version}
     
     # Relationships
     user = relationship("User", backref="employee")
     department = relationship("Department", foreign_keys=[department_id], back_populates="employees")
     position = relationship("Position", back_populates="employees")
     manager = relationship("Employee", remote_side=[id], backref="subordinates")
+
+
+class EmployeeArchive(Base):
+    """
+    Archived employee.
+    
+    Long-terminated employees are moved here from ``employees`` so the hot
+    table only holds current staff. The table mirrors every employee column
+    without foreign keys, since referenced rows may be archived or deleted
+    later, and adds ``archived_at``.
+    """
+    
+    __table__ = Table(
+        "employees_archive",
+        Base.metadata,
+        *[
+            Column(
+                column.name,
+                column.type,
+                primary_key=column.primary_key,
+                nullable=column.nullable,
+                unique=column.unique,
+                index=column.index,
+            )
+            for column in Employee.__table__.columns
+        ],
+        Column("archived_at", DateTime, default=lambda: datetime.now(timezone.utc), nullable=False),
+    )
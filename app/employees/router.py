@@ -1,13 +1,16 @@
 """
 Employee API routes.
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_active_user
+from app.dependencies import get_current_active_user, get_idempotency, get_if_match_version
 from app.employees import schemas, service
+from app.idempotency.service import IdempotencyGuard
+from app.loaders import DataLoader, Loaders, get_loaders
 from app.users.schemas import User
 
 router = APIRouter(prefix="/employees", tags=["employees"])
@@ -15,10 +18,13 @@ router = APIRouter(prefix="/employees", tags=["employees"])
 
 @router.get("/", response_model=List[schemas.Employee])
 async def list_employees(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     department_id: Optional[int] = Query(None),
     employment_status: Optional[str] = Query(None),
+    include_archived: bool = Query(False),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -26,10 +32,13 @@ async def list_employees(
     List all employees with pagination and filtering.
     
     Args:
+        response: Response to add the total to
         skip: Number of records to skip
         limit: Maximum number of records to return
         department_id: Filter by department ID
         employment_status: Filter by employment status
+        include_archived: Also list archived (long-terminated) employees
+        include_total: Report the number of matching employees in X-Total-Count
         db: Database session
         current_user: Current authenticated user
         
@@ -41,24 +50,109 @@ async def list_employees(
         skip=skip,
         limit=limit,
         department_id=department_id,
-        employment_status=employment_status
+        employment_status=employment_status,
+        include_archived=include_archived
     )
+    if include_total:
+        response.headers["X-Total-Count"] = str(service.EmployeeService.count(
+            db,
+            department_id=department_id,
+            employment_status=employment_status,
+            include_archived=include_archived
+        ))
     return employees
 
 
+@router.get("/changes", response_model=schemas.EmployeeChanges)
+async def get_employee_changes(
+    since: Optional[str] = Query(None, description="Cursor from a previous page"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get employees created, updated or deleted since a cursor.
+    
+    Start without ``since`` for a full sync, then pass ``next_cursor`` from
+    each page. Keep paging while ``has_more`` is true.
+    
+    Args:
+        since: Cursor from a previous page
+        limit: Maximum number of changes to return
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Changed employees, deleted IDs and the cursor to resume from
+    """
+    return service.EmployeeService.get_changes(db, since, limit)
+
+
 @router.post("/", response_model=schemas.Employee, status_code=status.HTTP_201_CREATED)
 async def create_employee(
     employee: schemas.EmployeeCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    idempotency: IdempotencyGuard = Depends(get_idempotency),
+):
+    """
+    Create a new employee.
+    
+    Retries carrying the same Idempotency-Key get the original response.
+    """
+    db_employee = service.EmployeeService.create(db, employee, current_user.id)
+    idempotency.save(db_employee, schemas.Employee, status.HTTP_201_CREATED)
+    return db_employee
+
+
+@router.post("/batch-get", response_model=schemas.EmployeeBatchGetResponse)
+async def batch_get_employees(
+    request: schemas.EmployeeBatchGetRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get many employees by ID in a single request.
+    
+    Args:
+        request: IDs to resolve
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Found employees in request order and the IDs that do not exist
+    """
+    items = service.EmployeeService.get_by_ids(db, request.ids)
+    found_ids = {item.id for item in items}
+    missing = [employee_id for employee_id in dict.fromkeys(request.ids) if employee_id not in found_ids]
+    return {"items": items, "missing": missing}
+
+
+@router.patch("/bulk", response_model=schemas.EmployeeBulkUpdateResult)
+async def bulk_update_employees(
+    bulk: schemas.EmployeeBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
 ):
-    """Create a new employee."""
-    return service.EmployeeService.create(db, employee)
+    """
+    Apply a partial update to every employee matching a filter.
+    
+    Args:
+        bulk: Filter (ids, department_id, manager_id) and the changes to apply
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Number of employees updated
+    """
+    affected = service.EmployeeService.bulk_update(db, bulk, current_user.id)
+    return {"affected": affected}
 
 
 @router.get("/{employee_id}", response_model=schemas.Employee)
 async def get_employee(
     employee_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -66,20 +160,77 @@ async def get_employee(
     employee = service.EmployeeService.get_by_id(db, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
+    response.headers["ETag"] = f'"{employee.version}"'
     return employee
 
 
+async def _load(loader: DataLoader, key: Optional[int], default: Any = None) -> Any:
+    if key is None:
+        return default
+    value = await loader.load(key)
+    return default if value is None else value
+
+
+@router.get("/{employee_id}/profile", response_model=schemas.EmployeeProfile)
+async def get_employee_profile(
+    employee_id: int,
+    loaders: Loaders = Depends(get_loaders),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get an employee with their department and its parents, position,
+    manager, direct reports and linked user.
+    
+    Related records are fetched through batching loaders in one query per
+    kind, so the profile costs a fixed number of queries.
+    """
+    employee = await loaders.employees.load(employee_id)
+    if employee is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    
+    department_chain, position, manager, subordinates, user = await asyncio.gather(
+        _load(loaders.department_chains, employee.department_id, []),
+        _load(loaders.positions, employee.position_id),
+        _load(loaders.employees, employee.manager_id),
+        _load(loaders.subordinates, employee.id, []),
+        _load(loaders.users, employee.user_id),
+    )
+    return {
+        "employee": employee,
+        "department": department_chain[0] if department_chain else None,
+        "department_chain": department_chain[1:],
+        "position": position,
+        "manager": manager,
+        "subordinates": subordinates,
+        "user": user,
+    }
+
+
 @router.put("/{employee_id}", response_model=schemas.Employee)
 async def update_employee(
     employee_id: int,
     employee: schemas.EmployeeUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(get_if_match_version),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Update an employee."""
-    updated_employee = service.EmployeeService.update(db, employee_id, employee)
+    """
+    Update an employee.
+    
+    Send the ETag from a previous GET as If-Match to reject the update
+    with 412 if someone else changed the employee in the meantime.
+    Archived employees are read-only and answer 409.
+    """
+    updated_employee = service.EmployeeService.update(
+        db, employee_id, employee, expected_version, current_user.id
+    )
     if not updated_employee:
+        # Only looked up on a miss, where it can only be found in the archive
+        if service.EmployeeService.get_by_id(db, employee_id) is not None:
+            raise HTTPException(status_code=409, detail="Employee is archived")
         raise HTTPException(status_code=404, detail="Employee not found")
+    response.headers["ETag"] = f'"{updated_employee.version}"'
     return updated_employee
 
 
@@ -90,7 +241,7 @@ async def delete_employee(
     current_user: User = Depends(get_current_active_user),
 ):
     """Delete an employee."""
-    success = service.EmployeeService.delete(db, employee_id)
+    success = service.EmployeeService.delete(db, employee_id, current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="Employee not found")
 
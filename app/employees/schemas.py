@@ -2,10 +2,15 @@
 Pydantic schemas for Employee model.
 """
 from datetime import datetime, date
-from typing import Optional
-from pydantic import BaseModel, EmailStr, ConfigDict
+from typing import List, Optional
+from pydantic import BaseModel, Field, EmailStr, ConfigDict
 from enum import Enum
 
+from app.changes.schemas import ChangePage
+from app.departments.schemas import Department
+from app.positions.schemas import Position
+from app.users.schemas import User
+
 
 class EmploymentStatus(str, Enum):
     """Employment status enum."""
@@ -71,10 +76,13 @@ class EmployeeCreate(EmployeeBase):
     pass
 
 
-class EmployeeUpdate(BaseModel):
-    """Schema for updating an employee."""
-    employee_number: Optional[str] = None
-    user_id: Optional[int] = None
+class EmployeeBulkChanges(BaseModel):
+    """
+    Schema for the changes of a bulk update.
+    
+    Unique fields cannot be set on many employees at once, and are
+    rejected rather than ignored.
+    """
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     middle_name: Optional[str] = None
@@ -96,6 +104,16 @@ class EmployeeUpdate(BaseModel):
     hire_date: Optional[date] = None
     employment_status: Optional[EmploymentStatus] = None
     employment_type: Optional[EmploymentType] = None
+    
+    model_config = ConfigDict(extra="forbid")
+
+
+class EmployeeUpdate(EmployeeBulkChanges):
+    """Schema for updating an employee."""
+    employee_number: Optional[str] = None
+    user_id: Optional[int] = None
+    
+    model_config = ConfigDict(extra="ignore")
 
 
 class Employee(EmployeeBase):
@@ -103,5 +121,56 @@ class Employee(EmployeeBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    version: int
+    terminated_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None
+    purged_at: Optional[datetime] = None
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class EmployeeProfile(BaseModel):
+    """Schema for an employee with everything the detail page shows."""
+    employee: Employee
+    department: Optional[Department] = None
+    department_chain: List[Department] = Field(
+        default_factory=list, description="Parent departments, nearest first"
+    )
+    position: Optional[Position] = None
+    manager: Optional[Employee] = None
+    subordinates: List[Employee] = Field(default_factory=list)
+    user: Optional[User] = None
+
+
+class EmployeeBatchGetRequest(BaseModel):
+    """Schema for resolving many employees by ID in one request."""
+    ids: List[int] = Field(..., min_length=1, max_length=5000)
+
+
+class EmployeeBatchGetResponse(BaseModel):
+    """Schema for batch get response."""
+    items: List[Employee]
+    missing: List[int]
+
+
+class EmployeeBulkFilter(BaseModel):
+    """Selects the employees affected by a bulk update."""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=5000)
+    department_id: Optional[int] = None
+    manager_id: Optional[int] = None
+
+
+class EmployeeBulkUpdate(BaseModel):
+    """Schema for updating many employees at once."""
+    filter: EmployeeBulkFilter
+    changes: EmployeeBulkChanges
+
+
+class EmployeeBulkUpdateResult(BaseModel):
+    """Schema for bulk update response."""
+    affected: int
+
+
+class EmployeeChanges(ChangePage):
+    """Schema for a page of the employee change feed."""
+    upserts: List[Employee]
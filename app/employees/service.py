@@ -1,27 +1,140 @@
 """
 Employee service layer for business logic.
 """
-from typing import List, Optional
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Union
+from sqlalchemy import and_, case, delete, exists, func, insert, literal, select, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
+from app.attendance.models import Punch
+from app.audit.service import AuditService
+from app.changes.service import ChangeFeedService
+from app.config import settings
+from app.counts.service import CountService
+from app.database import versioned_update
+from app.departments import schemas as department_schemas
+from app.departments.models import Department
+from app.events.service import OutboxService
 from app.employees import models, schemas
+from app.leave.models import LeaveBalance, LeaveLedgerEntry, LeaveRequest
+
+# Keep IN lists well under backend bind-parameter limits (SQLite: 999)
+BATCH_CHUNK_SIZE = 500
+
+# Columns that decide which row count cell an employee falls into
+COUNTED_FIELDS = {"department_id", "employment_status"}
+
+# Tables whose rows reference employees.id
+EMPLOYEE_DEPENDENTS = (Punch, LeaveLedgerEntry, LeaveRequest, LeaveBalance)
+
+RETENTION_MODES = ("anonymize", "delete")
+
+# What an anonymized employee keeps of their personal data
+ANONYMIZED_VALUES = {
+    "user_id": None,
+    "first_name": "Redacted",
+    "last_name": "Redacted",
+    "middle_name": None,
+    "date_of_birth": None,
+    "gender": None,
+    "marital_status": None,
+    "nationality": None,
+    "email": "redacted@example.com",
+    "personal_email": None,
+    "phone": None,
+    "address": None,
+    "city": None,
+    "state": None,
+    "postal_code": None,
+    "country": None,
+}
+
+
+def _years_ago(years: int) -> datetime:
+    now = datetime.now(timezone.utc)
+    try:
+        return now.replace(year=now.year - years)
+    except ValueError:
+        # 29 February in a non-leap target year
+        return now.replace(year=now.year - years, day=28)
+
+
+def _terminated_before(table: Any, cutoff: datetime) -> Any:
+    """Rows terminated before cutoff; rows from before ``terminated_at`` fall back to ``updated_at``."""
+    return and_(
+        table.c.employment_status == models.EmploymentStatus.TERMINATED,
+        func.coalesce(table.c.terminated_at, table.c.updated_at) < cutoff,
+    )
+
+
+def _termination_values(new_status: Any, old_status: Any = None) -> Dict[str, Any]:
+    """The ``terminated_at`` change that goes with a status change."""
+    if new_status != models.EmploymentStatus.TERMINATED:
+        return {"terminated_at": None}
+    if old_status != models.EmploymentStatus.TERMINATED:
+        return {"terminated_at": datetime.now(timezone.utc)}
+    return {}
+
+
+def _snapshot(db_employee: Any) -> Dict[str, Any]:
+    """Event payload of an employee or archived employee."""
+    return schemas.Employee.model_validate(db_employee).model_dump(mode="json")
 
 
 class EmployeeService:
     """Service class for employee operations."""
     
     @staticmethod
-    def get_by_id(db: Session, employee_id: int) -> Optional[models.Employee]:
-        """Get employee by ID."""
-        return db.query(models.Employee).filter(models.Employee.id == employee_id).first()
+    def get_by_id(
+        db: Session,
+        employee_id: int
+    ) -> Optional[Union[models.Employee, models.EmployeeArchive]]:
+        """Get employee by ID, falling back to the archive."""
+        db_employee = db.query(models.Employee).filter(models.Employee.id == employee_id).first()
+        if db_employee is None:
+            db_employee = db.get(models.EmployeeArchive, employee_id)
+        return db_employee
     
     @staticmethod
-    def get_by_employee_number(db: Session, employee_number: str) -> Optional[models.Employee]:
-        """Get employee by employee number."""
-        return db.query(models.Employee).filter(
+    def get_by_ids(
+        db: Session,
+        employee_ids: List[int],
+        include_archived: bool = False
+    ) -> List[Union[models.Employee, models.EmployeeArchive]]:
+        """
+        Get employees by a list of IDs using chunked IN queries.
+        
+        Results follow the order of the requested IDs; duplicates are
+        collapsed and unknown IDs are skipped. With ``include_archived``,
+        IDs not found in the hot table are looked up in the archive.
+        """
+        unique_ids = list(dict.fromkeys(employee_ids))
+        found = {}
+        tables = [models.Employee, models.EmployeeArchive] if include_archived else [models.Employee]
+        for model in tables:
+            missing = [employee_id for employee_id in unique_ids if employee_id not in found]
+            for start in range(0, len(missing), BATCH_CHUNK_SIZE):
+                chunk = missing[start:start + BATCH_CHUNK_SIZE]
+                for row in db.query(model).filter(model.id.in_(chunk)):
+                    found[row.id] = row
+        return [found[employee_id] for employee_id in unique_ids if employee_id in found]
+    
+    @staticmethod
+    def get_by_employee_number(
+        db: Session,
+        employee_number: str
+    ) -> Optional[Union[models.Employee, models.EmployeeArchive]]:
+        """Get employee by employee number, falling back to the archive."""
+        db_employee = db.query(models.Employee).filter(
             models.Employee.employee_number == employee_number
         ).first()
+        if db_employee is None:
+            db_employee = db.query(models.EmployeeArchive).filter(
+                models.EmployeeArchive.employee_number == employee_number
+            ).first()
+        return db_employee
     
     @staticmethod
     def get_all(
@@ -29,18 +142,46 @@ class EmployeeService:
         skip: int = 0,
         limit: int = 100,
         department_id: Optional[int] = None,
-        employment_status: Optional[str] = None
-    ) -> List[models.Employee]:
-        """Get all employees with pagination and filtering."""
-        query = db.query(models.Employee)
+        employment_status: Optional[str] = None,
+        include_archived: bool = False
+    ) -> List[Union[models.Employee, models.EmployeeArchive]]:
+        """
+        Get all employees with pagination and filtering.
         
-        if department_id:
-            query = query.filter(models.Employee.department_id == department_id)
+        Archived employees are only read when ``include_archived`` is set,
+        and are paged after every current employee.
+        """
+        def filtered(model):
+            query = db.query(model)
+            if department_id:
+                query = query.filter(model.department_id == department_id)
+            if employment_status:
+                query = query.filter(model.employment_status == employment_status)
+            return query
         
-        if employment_status:
-            query = query.filter(models.Employee.employment_status == employment_status)
+        query = filtered(models.Employee)
+        employees = query.offset(skip).limit(limit).all()
+        if not include_archived or len(employees) == limit:
+            return employees
         
-        return query.offset(skip).limit(limit).all()
+        archived_skip = max(0, skip - query.count())
+        return employees + filtered(models.EmployeeArchive).order_by(
+            models.EmployeeArchive.id
+        ).offset(archived_skip).limit(limit - len(employees)).all()
+    
+    @staticmethod
+    def count(
+        db: Session,
+        department_id: Optional[int] = None,
+        employment_status: Optional[str] = None,
+        include_archived: bool = False
+    ) -> int:
+        """Get the number of employees ``get_all`` pages through, from the maintained row counts."""
+        status = employment_status.lower() if employment_status else None
+        total = CountService.total(db, "employees", department_id or None, status)
+        if include_archived:
+            total += CountService.total(db, "employees_archive", department_id or None, status)
+        return total
     
     @staticmethod
     def get_subordinates(db: Session, manager_id: int) -> List[models.Employee]:
@@ -50,45 +191,531 @@ class EmployeeService:
         ).all()
     
     @staticmethod
-    def create(db: Session, employee: schemas.EmployeeCreate) -> models.Employee:
+    def get_subordinates_of(db: Session, manager_ids: List[int]) -> Dict[int, List[models.Employee]]:
+        """Get direct reports for several managers, grouped by manager ID."""
+        unique_ids = list(dict.fromkeys(manager_ids))
+        grouped: Dict[int, List[models.Employee]] = {manager_id: [] for manager_id in unique_ids}
+        for start in range(0, len(unique_ids), BATCH_CHUNK_SIZE):
+            chunk = unique_ids[start:start + BATCH_CHUNK_SIZE]
+            for row in db.query(models.Employee).filter(
+                models.Employee.manager_id.in_(chunk)
+            ).order_by(models.Employee.id):
+                grouped[row.manager_id].append(row)
+        return grouped
+    
+    @staticmethod
+    def get_changes(db: Session, cursor: Optional[str] = None, limit: int = 500) -> Dict[str, Any]:
+        """Get employees created, updated or deleted after a change feed cursor."""
+        return ChangeFeedService.get_changes(db, models.Employee, "employees", cursor, limit)
+    
+    @staticmethod
+    def create(
+        db: Session,
+        employee: schemas.EmployeeCreate,
+        actor_id: Optional[int] = None
+    ) -> models.Employee:
         """Create a new employee."""
         # Check if employee number already exists
         existing = EmployeeService.get_by_employee_number(db, employee.employee_number)
         if existing:
             raise HTTPException(status_code=400, detail="Employee number already exists")
         
-        db_employee = models.Employee(**employee.model_dump())
+        db_employee = models.Employee(
+            **employee.model_dump(), **_termination_values(employee.employment_status)
+        )
         db.add(db_employee)
+        db.flush()
+        snapshot = schemas.Employee.model_validate(db_employee)
+        OutboxService.append(db, "employee.created", db_employee.id, snapshot)
+        CountService.adjust(db, "employees", 1, db_employee.department_id, db_employee.employment_status)
         db.commit()
         db.refresh(db_employee)
+        AuditService.record("employee", db_employee.id, "create", actor_id, snapshot=snapshot)
         return db_employee
     
     @staticmethod
     def update(
         db: Session,
         employee_id: int,
-        employee: schemas.EmployeeUpdate
+        employee: schemas.EmployeeUpdate,
+        expected_version: Optional[int] = None,
+        actor_id: Optional[int] = None
     ) -> Optional[models.Employee]:
-        """Update an employee."""
-        db_employee = EmployeeService.get_by_id(db, employee_id)
-        if not db_employee:
-            return None
+        """
+        Update an employee.
         
+        When the audit trail is enabled, or a counted field changes, the
+        previous values of the updated fields and the employee's count cell
+        are read in one locked select first, so the audit diff and the count
+        adjustment match exactly what this update overwrote.
+        
+        Raises:
+            HTTPException: 412 if expected_version no longer matches
+        """
         update_data = employee.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_employee, field, value)
         
-        db.commit()
-        db.refresh(db_employee)
+        audited = settings.AUDIT_ENABLED and bool(update_data)
+        counted = bool(COUNTED_FIELDS & update_data.keys())
+        previous = cell = None
+        if audited or counted:
+            fields = list(update_data) if audited else []
+            if counted:
+                fields += [field for field in sorted(COUNTED_FIELDS) if field not in fields]
+            row = db.execute(
+                select(*[getattr(models.Employee, field) for field in fields])
+                .where(models.Employee.id == employee_id).with_for_update()
+            ).first()
+            if row is None:
+                return None
+            if audited:
+                previous = row
+            if counted:
+                cell = (row.department_id, row.employment_status)
+        
+        def record_events(db_employee: models.Employee) -> None:
+            snapshot = schemas.Employee.model_validate(db_employee)
+            OutboxService.append(db, "employee.updated", employee_id, snapshot, update_data)
+            if update_data.get("employment_status") == schemas.EmploymentStatus.TERMINATED:
+                OutboxService.append(db, "employee.terminated", employee_id, snapshot)
+            if cell is not None and tuple(cell) != (db_employee.department_id, db_employee.employment_status):
+                CountService.adjust(db, "employees", -1, *cell)
+                CountService.adjust(db, "employees", 1, db_employee.department_id, db_employee.employment_status)
+        
+        values = update_data
+        if "employment_status" in update_data:
+            values = {**update_data, **_termination_values(update_data["employment_status"], cell[1])}
+        
+        db_employee = versioned_update(
+            db, models.Employee, employee_id, values, expected_version, before_commit=record_events
+        )
+        if db_employee is not None and previous is not None:
+            AuditService.record(
+                "employee", employee_id, "update", actor_id, AuditService.diff(previous, update_data)
+            )
         return db_employee
     
     @staticmethod
-    def delete(db: Session, employee_id: int) -> bool:
+    def bulk_update(
+        db: Session,
+        bulk: schemas.EmployeeBulkUpdate,
+        actor_id: Optional[int] = None
+    ) -> int:
+        """
+        Apply the same partial update to every employee matching a filter.
+        
+        The matching IDs are resolved first, then updated with set-based
+        UPDATE statements in chunks, all inside a single transaction. Each
+        updated employee gets an outbox event.
+        
+        Returns:
+            Number of employees updated
+        """
+        criteria = []
+        if bulk.filter.department_id is not None:
+            criteria.append(models.Employee.department_id == bulk.filter.department_id)
+        if bulk.filter.manager_id is not None:
+            criteria.append(models.Employee.manager_id == bulk.filter.manager_id)
+        if not criteria and not bulk.filter.ids:
+            raise HTTPException(status_code=400, detail="A bulk update filter is required")
+        
+        changes = bulk.changes.model_dump(exclude_unset=True)
+        if not changes:
+            return 0
+        terminated = changes.get("employment_status") == schemas.EmploymentStatus.TERMINATED
+        
+        termination = {}
+        if "employment_status" in changes:
+            # Keeps the date of employees who were already terminated
+            termination["terminated_at"] = (
+                func.coalesce(models.Employee.terminated_at, datetime.now(timezone.utc)) if terminated else None
+            )
+        statement = update(models.Employee).values(
+            **changes,
+            **termination,
+            updated_at=datetime.now(timezone.utc),
+            version=models.Employee.version + 1,
+        ).execution_options(synchronize_session=False)
+        
+        affected = 0
+        audits = []
+        try:
+            if bulk.filter.ids:
+                matched = []
+                requested = list(dict.fromkeys(bulk.filter.ids))
+                for start in range(0, len(requested), BATCH_CHUNK_SIZE):
+                    chunk = requested[start:start + BATCH_CHUNK_SIZE]
+                    matched += [row.id for row in db.query(models.Employee.id).filter(
+                        models.Employee.id.in_(chunk), *criteria
+                    )]
+            else:
+                matched = [row.id for row in db.query(models.Employee.id).filter(*criteria)]
+            
+            for start in range(0, len(matched), BATCH_CHUNK_SIZE):
+                chunk = matched[start:start + BATCH_CHUNK_SIZE]
+                if settings.AUDIT_ENABLED:
+                    columns = [getattr(models.Employee, field) for field in changes]
+                    audits += db.execute(
+                        select(models.Employee.id, *columns).where(models.Employee.id.in_(chunk)).with_for_update()
+                    ).all()
+                if COUNTED_FIELDS & changes.keys():
+                    cells = CountService.cells_of(db, "employees", chunk)
+                    CountService.adjust_cells(db, "employees", cells, -1)
+                    for (department_id, status), count in cells.items():
+                        CountService.adjust(
+                            db,
+                            "employees",
+                            count,
+                            changes.get("department_id", department_id),
+                            changes.get("employment_status", status),
+                        )
+                affected += db.execute(statement.where(models.Employee.id.in_(chunk))).rowcount
+                
+                events = []
+                updated = db.query(models.Employee).filter(
+                    models.Employee.id.in_(chunk)
+                ).populate_existing()
+                for db_employee in updated:
+                    data = _snapshot(db_employee)
+                    events.append({
+                        "event_type": "employee.updated",
+                        "entity_id": db_employee.id,
+                        "data": data,
+                        "changed_fields": sorted(changes),
+                    })
+                    if terminated:
+                        events.append({
+                            "event_type": "employee.terminated",
+                            "entity_id": db_employee.id,
+                            "data": data,
+                        })
+                OutboxService.append_many(db, events)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        for previous in audits:
+            AuditService.record("employee", previous.id, "update", actor_id, AuditService.diff(previous, changes))
+        return affected
+    
+    @staticmethod
+    def archive_terminated(
+        db: Session,
+        after_days: int,
+        batch_size: int = BATCH_CHUNK_SIZE,
+        on_chunk: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Move employees terminated more than ``after_days`` ago to the archive.
+        
+        Each chunk is copied and deleted in its own short transaction with
+        INSERT ... SELECT, so rows never pass through Python. Employees still
+        referenced as someone's manager, or as a department manager, or
+        still holding attendance punches or leave records (whose foreign
+        keys point at ``employees``) stay in the hot table. Termination age is measured from ``terminated_at``, so
+        later edits do not restart the clock. ``on_chunk`` is called with the
+        running total after each committed chunk.
+        
+        Returns:
+            Number of employees archived
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=after_days)
+        subordinate = select(models.Employee.manager_id).where(models.Employee.manager_id.is_not(None))
+        department_manager = select(Department.manager_id).where(Department.manager_id.is_not(None))
+        candidates = select(models.Employee.id).where(
+            _terminated_before(models.Employee.__table__, cutoff),
+            models.Employee.id.not_in(subordinate),
+            models.Employee.id.not_in(department_manager),
+            *[~exists().where(dependent.employee_id == models.Employee.id) for dependent in EMPLOYEE_DEPENDENTS],
+        ).order_by(models.Employee.id).limit(batch_size)
+        
+        columns = [column.name for column in models.Employee.__table__.columns]
+        archived_at = datetime.now(timezone.utc)
+        archived = 0
+        while True:
+            try:
+                chunk = list(db.execute(candidates.with_for_update()).scalars())
+                if not chunk:
+                    return archived
+                cells = CountService.cells_of(db, "employees", chunk)
+                CountService.adjust_cells(db, "employees", cells, -1)
+                CountService.adjust_cells(db, "employees_archive", cells)
+                db.execute(
+                    insert(models.EmployeeArchive).from_select(
+                        columns + ["archived_at"],
+                        select(
+                            *[models.Employee.__table__.c[name] for name in columns],
+                            literal(archived_at, models.EmployeeArchive.archived_at.type),
+                        ).where(models.Employee.id.in_(chunk)),
+                    )
+                )
+                db.execute(delete(models.Employee).where(models.Employee.id.in_(chunk)))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            archived += len(chunk)
+            if on_chunk is not None:
+                on_chunk(archived)
+    
+    @staticmethod
+    def purge_retention(
+        db: Session,
+        after_years: int,
+        mode: str = "anonymize",
+        batch_size: int = BATCH_CHUNK_SIZE,
+        pause_seconds: float = 0.0,
+        reassign_reports: bool = True,
+        dry_run: bool = False,
+        on_chunk: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Purge personal data of employees terminated more than ``after_years`` ago.
+        
+        Both the hot table and the archive are walked in keyset order by ID,
+        one short transaction per chunk, sleeping ``pause_seconds`` between
+        chunks so the purge never holds locks for long or starves other
+        writers. Before a chunk is purged, reports of its employees are
+        moved to their skip-level manager (or detached when that manager is
+        leaving too, or ``reassign_reports`` is false) and departments they
+        manage lose their manager.
+        
+        In ``anonymize`` mode personal columns are overwritten and the row is
+        stamped with ``purged_at`` and published as ``employee.updated``; in
+        ``delete`` mode the rows go, together with their attendance punches
+        and leave records, leaving a tombstone and an ``employee.deleted``
+        event. Either way the employee's personal values are cleared from
+        the audit trail and earlier outbox events lose their snapshots.
+        ``on_chunk`` is called with (purged so far, eligible) after each
+        committed chunk.
+        
+        Args:
+            db: Database session
+            after_years: Years since termination before data is purged
+            mode: ``anonymize`` or ``delete``
+            batch_size: Employees per chunk
+            pause_seconds: Pause between chunks
+            reassign_reports: Move reports to the skip-level manager instead of detaching them
+            dry_run: Only count what would be purged
+            on_chunk: Progress callback
+        
+        Returns:
+            Counts of eligible and purged employees and of cleared references
+        """
+        if mode not in RETENTION_MODES:
+            raise ValueError(f"Unknown retention mode: {mode}")
+        
+        cutoff = _years_ago(after_years)
+        tables = (models.Employee.__table__, models.EmployeeArchive.__table__)
+        
+        def eligible(table):
+            return select(table.c.id).where(
+                _terminated_before(table, cutoff),
+                table.c.purged_at.is_(None),
+            )
+        
+        counts = [
+            db.execute(select(func.count()).select_from(eligible(table).subquery())).scalar()
+            for table in tables
+        ]
+        report = {
+            "dry_run": dry_run,
+            "mode": mode,
+            "eligible": sum(counts),
+            "eligible_archived": counts[1],
+            "purged": 0,
+            "reports_updated": 0,
+            "reports_reassigned": 0,
+            "departments_cleared": 0,
+        }
+        if dry_run:
+            leaving = eligible(tables[0]).union(eligible(tables[1]))
+            report["reports_updated"] = db.execute(
+                select(func.count()).where(
+                    models.Employee.manager_id.in_(leaving),
+                    models.Employee.id.not_in(eligible(tables[0])),
+                )
+            ).scalar()
+            report["departments_cleared"] = db.execute(
+                select(func.count()).where(Department.manager_id.in_(leaving))
+            ).scalar()
+            db.rollback()
+            return report
+        
+        for table in tables:
+            last_id = 0
+            while True:
+                try:
+                    chunk = list(db.execute(
+                        eligible(table).where(table.c.id > last_id)
+                        .order_by(table.c.id).limit(batch_size).with_for_update()
+                    ).scalars())
+                    if not chunk:
+                        db.rollback()
+                        break
+                    # Earlier copies of the personal data go with it
+                    AuditService.redact(db, "employee", chunk, ANONYMIZED_VALUES)
+                    OutboxService.redact(db, "employee", chunk)
+                    EmployeeService._release_references(db, table, chunk, reassign_reports, report)
+                    hot = table is models.Employee.__table__
+                    if mode == "anonymize":
+                        now = datetime.now(timezone.utc)
+                        db.execute(update(table).where(table.c.id.in_(chunk)).values(
+                            **ANONYMIZED_VALUES,
+                            purged_at=now,
+                            updated_at=now,
+                            version=table.c.version + 1,
+                        ))
+                        model = models.Employee if hot else models.EmployeeArchive
+                        purged = db.query(model).filter(model.id.in_(chunk)).populate_existing()
+                        OutboxService.append_many(db, [
+                            {
+                                "event_type": "employee.updated",
+                                "entity_id": db_employee.id,
+                                "data": _snapshot(db_employee),
+                                "changed_fields": sorted(ANONYMIZED_VALUES.keys() | {"purged_at"}),
+                            }
+                            for db_employee in purged
+                        ])
+                    else:
+                        for dependent in EMPLOYEE_DEPENDENTS:
+                            db.execute(delete(dependent).where(dependent.employee_id.in_(chunk)))
+                        entity = "employees" if hot else "employees_archive"
+                        cells = CountService.cells_of(db, entity, chunk)
+                        CountService.adjust_cells(db, entity, cells, -1)
+                        db.execute(delete(table).where(table.c.id.in_(chunk)))
+                        OutboxService.append_many(db, [
+                            {"event_type": "employee.deleted", "entity_id": employee_id}
+                            for employee_id in chunk
+                        ])
+                        for employee_id in chunk:
+                            ChangeFeedService.record_delete(db, "employees", employee_id)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+                last_id = chunk[-1]
+                report["purged"] += len(chunk)
+                if on_chunk is not None:
+                    on_chunk(report["purged"], report["eligible"])
+                if pause_seconds > 0:
+                    time.sleep(pause_seconds)
+        return report
+    
+    @staticmethod
+    def _release_references(
+        db: Session,
+        table: Any,
+        chunk: List[int],
+        reassign_reports: bool,
+        report: Dict[str, Any]
+    ) -> None:
+        """
+        Point reports and departments away from employees about to be purged.
+        
+        Each changed report and department gets a new version and
+        ``updated_at`` and an outbox event, like any other update.
+        """
+        targets: Dict[int, Optional[int]] = {employee_id: None for employee_id in chunk}
+        if reassign_reports:
+            managers = dict(db.execute(
+                select(table.c.id, table.c.manager_id)
+                .where(table.c.id.in_(chunk), table.c.manager_id.is_not(None))
+            ).all())
+            staying = set(db.execute(
+                select(models.Employee.id).where(
+                    models.Employee.id.in_(set(managers.values()) - set(chunk)),
+                    models.Employee.employment_status != models.EmploymentStatus.TERMINATED,
+                )
+            ).scalars())
+            targets.update({
+                employee_id: manager_id
+                for employee_id, manager_id in managers.items()
+                if manager_id in staying
+            })
+        
+        now = datetime.now(timezone.utc)
+        reassigned = {
+            employee_id: manager_id
+            for employee_id, manager_id in targets.items()
+            if manager_id is not None
+        }
+        detached = [
+            employee_id for employee_id, manager_id in targets.items() if manager_id is None
+        ]
+        reassigned_target = case(reassigned, value=models.Employee.manager_id)
+        for leaving, target in ((reassigned, reassigned_target), (detached, None)):
+            if not leaving:
+                continue
+            reports = list(db.execute(
+                select(models.Employee.id).where(
+                    models.Employee.manager_id.in_(list(leaving)),
+                    models.Employee.id.not_in(chunk),
+                )
+            ).scalars())
+            if not reports:
+                continue
+            db.execute(
+                update(models.Employee)
+                .where(models.Employee.id.in_(reports))
+                .values(manager_id=target, updated_at=now, version=models.Employee.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            updated = (
+                db.query(models.Employee)
+                .filter(models.Employee.id.in_(reports))
+                .populate_existing()
+            )
+            OutboxService.append_many(db, [
+                {
+                    "event_type": "employee.updated",
+                    "entity_id": db_employee.id,
+                    "data": _snapshot(db_employee),
+                    "changed_fields": ["manager_id"],
+                }
+                for db_employee in updated
+            ])
+            report["reports_updated"] += len(reports)
+            if leaving is reassigned:
+                report["reports_reassigned"] += len(reports)
+        
+        departments = list(db.execute(
+            select(Department.id).where(Department.manager_id.in_(chunk))
+        ).scalars())
+        if departments:
+            db.execute(
+                update(Department).where(Department.id.in_(departments))
+                .values(manager_id=None, updated_at=now, version=Department.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            cleared = (
+                db.query(Department).filter(Department.id.in_(departments)).populate_existing()
+            )
+            OutboxService.append_many(db, [
+                {
+                    "event_type": "department.updated",
+                    "entity_id": db_department.id,
+                    "data": department_schemas.Department.model_validate(
+                        db_department
+                    ).model_dump(mode="json"),
+                    "changed_fields": ["manager_id"],
+                }
+                for db_department in cleared
+            ])
+        report["departments_cleared"] += len(departments)
+    
+    @staticmethod
+    def delete(db: Session, employee_id: int, actor_id: Optional[int] = None) -> bool:
         """Delete an employee."""
         db_employee = EmployeeService.get_by_id(db, employee_id)
         if not db_employee:
             return False
         
+        snapshot = schemas.Employee.model_validate(db_employee)
+        OutboxService.append(db, "employee.deleted", employee_id, snapshot)
+        entity = "employees_archive" if isinstance(db_employee, models.EmployeeArchive) else "employees"
+        CountService.adjust(db, entity, -1, db_employee.department_id, db_employee.employment_status)
         db.delete(db_employee)
+        ChangeFeedService.record_delete(db, "employees", employee_id)
         db.commit()
+        AuditService.record("employee", employee_id, "delete", actor_id, snapshot=snapshot)
         return True
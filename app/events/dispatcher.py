@@ -0,0 +1,323 @@
+"""
+Background delivery of outbox events to webhook endpoints.
+
+Each endpoint keeps its own cursor into the outbox, so a slow or failing
+receiver never holds up the others. Events are POSTed in batches as
+``{"events": [...]}``. Delivery is at-least-once, so receivers should
+deduplicate by event ``id``. Events newer than WEBHOOK_COMMIT_LAG_SECONDS
+are held back, so an event whose transaction commits after a higher id has
+already been delivered is not skipped. Workers lease an endpoint before
+delivering to it, so running several app workers does not deliver the same
+batch twice. Database work runs in the thread pool, so only the HTTP sends
+run on the event loop.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.events import models, schemas
+
+logger = logging.getLogger(__name__)
+
+# Seconds between outbox retention sweeps
+PRUNE_INTERVAL = 300
+
+
+def _utcnow() -> datetime:
+    # Stored DateTime columns are naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _matches(event_types: List[str], event_type: str) -> bool:
+    for pattern in event_types:
+        if pattern == "*" or pattern == event_type:
+            return True
+        if pattern.endswith(".*") and event_type.startswith(pattern[:-1]):
+            return True
+    return False
+
+
+def _settled(events: List[models.OutboxEvent], horizon: datetime) -> List[models.OutboxEvent]:
+    """
+    Cut an id-ordered run of events at the first one newer than horizon.
+    
+    Ids are assigned before commit, so a transaction holding a lower id can
+    still commit after higher ids are visible. Stopping at the first recent
+    event keeps the cursor from moving past ids that may yet appear.
+    """
+    for index, event in enumerate(events):
+        if event.created_at > horizon:
+            return events[:index]
+    return events
+
+
+def backoff_seconds(failure_count: int) -> float:
+    """Exponential backoff for an endpoint's next attempt."""
+    delay = settings.WEBHOOK_BACKOFF_BASE_SECONDS * (2 ** max(failure_count - 1, 0))
+    return min(delay, settings.WEBHOOK_BACKOFF_MAX_SECONDS)
+
+
+@dataclass
+class _Batch:
+    events: List[Dict[str, Any]]
+    last_event_id: int
+
+
+@dataclass
+class _EndpointWork:
+    endpoint_id: int
+    url: str
+    secret: Optional[str]
+    max_concurrency: int
+    batches: List[_Batch] = field(default_factory=list)
+
+
+class WebhookDispatcher:
+    """Polls the outbox and delivers new events to registered endpoints."""
+    
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.metrics: Dict[str, Any] = {
+            "batches_sent": 0,
+            "events_delivered": 0,
+            "delivery_failures": 0,
+            "last_latency_ms": None,
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+        self._last_prune = 0.0
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=settings.WEBHOOK_TIMEOUT_SECONDS)
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def run(self) -> None:
+        """Deliver events until cancelled."""
+        try:
+            while True:
+                try:
+                    delivered = await self.dispatch_once()
+                    if time.monotonic() - self._last_prune > PRUNE_INTERVAL:
+                        self._last_prune = time.monotonic()
+                        await run_in_threadpool(self.prune)
+                except Exception:
+                    logger.exception("Webhook dispatch cycle failed")
+                    delivered = 0
+                if not delivered:
+                    await asyncio.sleep(settings.WEBHOOK_POLL_INTERVAL_SECONDS)
+        finally:
+            await self.aclose()
+    
+    async def dispatch_once(self) -> int:
+        """
+        Run one delivery cycle over every endpoint that is due.
+        
+        Returns:
+            Number of events delivered
+        """
+        work = await run_in_threadpool(self._collect)
+        if not work:
+            return 0
+        results = await asyncio.gather(*(self._deliver(item) for item in work))
+        await run_in_threadpool(self._record, work, results)
+        return sum(delivered for _, _, delivered in results)
+    
+    def _collect(self) -> List[_EndpointWork]:
+        db = self.session_factory()
+        try:
+            return self._collect_due(db)
+        finally:
+            db.close()
+    
+    def _collect_due(self, db: Session) -> List[_EndpointWork]:
+        now = _utcnow()
+        horizon = now - timedelta(seconds=settings.WEBHOOK_COMMIT_LAG_SECONDS)
+        endpoints = db.query(models.WebhookEndpoint).filter(
+            models.WebhookEndpoint.is_active.is_(True),
+            or_(
+                models.WebhookEndpoint.next_attempt_at.is_(None),
+                models.WebhookEndpoint.next_attempt_at <= now,
+            ),
+        ).all()
+        
+        # Copy what is needed before leasing commits and expires the rows
+        due = [
+            (e.id, e.url, e.secret, e.max_concurrency, e.event_types, e.last_event_id)
+            for e in endpoints
+        ]
+        work = []
+        for endpoint_id, url, secret, max_concurrency, event_types, last_event_id in due:
+            events = (
+                db.query(models.OutboxEvent)
+                .filter(models.OutboxEvent.id > last_event_id)
+                .order_by(models.OutboxEvent.id)
+                .limit(settings.WEBHOOK_BATCH_SIZE * max_concurrency)
+                .all()
+            )
+            events = _settled(events, horizon)
+            if not events:
+                continue
+            item = _EndpointWork(endpoint_id, url, secret, max_concurrency)
+            for start in range(0, len(events), settings.WEBHOOK_BATCH_SIZE):
+                chunk = events[start:start + settings.WEBHOOK_BATCH_SIZE]
+                item.batches.append(_Batch(
+                    events=[
+                        schemas.Event.model_validate(event).model_dump(mode="json")
+                        for event in chunk
+                        if _matches(event_types, event.event_type)
+                    ],
+                    last_event_id=chunk[-1].id,
+                ))
+            if self._lease(db, endpoint_id, now):
+                work.append(item)
+        db.commit()
+        return work
+    
+    @staticmethod
+    def _lease(db: Session, endpoint_id: int, now: datetime) -> bool:
+        result = db.execute(
+            update(models.WebhookEndpoint)
+            .where(
+                models.WebhookEndpoint.id == endpoint_id,
+                or_(
+                    models.WebhookEndpoint.lease_until.is_(None),
+                    models.WebhookEndpoint.lease_until < now,
+                ),
+            )
+            .values(lease_until=now + timedelta(seconds=settings.WEBHOOK_LEASE_SECONDS))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+    
+    async def _send(self, item: _EndpointWork, batch: _Batch) -> Optional[str]:
+        """POST one batch; returns an error message, or None on success."""
+        if not batch.events:
+            return None
+        body = json.dumps({"events": batch.events}).encode()
+        headers = {"Content-Type": "application/json"}
+        if item.secret:
+            signature = hmac.new(item.secret.encode(), body, hashlib.sha256).hexdigest()
+            headers["X-JHRIS-Signature"] = f"sha256={signature}"
+        
+        started = time.perf_counter()
+        try:
+            response = await self.client.post(item.url, content=body, headers=headers)
+        except httpx.HTTPError as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        else:
+            error = None if response.is_success else f"HTTP {response.status_code}"
+        self.metrics["last_latency_ms"] = (time.perf_counter() - started) * 1000
+        
+        if error is None:
+            self.metrics["batches_sent"] += 1
+            self.metrics["events_delivered"] += len(batch.events)
+        else:
+            self.metrics["delivery_failures"] += 1
+        return error
+    
+    async def _deliver(self, item: _EndpointWork) -> Tuple[int, Optional[str], int]:
+        """
+        Send an endpoint's batches, at most max_concurrency at a time.
+        
+        Returns:
+            Cursor after the longest run of successful batches, the first
+            error, and the number of events delivered within that run
+        """
+        semaphore = asyncio.Semaphore(item.max_concurrency)
+        
+        async def send(batch: _Batch) -> Optional[str]:
+            async with semaphore:
+                return await self._send(item, batch)
+        
+        errors = await asyncio.gather(*(send(batch) for batch in item.batches))
+        cursor, delivered = None, 0
+        for batch, error in zip(item.batches, errors):
+            if error is not None:
+                return cursor, error, delivered
+            cursor, delivered = batch.last_event_id, delivered + len(batch.events)
+        return cursor, None, delivered
+    
+    def _record(self, work: List[_EndpointWork], results) -> None:
+        db = self.session_factory()
+        try:
+            self._record_results(db, work, results)
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _record_results(db: Session, work: List[_EndpointWork], results) -> None:
+        now = _utcnow()
+        for item, (cursor, error, _) in zip(work, results):
+            endpoint = db.query(models.WebhookEndpoint).filter(
+                models.WebhookEndpoint.id == item.endpoint_id
+            ).first()
+            if endpoint is None:
+                continue
+            if cursor is not None:
+                endpoint.last_event_id = cursor
+            if error is None:
+                endpoint.failure_count = 0
+                endpoint.next_attempt_at = None
+                endpoint.last_error = None
+            else:
+                endpoint.failure_count += 1
+                endpoint.next_attempt_at = now + timedelta(
+                    seconds=backoff_seconds(endpoint.failure_count)
+                )
+                endpoint.last_error = error[:500]
+                logger.warning("Webhook delivery to %s failed: %s", item.url, error)
+            endpoint.lease_until = None
+        db.commit()
+    
+    def pending_events(self) -> int:
+        """Count outbox events not yet delivered to the furthest-behind endpoint."""
+        db = self.session_factory()
+        try:
+            latest = db.query(func.max(models.OutboxEvent.id)).scalar() or 0
+            oldest_cursor = db.query(func.min(models.WebhookEndpoint.last_event_id)).filter(
+                models.WebhookEndpoint.is_active.is_(True)
+            ).scalar()
+            return max(latest - oldest_cursor, 0) if oldest_cursor is not None else 0
+        finally:
+            db.close()
+    
+    def prune(self) -> int:
+        """Delete events past retention that every active endpoint has received."""
+        db = self.session_factory()
+        try:
+            cutoff = _utcnow() - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+            query = db.query(models.OutboxEvent).filter(models.OutboxEvent.created_at < cutoff)
+            oldest_cursor = db.query(func.min(models.WebhookEndpoint.last_event_id)).filter(
+                models.WebhookEndpoint.is_active.is_(True)
+            ).scalar()
+            if oldest_cursor is not None:
+                query = query.filter(models.OutboxEvent.id <= oldest_cursor)
+            deleted = query.delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+
+dispatcher = WebhookDispatcher()
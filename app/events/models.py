@@ -0,0 +1,48 @@
+"""
+SQLAlchemy models for the transactional outbox and webhook endpoints.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, JSON
+from app.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    Entity event written in the same transaction as the change it describes.
+    
+    The auto-increment id orders events and is the cursor webhook endpoints
+    and event-stream clients resume from.
+    """
+    
+    __tablename__ = "outbox_events"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String(100), nullable=False)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    data = Column(JSON, nullable=True)
+    changed_fields = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+
+
+class WebhookEndpoint(Base):
+    """Registered receiver of outbox events."""
+    
+    __tablename__ = "webhook_endpoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(2048), nullable=False)
+    event_types = Column(JSON, nullable=False, default=lambda: ["*"])
+    secret = Column(String(255), nullable=True)
+    is_active = Column(Boolean, default=True, nullable=False)
+    max_concurrency = Column(Integer, default=1, nullable=False)
+    
+    # Delivery state
+    last_event_id = Column(Integer, default=0, nullable=False)
+    failure_count = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=True)
+    lease_until = Column(DateTime, nullable=True)
+    last_error = Column(String(500), nullable=True)
+    
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
@@ -0,0 +1,89 @@
+"""
+Event API routes.
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.dependencies import get_current_active_user, get_current_superuser
+from app.events import schemas, service
+from app.events.dispatcher import dispatcher
+from app.events.stream import broker
+from app.users.schemas import User
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.get("/stream")
+async def stream_events(
+    department_id: Optional[int] = Query(None),
+    last_event_id: Optional[int] = Header(None),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Stream create, update and delete events as Server-Sent Events.
+    
+    Args:
+        department_id: Only send events for this department and its
+            employees and positions
+        last_event_id: Last-Event-ID sent by a reconnecting client; missed
+            events are replayed before live ones
+        current_user: Current authenticated user
+        
+    Returns:
+        text/event-stream response
+    """
+    return StreamingResponse(
+        broker.stream(last_event_id, department_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/webhooks", response_model=List[schemas.WebhookEndpoint])
+async def list_webhooks(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+):
+    """List registered webhook endpoints and their delivery state."""
+    return service.WebhookService.get_all(db)
+
+
+@router.post("/webhooks", response_model=schemas.WebhookEndpoint, status_code=status.HTTP_201_CREATED)
+async def create_webhook(
+    endpoint: schemas.WebhookEndpointCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+):
+    """
+    Register a webhook endpoint.
+    
+    The endpoint receives events recorded after registration, filtered by
+    ``event_types`` (``*``, ``employee.*`` or exact types such as
+    ``employee.terminated``).
+    """
+    return service.WebhookService.create(db, endpoint)
+
+
+@router.delete("/webhooks/{endpoint_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_webhook(
+    endpoint_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+):
+    """Delete a webhook endpoint."""
+    success = service.WebhookService.delete(db, endpoint_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Webhook endpoint not found")
+
+
+@router.get("/webhooks/metrics", response_model=schemas.DispatcherMetrics)
+async def get_webhook_metrics(
+    current_user: User = Depends(get_current_superuser),
+):
+    """Get webhook delivery metrics for this worker."""
+    pending = await run_in_threadpool(dispatcher.pending_events)
+    return {**dispatcher.metrics, "pending_events": pending}
@@ -0,0 +1,52 @@
+"""
+Pydantic schemas for outbox events and webhook endpoints.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import AnyHttpUrl, BaseModel, ConfigDict, Field
+
+
+class Event(BaseModel):
+    """Schema for an entity event as delivered to consumers."""
+    id: int
+    event_type: str
+    entity: str
+    entity_id: int
+    data: Optional[Dict[str, Any]] = None
+    changed_fields: Optional[List[str]] = None
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WebhookEndpointCreate(BaseModel):
+    """Schema for registering a webhook endpoint."""
+    url: AnyHttpUrl
+    event_types: List[str] = Field(default_factory=lambda: ["*"], min_length=1)
+    secret: Optional[str] = None
+    max_concurrency: int = Field(1, ge=1, le=16)
+
+
+class WebhookEndpoint(BaseModel):
+    """Schema for webhook endpoint response."""
+    id: int
+    url: str
+    event_types: List[str]
+    is_active: bool
+    max_concurrency: int
+    last_event_id: int
+    failure_count: int
+    next_attempt_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DispatcherMetrics(BaseModel):
+    """Schema for webhook delivery metrics of this process."""
+    batches_sent: int
+    events_delivered: int
+    delivery_failures: int
+    last_latency_ms: Optional[float] = None
+    pending_events: int
@@ -0,0 +1,114 @@
+"""
+Outbox and webhook endpoint service layer.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import func, null, update
+from sqlalchemy.orm import Session
+
+from app.events import models, schemas
+
+
+class OutboxService:
+    """Service class for appending entity events to the outbox."""
+    
+    @staticmethod
+    def append(
+        db: Session,
+        event_type: str,
+        entity_id: int,
+        data: Optional[BaseModel] = None,
+        changed_fields: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Add an event to the caller's transaction.
+        
+        The event becomes visible only if the caller commits, so consumers
+        never hear about changes that were rolled back.
+        
+        Args:
+            db: Database session holding the change
+            event_type: ``<entity>.<action>``, e.g. ``employee.created``
+            entity_id: ID of the changed row
+            data: Response schema of the row after the change
+            changed_fields: Fields set by an update
+        """
+        db.add(models.OutboxEvent(
+            event_type=event_type,
+            entity=event_type.split(".", 1)[0],
+            entity_id=entity_id,
+            data=data.model_dump(mode="json") if data is not None else None,
+            changed_fields=sorted(changed_fields) if changed_fields is not None else None,
+        ))
+    
+    @staticmethod
+    def append_many(db: Session, events: List[Dict[str, Any]]) -> None:
+        """Add many events to the caller's transaction; they flush as one batch."""
+        db.add_all([
+            models.OutboxEvent(entity=event["event_type"].split(".", 1)[0], **event)
+            for event in events
+        ])
+    
+    @staticmethod
+    def redact(db: Session, entity: str, entity_ids: List[int]) -> int:
+        """
+        Drop the row snapshots of earlier events in the caller's transaction.
+        
+        Endpoints that have not received them yet still get the events,
+        without ``data``.
+        
+        Returns:
+            Number of events redacted
+        """
+        return db.execute(
+            update(models.OutboxEvent)
+            .where(
+                models.OutboxEvent.entity == entity,
+                models.OutboxEvent.entity_id.in_(entity_ids),
+            )
+            .values(data=null())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    
+    @staticmethod
+    def latest_id(db: Session) -> int:
+        """Get the ID of the newest outbox event, or 0 if there are none."""
+        return db.query(func.max(models.OutboxEvent.id)).scalar() or 0
+
+
+class WebhookService:
+    """Service class for webhook endpoint operations."""
+    
+    @staticmethod
+    def get_all(db: Session) -> List[models.WebhookEndpoint]:
+        """Get all webhook endpoints."""
+        return db.query(models.WebhookEndpoint).order_by(models.WebhookEndpoint.id).all()
+    
+    @staticmethod
+    def create(db: Session, endpoint: schemas.WebhookEndpointCreate) -> models.WebhookEndpoint:
+        """Register an endpoint; it receives events from now on, not past ones."""
+        db_endpoint = models.WebhookEndpoint(
+            url=str(endpoint.url),
+            event_types=endpoint.event_types,
+            secret=endpoint.secret,
+            max_concurrency=endpoint.max_concurrency,
+            last_event_id=OutboxService.latest_id(db),
+        )
+        db.add(db_endpoint)
+        db.commit()
+        db.refresh(db_endpoint)
+        return db_endpoint
+    
+    @staticmethod
+    def delete(db: Session, endpoint_id: int) -> bool:
+        """Delete a webhook endpoint."""
+        db_endpoint = db.query(models.WebhookEndpoint).filter(
+            models.WebhookEndpoint.id == endpoint_id
+        ).first()
+        if not db_endpoint:
+            return False
+        
+        db.delete(db_endpoint)
+        db.commit()
+        return True
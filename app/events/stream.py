@@ -0,0 +1,216 @@
+"""
+Live fan-out of outbox events to Server-Sent Events subscribers.
+
+Events are published after their transaction commits. When Redis is
+reachable they go through its pub/sub channel so that subscribers on every
+worker receive them. Otherwise they are delivered to this worker's
+subscribers only. Event IDs are outbox IDs, so a reconnecting client sends
+Last-Event-ID and the missed events are replayed from the outbox, a page
+at a time in a worker thread.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.cache import get_redis
+from app.config import settings
+from app.database import SessionLocal
+from app.events import models, schemas
+
+logger = logging.getLogger(__name__)
+
+# Outbox rows fetched per query while replaying for a reconnecting client
+REPLAY_PAGE_SIZE = 500
+
+
+class Subscriber:
+    """One connected stream with its own bounded queue."""
+    
+    def __init__(self, department_id: Optional[int] = None):
+        self.department_id = department_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.SSE_QUEUE_SIZE)
+        self.overflowed = False
+    
+    def wants(self, data: Dict[str, Any]) -> bool:
+        """Whether an event passes this subscriber's department filter."""
+        if self.department_id is None:
+            return True
+        if data["entity"] == "department" and data["entity_id"] == self.department_id:
+            return True
+        snapshot = data.get("data") or {}
+        return snapshot.get("department_id") == self.department_id
+    
+    def offer(self, data: Dict[str, Any]) -> None:
+        """Queue an event, or mark the subscriber overflowed when it falls behind."""
+        if self.overflowed or not self.wants(data):
+            return
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            # The client reconnects with Last-Event-ID and catches up from the outbox
+            self.overflowed = True
+
+
+class EventBroker:
+    """Tracks this worker's subscribers and routes published events to them."""
+    
+    def __init__(self):
+        self.subscribers: Set[Subscriber] = set()
+        self.redis_listening = False
+    
+    def subscribe(self, department_id: Optional[int] = None) -> Subscriber:
+        subscriber = Subscriber(department_id)
+        self.subscribers.add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+    
+    def deliver(self, data: Dict[str, Any]) -> None:
+        """Hand an event to every local subscriber; safe to call from any thread."""
+        for subscriber in list(self.subscribers):
+            subscriber.loop.call_soon_threadsafe(subscriber.offer, data)
+    
+    def publish(self, events: List[Dict[str, Any]]) -> None:
+        """Publish committed events to subscribers on all workers."""
+        client = get_redis() if self.redis_listening else None
+        for data in events:
+            if client is not None:
+                try:
+                    client.publish(settings.SSE_REDIS_CHANNEL, json.dumps(data))
+                    continue
+                except redis.RedisError:
+                    logger.warning("Publishing event %s to Redis failed", data["id"])
+            self.deliver(data)
+    
+    async def listen_redis(self) -> None:
+        """Forward events from the Redis channel to local subscribers until cancelled."""
+        while True:
+            if await asyncio.to_thread(get_redis) is None:
+                await asyncio.sleep(30)
+                continue
+            client = aioredis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD or None,
+            )
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(settings.SSE_REDIS_CHANNEL)
+                self.redis_listening = True
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.deliver(json.loads(message["data"]))
+            except redis.RedisError:
+                logger.warning("Lost Redis event subscription; retrying")
+            finally:
+                self.redis_listening = False
+                await pubsub.close()
+                await client.close()
+            await asyncio.sleep(1)
+    
+    async def stream(
+        self,
+        last_event_id: Optional[int] = None,
+        department_id: Optional[int] = None,
+        session_factory=SessionLocal,
+    ) -> AsyncIterator[str]:
+        """
+        Yield Server-Sent Events, replaying from the outbox after last_event_id.
+        
+        The replay ends the stream after SSE_REPLAY_MAX_EVENTS events, and the
+        stream also ends if the client falls more than SSE_QUEUE_SIZE events
+        behind; reconnecting with Last-Event-ID resumes where it stopped.
+        """
+        subscriber = self.subscribe(department_id)
+        try:
+            yield "retry: 3000\n\n"
+            # Live events queued during the replay that it already sent. Other
+            # workers publish out of id order, so anything else is new.
+            replayed: Set[int] = set()
+            after_id = last_event_id
+            while after_id is not None:
+                # Subscribed first, so live events arriving meanwhile are queued
+                page = await asyncio.to_thread(self._replay_page, session_factory, after_id)
+                for data in page:
+                    replayed.add(data["id"])
+                    if subscriber.wants(data):
+                        yield format_event(data)
+                if len(page) < REPLAY_PAGE_SIZE:
+                    break
+                after_id = page[-1]["id"]
+                if len(replayed) >= settings.SSE_REPLAY_MAX_EVENTS:
+                    # Move the client's Last-Event-ID past filtered events too
+                    yield f"id: {after_id}\n\n"
+                    return
+            
+            while True:
+                try:
+                    data = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if subscriber.overflowed:
+                    return
+                if data["id"] not in replayed:
+                    yield format_event(data)
+        finally:
+            self.unsubscribe(subscriber)
+    
+    @staticmethod
+    def _replay_page(session_factory, after_id: int) -> List[Dict[str, Any]]:
+        db = session_factory()
+        try:
+            rows = (
+                db.query(models.OutboxEvent)
+                .filter(models.OutboxEvent.id > after_id)
+                .order_by(models.OutboxEvent.id)
+                .limit(REPLAY_PAGE_SIZE)
+                .all()
+            )
+            return [schemas.Event.model_validate(row).model_dump(mode="json") for row in rows]
+        finally:
+            db.close()
+
+
+def format_event(data: Dict[str, Any]) -> str:
+    """Render an event in text/event-stream format."""
+    return f"id: {data['id']}\nevent: {data['event_type']}\ndata: {json.dumps(data)}\n\n"
+
+
+broker = EventBroker()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_outbox_events(session: Session, flush_context) -> None:
+    if not broker.subscribers and not broker.redis_listening:
+        return
+    events = [
+        schemas.Event.model_validate(instance).model_dump(mode="json")
+        for instance in session.new
+        if isinstance(instance, models.OutboxEvent)
+    ]
+    if events:
+        session.info.setdefault("outbox_events", []).extend(events)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_outbox_events(session: Session) -> None:
+    events = session.info.pop("outbox_events", None)
+    if events:
+        broker.publish(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_outbox_events(session: Session) -> None:
+    session.info.pop("outbox_events", None)
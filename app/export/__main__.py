@@ -0,0 +1,65 @@
+"""
+Export tables to Parquet files.
+
+Usage:
+    python -m app.export ENTITY [ENTITY ...] [--output-dir DIR] [--since TIME] [--batch-size N]
+
+Writes ``<entity>.parquet`` for each entity (employees, departments,
+positions). With ``--since``, only rows updated after that time are
+exported, and the IDs of rows deleted since then are written to
+``<entity>_deletes.parquet``; the time to pass next is printed as
+``until=...``.
+"""
+import argparse
+import os
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.config import settings
+from app.database import SessionLocal
+from app.export import service
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+        
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.export", description=__doc__.split("\n\n")[0])
+    parser.add_argument("entities", nargs="+", choices=sorted(service.ENTITIES))
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--batch-size", type=int, default=settings.EXPORT_BATCH_SIZE)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None, session_factory=SessionLocal) -> None:
+    """Export the requested tables."""
+    args = parse_args(argv)
+    since = args.since
+    if since is not None and since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    until = service.export_until()
+    
+    db = session_factory()
+    try:
+        for entity in args.entities:
+            path = os.path.join(args.output_dir, f"{entity}.parquet")
+            rows, size = service.write_parquet(db, entity, path, since, until, args.batch_size)
+            print(f"{entity}: {rows} rows, {size} bytes -> {path}")
+            if since is not None:
+                path = os.path.join(args.output_dir, f"{entity}_deletes.parquet")
+                rows, size = service.write_parquet(db, entity, path, since, until, args.batch_size, deletes=True)
+                print(f"{entity} deletes: {rows} rows, {size} bytes -> {path}")
+    finally:
+        db.close()
+    print(f"until={until.replace(tzinfo=timezone.utc).isoformat()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Data warehouse export API routes.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.database import SessionLocal
+from app.dependencies import get_current_superuser
+from app.export import service
+from app.users.schemas import User
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # Stored DateTime columns are naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def get_session_factory():
+    """Session factory for exports, which stream after the request's session is closed."""
+    return SessionLocal
+
+
+def _parquet_response(
+    session_factory, entity: str, since: Optional[datetime], batch_size: Optional[int], deletes: bool
+) -> StreamingResponse:
+    if entity not in service.ENTITIES:
+        raise HTTPException(status_code=404, detail=f"Unknown export entity {entity!r}")
+    until = service.export_until()
+    content = service.stream_parquet(
+        session_factory,
+        entity,
+        since=_naive_utc(since) if since else None,
+        until=until,
+        batch_size=batch_size,
+        deletes=deletes,
+    )
+    filename = f"{entity}_deletes.parquet" if deletes else f"{entity}.parquet"
+    return StreamingResponse(
+        content,
+        media_type=service.MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Export-Until": until.replace(tzinfo=timezone.utc).isoformat(),
+        },
+    )
+
+
+@router.get("/{entity}.parquet")
+def export_parquet(
+    entity: str,
+    since: Optional[datetime] = Query(None, description="Only rows updated after this time"),
+    batch_size: Optional[int] = Query(None, ge=1, le=100000),
+    session_factory=Depends(get_session_factory),
+    current_user: User = Depends(get_current_superuser),
+):
+    """
+    Stream a table as a Parquet file (superuser only).
+    
+    The response carries ``X-Export-Until``: rows updated up to that time
+    are included, so passing it as ``since`` on the next export picks up
+    exactly the rows changed in between. It trails the current time by
+    CHANGE_FEED_LAG_SECONDS so late-committing transactions are not skipped.
+    Rows deleted in between are exported by ``/{entity}/deletes.parquet``.
+    
+    Args:
+        entity: employees, departments or positions
+        since: Only rows updated after this time
+        batch_size: Rows per record batch
+        session_factory: Creates the session the export reads with
+        current_user: Current superuser
+        
+    Returns:
+        Parquet file streamed one record batch at a time
+    """
+    return _parquet_response(session_factory, entity, since, batch_size, deletes=False)
+
+
+@router.get("/{entity}/deletes.parquet")
+def export_deletes_parquet(
+    entity: str,
+    since: Optional[datetime] = Query(None, description="Only rows deleted after this time"),
+    batch_size: Optional[int] = Query(None, ge=1, le=100000),
+    session_factory=Depends(get_session_factory),
+    current_user: User = Depends(get_current_superuser),
+):
+    """
+    Stream the IDs of a table's deleted rows as a Parquet file (superuser only).
+    
+    Takes the same ``since`` as the table export and returns the same
+    ``X-Export-Until``, so both exports cover the same window.
+    
+    Args:
+        entity: employees, departments or positions
+        since: Only rows deleted after this time
+        batch_size: Rows per record batch
+        session_factory: Creates the session the export reads with
+        current_user: Current superuser
+        
+    Returns:
+        Parquet file of ``id`` and ``deleted_at``
+    """
+    return _parquet_response(session_factory, entity, since, batch_size, deletes=True)
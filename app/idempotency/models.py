@@ -0,0 +1,24 @@
+"""
+SQLAlchemy model for stored idempotent responses.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.database import Base
+
+
+class IdempotencyRecord(Base):
+    """
+    Response stored for an Idempotency-Key.
+    
+    Used when Redis is not available. A row without a status code marks a
+    request that is still being processed.
+    """
+    
+    __tablename__ = "idempotency_records"
+    
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,234 @@
+"""
+Idempotency-Key handling for POST endpoints.
+
+The first response for a key is stored and replayed to retries of the same
+request without running the handler again. Requests that arrive while the
+first one is still in flight wait for it instead of executing in parallel.
+"""
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Type
+
+import redis
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.cache import get_redis
+from app.config import settings
+from app.idempotency import models
+
+# Seconds between checks while waiting for an in-flight request
+POLL_INTERVAL = 0.05
+
+# In-flight keys owned by this process, so local waiters wake immediately
+_inflight: Dict[str, asyncio.Event] = {}
+
+
+@dataclass
+class StoredResponse:
+    """A claimed or completed idempotency entry."""
+    fingerprint: str
+    status_code: Optional[int] = None
+    body: Optional[str] = None
+    
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
+
+
+class IdempotentReplay(Exception):
+    """Raised to short-circuit a request with its stored response."""
+    
+    def __init__(self, stored: StoredResponse):
+        self.stored = stored
+
+
+class RedisStore:
+    """Idempotency store backed by Redis."""
+    
+    def __init__(self, client: redis.Redis):
+        self.client = client
+    
+    @staticmethod
+    def _name(key: str) -> str:
+        return f"idempotency:{key}"
+    
+    def get(self, db: Session, key: str) -> Optional[StoredResponse]:
+        raw = self.client.get(self._name(key))
+        if raw is None:
+            return None
+        return StoredResponse(**json.loads(raw))
+    
+    def claim(self, db: Session, key: str, fingerprint: str) -> bool:
+        value = json.dumps({"fingerprint": fingerprint})
+        return bool(self.client.set(
+            self._name(key), value, nx=True, ex=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS
+        ))
+    
+    def complete(self, db: Session, key: str, stored: StoredResponse) -> None:
+        value = json.dumps(stored.__dict__)
+        self.client.set(self._name(key), value, ex=settings.IDEMPOTENCY_TTL_SECONDS)
+    
+    def release(self, db: Session, key: str) -> None:
+        self.client.delete(self._name(key))
+
+
+class DatabaseStore:
+    """Idempotency store backed by the idempotency_records table."""
+    
+    def get(self, db: Session, key: str) -> Optional[StoredResponse]:
+        # End any open transaction so rows written by other workers are visible
+        db.rollback()
+        record = db.query(models.IdempotencyRecord).filter(
+            models.IdempotencyRecord.key == key
+        ).first()
+        if record is None:
+            return None
+        if record.expires_at < _utcnow():
+            db.delete(record)
+            db.commit()
+            return None
+        return StoredResponse(record.fingerprint, record.status_code, record.response_body)
+    
+    def claim(self, db: Session, key: str, fingerprint: str) -> bool:
+        record = models.IdempotencyRecord(
+            key=key,
+            fingerprint=fingerprint,
+            expires_at=_utcnow() + timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS),
+        )
+        db.add(record)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False
+        return True
+    
+    def complete(self, db: Session, key: str, stored: StoredResponse) -> None:
+        db.query(models.IdempotencyRecord).filter(models.IdempotencyRecord.key == key).update(
+            {
+                "status_code": stored.status_code,
+                "response_body": stored.body,
+                "expires_at": _utcnow() + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+    
+    def release(self, db: Session, key: str) -> None:
+        db.rollback()
+        db.query(models.IdempotencyRecord).filter(
+            models.IdempotencyRecord.key == key,
+            models.IdempotencyRecord.status_code.is_(None),
+        ).delete(synchronize_session=False)
+        db.commit()
+
+
+def _utcnow() -> datetime:
+    # Stored DateTime columns are naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def get_store():
+    """Use Redis when it is reachable, otherwise the database table."""
+    client = get_redis()
+    if client is not None:
+        return RedisStore(client)
+    return DatabaseStore()
+
+
+class IdempotencyGuard:
+    """Per-request handle returned by the idempotency dependency."""
+    
+    def __init__(self, db: Session, key: Optional[str] = None, store: Any = None):
+        self.db = db
+        self.key = key
+        self.store = store
+        self.fingerprint = ""
+        self.completed = False
+    
+    async def acquire(self, fingerprint: str) -> None:
+        """
+        Claim the key, replay a stored response, or wait for an in-flight one.
+        
+        Raises:
+            IdempotentReplay: If a response for this key is already stored
+            HTTPException: 422 if the key was used for a different request,
+                409 if the original request is still running after the lock timeout
+        """
+        self.fingerprint = fingerprint
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS
+        
+        while True:
+            if self.store.claim(self.db, self.key, fingerprint):
+                _inflight[self.key] = asyncio.Event()
+                return
+            
+            stored = self.store.get(self.db, self.key)
+            if stored is None:
+                # Released or expired between claim and get; try again
+                continue
+            if stored.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=422,
+                    detail="Idempotency-Key was already used for a different request"
+                )
+            if stored.completed:
+                raise IdempotentReplay(stored)
+            
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise HTTPException(
+                    status_code=409,
+                    detail="A request with this Idempotency-Key is still being processed"
+                )
+            event = _inflight.get(self.key)
+            if event is not None:
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(min(POLL_INTERVAL, remaining))
+    
+    def save(self, result: Any, schema: Type[BaseModel], status_code: int) -> None:
+        """
+        Store the response for this key so retries can replay it.
+        
+        Args:
+            result: Object returned by the route
+            schema: Response model used to serialize the result
+            status_code: Status code the route responds with
+        """
+        if self.key is None:
+            return
+        body = schema.model_validate(result).model_dump_json()
+        self.store.complete(self.db, self.key, StoredResponse(self.fingerprint, status_code, body))
+        self.completed = True
+    
+    def finish(self) -> None:
+        """Release an unfinished claim and wake local waiters."""
+        if self.key is None:
+            return
+        if not self.completed:
+            self.store.release(self.db, self.key)
+        event = _inflight.pop(self.key, None)
+        if event is not None:
+            event.set()
+
+
+def fingerprint_request(method: str, path: str, body: bytes) -> str:
+    """Hash the parts of a request that must match for a replay."""
+    digest = hashlib.sha256()
+    digest.update(method.encode())
+    digest.update(b"\0")
+    digest.update(path.encode())
+    digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
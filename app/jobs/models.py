@@ -0,0 +1,56 @@
+"""
+SQLAlchemy background job model.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Boolean, Column, Integer, Float, String, Text, DateTime, ForeignKey, JSON, Enum as SQLEnum, Index
+import enum
+from app.database import Base
+
+
+class JobStatus(str, enum.Enum):
+    """Job status enum."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class Job(Base):
+    """A long-running operation executed by the background job runner."""
+    
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_type_id", "status", "job_type", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(100), nullable=False)
+    params = Column(JSON, nullable=False, default=dict)
+    status = Column(SQLEnum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    progress = Column(Float, nullable=False, default=0.0)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    
+    # Execution state
+    worker = Column(String(255), nullable=True)
+    lease_until = Column(DateTime, nullable=True)
+    
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class JobTypeLock(Base):
+    """
+    One row per job type, locked while claiming jobs of that type.
+    
+    Holding the lock while counting the type's running jobs keeps two
+    workers from both seeing a free slot and exceeding its concurrency.
+    """
+    
+    __tablename__ = "job_type_locks"
+    
+    job_type = Column(String(100), primary_key=True)
@@ -0,0 +1,120 @@
+"""
+Registry of background job types.
+
+A job type is a plain function ``handler(ctx, params)`` registered with
+``@job_type``. It runs in a worker process, reports progress and checks for
+cancellation through its ``JobContext``, and returns a JSON-serializable
+dict stored as the job's result (for file outputs, the result holds the
+file's location).
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import update
+
+from app.config import settings
+from app.jobs import models
+
+# Seconds between progress writes; calls in between only update memory
+PROGRESS_WRITE_INTERVAL = 1.0
+
+
+def _utcnow() -> datetime:
+    # Stored DateTime columns are naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class NoParams(BaseModel):
+    """Parameters of a job type that takes none."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job was cancelled."""
+
+
+@dataclass
+class JobType:
+    """A registered job type."""
+    name: str
+    handler: Callable[["JobContext", BaseModel], Dict[str, Any]]
+    params_model: Type[BaseModel]
+    concurrency: int
+    superuser_only: bool
+    description: Optional[str] = None
+    
+    @property
+    def max_concurrency(self) -> int:
+        """Concurrency limit, overridable per type with JOBS_CONCURRENCY."""
+        return settings.JOBS_CONCURRENCY.get(self.name, self.concurrency)
+
+
+JOB_TYPES: Dict[str, JobType] = {}
+
+
+def job_type(
+    name: str,
+    params: Type[BaseModel] = NoParams,
+    concurrency: int = 1,
+    superuser_only: bool = True,
+):
+    """Register a function as the handler of a job type."""
+    def decorator(handler):
+        JOB_TYPES[name] = JobType(
+            name=name,
+            handler=handler,
+            params_model=params,
+            concurrency=concurrency,
+            superuser_only=superuser_only,
+            description=(handler.__doc__ or "").strip().split("\n")[0] or None,
+        )
+        return handler
+    return decorator
+
+
+class JobContext:
+    """Handle a running handler uses to report progress and honour cancellation."""
+    
+    def __init__(self, job_id: int, session_factory):
+        self.job_id = job_id
+        self.session_factory = session_factory
+        self._written_at = 0.0
+    
+    def progress(self, done: float, total: float = 1.0) -> None:
+        """
+        Record progress, renew the job's lease and check for cancellation.
+        
+        Raises:
+            JobCancelled: If cancellation was requested
+        """
+        self._write(min(done / total, 1.0) if total else 1.0, force=done >= total)
+    
+    def checkpoint(self) -> None:
+        """
+        Renew the job's lease and check for cancellation without reporting progress.
+        
+        Raises:
+            JobCancelled: If cancellation was requested
+        """
+        self._write(None)
+    
+    def _write(self, progress: Optional[float], force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._written_at < PROGRESS_WRITE_INTERVAL:
+            return
+        self._written_at = now
+        
+        values = {"lease_until": _utcnow() + timedelta(seconds=settings.JOBS_LEASE_SECONDS)}
+        if progress is not None:
+            values["progress"] = progress
+        db = self.session_factory()
+        try:
+            db.execute(update(models.Job).where(models.Job.id == self.job_id).values(**values))
+            cancelled = db.query(models.Job.cancel_requested).filter(models.Job.id == self.job_id).scalar()
+            db.commit()
+        finally:
+            db.close()
+        if cancelled:
+            raise JobCancelled()
@@ -0,0 +1,108 @@
+"""
+Background job API routes.
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.dependencies import get_current_active_user
+from app.jobs import schemas, service
+from app.users.schemas import User
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/types", response_model=List[schemas.JobType])
+async def list_job_types(
+    current_user: User = Depends(get_current_active_user),
+):
+    """List the job types the current user may submit."""
+    return service.JobService.get_types(current_user)
+
+
+@router.get("/", response_model=List[schemas.Job])
+async def list_jobs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    job_type: Optional[str] = Query(None),
+    status: Optional[schemas.JobStatus] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    List jobs, newest first.
+    
+    Superusers see every job; other users see the jobs they submitted.
+    
+    Args:
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        job_type: Filter by job type
+        status: Filter by status
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        List of jobs
+    """
+    return service.JobService.get_all(db, current_user, skip, limit, job_type, status)
+
+
+@router.post("/", response_model=schemas.Job, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    job: schemas.JobCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Queue a job for the background runner.
+    
+    Poll ``GET /jobs/{id}`` for progress; a finished job's ``result`` holds
+    its output or the location of the file it produced.
+    
+    Args:
+        job: Job type and parameters
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Queued job
+    """
+    return service.JobService.create(db, job, current_user)
+
+
+@router.get("/{job_id}", response_model=schemas.Job)
+async def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get a job's status, progress and result."""
+    job = service.JobService.get_by_id(db, job_id, current_user)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=schemas.Job)
+async def cancel_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Cancel a job.
+    
+    Args:
+        job_id: Job ID
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Job, cancelled or with cancellation requested
+    """
+    job = service.JobService.cancel(db, job_id, current_user)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
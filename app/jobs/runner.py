@@ -0,0 +1,255 @@
+"""
+Background job runner.
+
+Each app worker runs a ``JobRunner`` loop (started from the app lifespan,
+so jobs run wherever ``python -m app.serve`` runs). The loop claims queued
+jobs from the ``jobs`` table and executes their handlers in a pool of
+JOBS_MAX_WORKERS spawned processes, so heavy work never competes with the
+event loop or request threads for the GIL.
+
+A job type runs at most ``concurrency`` jobs at a time across all workers:
+running jobs are counted in the database when claiming, while holding the
+type's row in ``job_type_locks`` so claims of one type never interleave.
+Running jobs hold a lease renewed by their runner and by the handler's
+progress reports; a job whose lease expires (its worker died) is marked
+failed.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.database import SessionLocal
+from app.jobs import models
+from app.jobs.registry import JOB_TYPES, JobCancelled, JobContext
+
+# Registers the built-in job types in every process
+import app.jobs.tasks  # noqa: F401
+
+# Spawned workers import only this module, so load every mapped model for
+# relationship() targets to resolve
+import app.users.models  # noqa: F401
+import app.employees.models  # noqa: F401
+import app.departments.models  # noqa: F401
+import app.positions.models  # noqa: F401
+import app.events.models  # noqa: F401
+import app.audit.models  # noqa: F401
+import app.leave.models  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+# Queued jobs examined per claim
+CLAIM_WINDOW = 50
+
+
+def _utcnow() -> datetime:
+    # Stored DateTime columns are naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def execute_job(job_id: int, session_factory=None) -> str:
+    """
+    Run a claimed job's handler and record its outcome.
+    
+    Runs inside a pool process; ``session_factory`` defaults to the
+    process's own ``SessionLocal``.
+    
+    Returns:
+        Final job status
+    """
+    session_factory = session_factory or SessionLocal
+    db = session_factory()
+    try:
+        job = db.get(models.Job, job_id)
+        values = {}
+        try:
+            registered = JOB_TYPES[job.job_type]
+            params = registered.params_model(**job.params)
+            # Don't hold a transaction open while the handler runs
+            db.commit()
+            result = registered.handler(JobContext(job_id, session_factory), params)
+            values.update(status=models.JobStatus.SUCCEEDED, result=result, progress=1.0)
+        except JobCancelled:
+            values.update(status=models.JobStatus.CANCELLED)
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job_id, job.job_type)
+            db.rollback()
+            values.update(status=models.JobStatus.FAILED, error=f"{type(exc).__name__}: {exc}"[:2000])
+        values["finished_at"] = _utcnow()
+        db.execute(update(models.Job).where(models.Job.id == job_id).values(**values, lease_until=None))
+        db.commit()
+        return values["status"].value
+    finally:
+        db.close()
+
+
+class JobRunner:
+    """Claims queued jobs and runs them in a process pool."""
+    
+    def __init__(self, session_factory=SessionLocal, executor: Optional[Executor] = None):
+        self.session_factory = session_factory
+        self._executor = executor
+        self._active: Dict[int, asyncio.Future] = {}
+        self._type_locks_ready = False
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+    
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.JOBS_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+    
+    @property
+    def capacity(self) -> int:
+        return settings.JOBS_MAX_WORKERS - len(self._active)
+    
+    async def run(self) -> None:
+        """Claim and run jobs until cancelled."""
+        try:
+            while True:
+                try:
+                    await self.run_once()
+                except Exception:
+                    logger.exception("Job runner cycle failed")
+                await asyncio.sleep(settings.JOBS_POLL_INTERVAL_SECONDS)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+    
+    async def run_once(self) -> List[asyncio.Future]:
+        """
+        Renew leases, fail abandoned jobs and start as many queued jobs as allowed.
+        
+        Returns:
+            Futures of the jobs started
+        """
+        await run_in_threadpool(self._maintain)
+        if self.capacity <= 0:
+            return []
+        if not self._type_locks_ready:
+            await run_in_threadpool(self._create_type_locks)
+            self._type_locks_ready = True
+        claimed = await run_in_threadpool(self._claim, self.capacity)
+        
+        loop = asyncio.get_running_loop()
+        # A pool process opens its own sessions; an in-process executor shares ours
+        factory = None if isinstance(self.executor, ProcessPoolExecutor) else self.session_factory
+        started = []
+        for job_id in claimed:
+            future = loop.run_in_executor(self.executor, execute_job, job_id, factory)
+            self._active[job_id] = future
+            future.add_done_callback(lambda _, job_id=job_id: self._active.pop(job_id, None))
+            started.append(future)
+        return started
+    
+    def _maintain(self) -> None:
+        db = self.session_factory()
+        try:
+            now = _utcnow()
+            if self._active:
+                db.execute(
+                    update(models.Job)
+                    .where(models.Job.id.in_(list(self._active)), models.Job.status == models.JobStatus.RUNNING)
+                    .values(lease_until=now + timedelta(seconds=settings.JOBS_LEASE_SECONDS))
+                )
+            abandoned = db.execute(
+                update(models.Job)
+                .where(
+                    models.Job.status == models.JobStatus.RUNNING,
+                    models.Job.lease_until < now,
+                    models.Job.id.not_in(list(self._active) or [0]),
+                )
+                .values(status=models.JobStatus.FAILED, error="Worker lost", finished_at=now, lease_until=None)
+            ).rowcount
+            db.commit()
+            if abandoned:
+                logger.warning("Marked %d abandoned jobs as failed", abandoned)
+        finally:
+            db.close()
+    
+    def _create_type_locks(self) -> None:
+        """Insert the lock row of every registered job type that lacks one."""
+        db = self.session_factory()
+        try:
+            existing = {row.job_type for row in db.query(models.JobTypeLock.job_type)}
+            db.add_all(models.JobTypeLock(job_type=name) for name in JOB_TYPES if name not in existing)
+            db.commit()
+        except IntegrityError:
+            # Another worker created them first
+            db.rollback()
+        finally:
+            db.close()
+    
+    def _claim(self, capacity: int) -> List[int]:
+        db = self.session_factory()
+        try:
+            queued = (
+                db.query(models.Job)
+                .filter(models.Job.status == models.JobStatus.QUEUED)
+                .order_by(models.Job.id)
+                .with_for_update(skip_locked=True)
+                .limit(CLAIM_WINDOW)
+                .all()
+            )
+            # Lock the candidate types in a fixed order, then count their
+            # running jobs; the count sees every claim committed under the lock
+            locked = {
+                row.job_type
+                for row in db.query(models.JobTypeLock)
+                .filter(models.JobTypeLock.job_type.in_({job.job_type for job in queued}))
+                .order_by(models.JobTypeLock.job_type)
+                .with_for_update()
+            }
+            running = dict(
+                db.query(models.Job.job_type, func.count(models.Job.id))
+                .filter(models.Job.status == models.JobStatus.RUNNING, models.Job.job_type.in_(locked))
+                .group_by(models.Job.job_type)
+                .all()
+            ) if locked else {}
+            
+            now = _utcnow()
+            claimed = []
+            for job in queued:
+                registered = JOB_TYPES.get(job.job_type)
+                if registered is None:
+                    job.status = models.JobStatus.FAILED
+                    job.error = f"Unknown job type {job.job_type}"
+                    job.finished_at = now
+                    continue
+                if job.job_type not in locked:
+                    # Registered after this runner created the lock rows
+                    self._type_locks_ready = False
+                    continue
+                if running.get(job.job_type, 0) >= registered.max_concurrency:
+                    continue
+                running[job.job_type] = running.get(job.job_type, 0) + 1
+                job.status = models.JobStatus.RUNNING
+                job.started_at = now
+                job.worker = self.worker
+                job.lease_until = now + timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+                claimed.append(job.id)
+                if len(claimed) == capacity:
+                    break
+            db.commit()
+            return claimed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+job_runner = JobRunner()
@@ -0,0 +1,49 @@
+"""
+Pydantic schemas for background jobs.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from enum import Enum
+
+
+class JobStatus(str, Enum):
+    """Job status enum."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobCreate(BaseModel):
+    """Schema for submitting a job."""
+    job_type: str = Field(..., max_length=100)
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+
+class Job(BaseModel):
+    """Schema for job response."""
+    id: int
+    job_type: str
+    params: Dict[str, Any]
+    status: JobStatus
+    progress: float
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    cancel_requested: bool
+    created_by: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JobType(BaseModel):
+    """Schema for a registered job type."""
+    name: str
+    description: Optional[str] = None
+    concurrency: int
+    superuser_only: bool
+    params_schema: Dict[str, Any]
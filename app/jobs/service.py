@@ -0,0 +1,118 @@
+"""
+Job service layer for business logic.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+
+from app.jobs import models, schemas
+from app.jobs.registry import JOB_TYPES
+from app.users.models import User
+
+
+def _utcnow() -> datetime:
+    # Stored DateTime columns are naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobService:
+    """Service class for background job operations."""
+    
+    @staticmethod
+    def get_types(user: User) -> List[Dict[str, Any]]:
+        """Get the job types a user may submit."""
+        return [
+            {
+                "name": registered.name,
+                "description": registered.description,
+                "concurrency": registered.max_concurrency,
+                "superuser_only": registered.superuser_only,
+                "params_schema": registered.params_model.model_json_schema(),
+            }
+            for registered in JOB_TYPES.values()
+            if user.is_superuser or not registered.superuser_only
+        ]
+    
+    @staticmethod
+    def get_by_id(db: Session, job_id: int, user: User) -> Optional[models.Job]:
+        """Get a job by ID; users other than superusers only see their own jobs."""
+        query = db.query(models.Job).filter(models.Job.id == job_id)
+        if not user.is_superuser:
+            query = query.filter(models.Job.created_by == user.id)
+        return query.first()
+    
+    @staticmethod
+    def get_all(
+        db: Session,
+        user: User,
+        skip: int = 0,
+        limit: int = 100,
+        job_type: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[models.Job]:
+        """Get jobs, newest first."""
+        query = db.query(models.Job)
+        
+        if not user.is_superuser:
+            query = query.filter(models.Job.created_by == user.id)
+        
+        if job_type:
+            query = query.filter(models.Job.job_type == job_type)
+        
+        if status:
+            query = query.filter(models.Job.status == status)
+        
+        return query.order_by(models.Job.id.desc()).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def create(db: Session, job: schemas.JobCreate, user: User) -> models.Job:
+        """
+        Queue a job.
+        
+        Raises:
+            HTTPException: 400 for an unknown job type, 403 if the type is
+                superuser-only, 422 if the parameters are invalid
+        """
+        registered = JOB_TYPES.get(job.job_type)
+        if registered is None:
+            raise HTTPException(status_code=400, detail="Unknown job type")
+        if registered.superuser_only and not user.is_superuser:
+            raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
+        try:
+            params = registered.params_model(**job.params)
+        except ValidationError as exc:
+            raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False))
+        
+        db_job = models.Job(
+            job_type=job.job_type,
+            params=params.model_dump(mode="json"),
+            created_by=user.id,
+        )
+        db.add(db_job)
+        db.commit()
+        db.refresh(db_job)
+        return db_job
+    
+    @staticmethod
+    def cancel(db: Session, job_id: int, user: User) -> Optional[models.Job]:
+        """
+        Cancel a job.
+        
+        A queued job is cancelled immediately; a running job stops at its
+        handler's next progress report.
+        """
+        db_job = JobService.get_by_id(db, job_id, user)
+        if db_job is None:
+            return None
+        if db_job.status == models.JobStatus.QUEUED:
+            db_job.status = models.JobStatus.CANCELLED
+            db_job.finished_at = _utcnow()
+        elif db_job.status == models.JobStatus.RUNNING:
+            db_job.cancel_requested = True
+        else:
+            raise HTTPException(status_code=409, detail="Job already finished")
+        db.commit()
+        db.refresh(db_job)
+        return db_job
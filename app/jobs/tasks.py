@@ -0,0 +1,75 @@
+"""
+Built-in job types.
+"""
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.employees.service import EmployeeService
+from app.jobs.registry import JobContext, job_type
+from app.leave import schemas as leave_schemas
+from app.leave.service import LeaveService
+
+
+class ArchiveParams(BaseModel):
+    """Parameters of the employee archival job."""
+    after_days: Optional[int] = Field(None, ge=0)
+
+
+class PurgeParams(BaseModel):
+    """Parameters of the employee retention purge job."""
+    after_years: Optional[int] = Field(None, ge=1)
+    mode: Optional[Literal["anonymize", "delete"]] = None
+    dry_run: bool = False
+
+
+class ReconcileParams(BaseModel):
+    """Parameters of the leave balance reconciliation job."""
+    repair: bool = False
+
+
+@job_type("employees.archive", ArchiveParams)
+def archive_employees(ctx: JobContext, params: ArchiveParams) -> Dict[str, Any]:
+    """Move long-terminated employees to the archive."""
+    db = ctx.session_factory()
+    try:
+        after_days = params.after_days
+        if after_days is None:
+            after_days = settings.EMPLOYEE_ARCHIVE_AFTER_DAYS
+        archived = EmployeeService.archive_terminated(
+            db, after_days, settings.EMPLOYEE_ARCHIVE_BATCH_SIZE, on_chunk=lambda total: ctx.checkpoint()
+        )
+        return {"archived": archived}
+    finally:
+        db.close()
+
+
+@job_type("employees.purge", PurgeParams)
+def purge_employees(ctx: JobContext, params: PurgeParams) -> Dict[str, Any]:
+    """Purge personal data of employees terminated beyond the retention period."""
+    db = ctx.session_factory()
+    try:
+        return EmployeeService.purge_retention(
+            db,
+            params.after_years or settings.EMPLOYEE_RETENTION_YEARS,
+            params.mode or settings.EMPLOYEE_RETENTION_MODE,
+            settings.EMPLOYEE_RETENTION_BATCH_SIZE,
+            settings.EMPLOYEE_RETENTION_PAUSE_MS / 1000,
+            settings.EMPLOYEE_RETENTION_REASSIGN_REPORTS,
+            dry_run=params.dry_run,
+            on_chunk=ctx.progress,
+        )
+    finally:
+        db.close()
+
+
+@job_type("leave.reconcile", ReconcileParams)
+def reconcile_leave_balances(ctx: JobContext, params: ReconcileParams) -> Dict[str, Any]:
+    """Verify leave balances against the ledger, optionally repairing them."""
+    db = ctx.session_factory()
+    try:
+        report = LeaveService.reconcile(db, params.repair)
+        return leave_schemas.ReconciliationReport(**report).model_dump(mode="json")
+    finally:
+        db.close()
@@ -0,0 +1,133 @@
+"""
+In-memory interval index of pending and approved leave.
+
+For each employee, the index keeps the absences sorted by start date,
+alongside a parallel list of start dates for bisection and the longest
+absence seen. Absences overlapping [start, end] must begin between
+``start - longest`` and ``end``, so a query is two bisections plus a scan
+of that window per employee: a team calendar for 50 people costs about 100
+binary searches, however much leave history there is.
+
+Writes in this process update the index immediately. Other processes'
+writes are picked up every LEAVE_CALENDAR_REFRESH_SECONDS by re-reading
+only requests updated since the last refresh.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.leave import models
+
+# Re-read requests updated this long before the previous refresh, to cover
+# transactions that committed late
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+@dataclass(frozen=True, order=True)
+class Absence:
+    """An employee's pending or approved leave."""
+    start_date: date
+    end_date: date
+    request_id: int
+    employee_id: int
+    leave_type_id: int
+    status: str
+
+
+class _EmployeeAbsences:
+    __slots__ = ("absences", "starts", "longest")
+    
+    def __init__(self):
+        self.absences: List[Absence] = []
+        self.starts: List[date] = []
+        self.longest = timedelta(0)
+
+
+class AbsenceIndex:
+    """Per-employee interval index over leave requests."""
+    
+    def __init__(self):
+        self._employees: Dict[int, _EmployeeAbsences] = {}
+        self._requests: Dict[int, Absence] = {}
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at = 0.0
+        self._lock = threading.RLock()
+    
+    def clear(self) -> None:
+        """Forget everything; the next query reloads from the database."""
+        with self._lock:
+            self._employees.clear()
+            self._requests.clear()
+            self._watermark = None
+            self._refreshed_at = 0.0
+    
+    def _remove(self, request_id: int) -> None:
+        absence = self._requests.pop(request_id, None)
+        if absence is None:
+            return
+        entry = self._employees[absence.employee_id]
+        position = bisect_left(entry.absences, absence)
+        del entry.absences[position]
+        del entry.starts[position]
+    
+    def upsert(self, leave_request: models.LeaveRequest) -> None:
+        """Add, move or (once rejected) drop a leave request."""
+        with self._lock:
+            self._remove(leave_request.id)
+            if leave_request.status == models.LeaveRequestStatus.REJECTED:
+                return
+            absence = Absence(
+                start_date=leave_request.start_date,
+                end_date=leave_request.end_date,
+                request_id=leave_request.id,
+                employee_id=leave_request.employee_id,
+                leave_type_id=leave_request.leave_type_id,
+                status=models.LeaveRequestStatus(leave_request.status).value,
+            )
+            entry = self._employees.setdefault(absence.employee_id, _EmployeeAbsences())
+            position = bisect_right(entry.absences, absence)
+            entry.absences.insert(position, absence)
+            entry.starts.insert(position, absence.start_date)
+            entry.longest = max(entry.longest, absence.end_date - absence.start_date)
+            self._requests[absence.request_id] = absence
+    
+    def refresh(self, db: Session, force: bool = False) -> None:
+        """Load requests changed since the last refresh, at most every LEAVE_CALENDAR_REFRESH_SECONDS."""
+        with self._lock:
+            if not force and time.monotonic() - self._refreshed_at < settings.LEAVE_CALENDAR_REFRESH_SECONDS:
+                return
+            started = datetime.now(timezone.utc).replace(tzinfo=None)
+            query = db.query(models.LeaveRequest)
+            if self._watermark is None:
+                query = query.filter(models.LeaveRequest.status != models.LeaveRequestStatus.REJECTED)
+            else:
+                query = query.filter(models.LeaveRequest.updated_at >= self._watermark - REFRESH_OVERLAP)
+            for leave_request in query.yield_per(1000):
+                self.upsert(leave_request)
+            self._watermark = started
+            self._refreshed_at = time.monotonic()
+    
+    def overlapping(self, employee_ids: Iterable[int], start: date, end: date) -> List[Absence]:
+        """Absences of the given employees overlapping [start, end], by start date."""
+        found = []
+        with self._lock:
+            for employee_id in employee_ids:
+                entry = self._employees.get(employee_id)
+                if entry is None:
+                    continue
+                low = bisect_left(entry.starts, start - entry.longest)
+                high = bisect_right(entry.starts, end)
+                found.extend(
+                    absence for absence in entry.absences[low:high] if absence.end_date >= start
+                )
+        found.sort()
+        return found
+
+
+absence_index = AbsenceIndex()
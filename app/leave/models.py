@@ -0,0 +1,102 @@
+"""
+SQLAlchemy leave models.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Numeric, ForeignKey, Enum as SQLEnum, Index
+from sqlalchemy.orm import relationship
+import enum
+from app.database import Base
+
+
+class LeaveRequestStatus(str, enum.Enum):
+    """Leave request status enum."""
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+
+
+class LedgerEntryType(str, enum.Enum):
+    """Leave ledger entry type enum."""
+    ACCRUAL = "accrual"
+    USAGE = "usage"
+    ADJUSTMENT = "adjustment"
+
+
+class LeaveType(Base):
+    """Leave type model."""
+    
+    __tablename__ = "leave_types"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, nullable=False)
+    description = Column(Text, nullable=True)
+    max_days = Column(Numeric(6, 2), nullable=False, default=0)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+class LeaveRequest(Base):
+    """Leave request model."""
+    
+    __tablename__ = "leave_requests"
+    __table_args__ = (
+        Index("ix_leave_requests_employee_dates", "employee_id", "start_date", "end_date"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+    leave_type_id = Column(Integer, ForeignKey("leave_types.id"), nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    days = Column(Numeric(6, 2), nullable=False)
+    reason = Column(Text, nullable=True)
+    status = Column(SQLEnum(LeaveRequestStatus), nullable=False, default=LeaveRequestStatus.PENDING, index=True)
+    approved_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    approved_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    
+    # Relationships
+    leave_type = relationship("LeaveType")
+
+
+class LeaveLedgerEntry(Base):
+    """
+    Append-only record of a change to an employee's leave balance.
+    
+    Accruals and positive adjustments add days, usage subtracts them; the
+    sum of an employee's entries for a leave type is their balance.
+    """
+    
+    __tablename__ = "leave_ledger"
+    __table_args__ = (
+        Index("ix_leave_ledger_employee_type", "employee_id", "leave_type_id", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+    leave_type_id = Column(Integer, ForeignKey("leave_types.id"), nullable=False)
+    entry_type = Column(SQLEnum(LedgerEntryType), nullable=False)
+    days = Column(Numeric(6, 2), nullable=False)
+    leave_request_id = Column(Integer, ForeignKey("leave_requests.id"), nullable=True)
+    note = Column(String(255), nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+class LeaveBalance(Base):
+    """
+    Materialized leave balance of an employee for one leave type.
+    
+    Updated in the same transaction as every ledger entry, so reading a
+    balance never needs to sum the ledger.
+    """
+    
+    __tablename__ = "leave_balances"
+    
+    employee_id = Column(Integer, ForeignKey("employees.id"), primary_key=True)
+    leave_type_id = Column(Integer, ForeignKey("leave_types.id"), primary_key=True)
+    accrued = Column(Numeric(8, 2), nullable=False, default=0)
+    used = Column(Numeric(8, 2), nullable=False, default=0)
+    balance = Column(Numeric(8, 2), nullable=False, default=0)
+    last_entry_id = Column(Integer, nullable=True)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
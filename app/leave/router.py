@@ -0,0 +1,196 @@
+"""
+Leave API routes.
+"""
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.dependencies import get_current_active_user, get_current_superuser
+from app.leave import schemas, service
+from app.users.schemas import User
+
+router = APIRouter(prefix="/leave", tags=["leave"])
+
+# Balances are read per employee, next to the other employee endpoints
+balance_router = APIRouter(prefix="/employees", tags=["leave"])
+
+
+@router.get("/types", response_model=List[schemas.LeaveType])
+async def list_leave_types(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """List leave types."""
+    return service.LeaveService.get_types(db)
+
+
+@router.post("/types", response_model=schemas.LeaveType, status_code=status.HTTP_201_CREATED)
+async def create_leave_type(
+    leave_type: schemas.LeaveTypeCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+):
+    """Create a leave type."""
+    return service.LeaveService.create_type(db, leave_type)
+
+
+@router.get("/requests", response_model=List[schemas.LeaveRequest])
+async def list_leave_requests(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    employee_id: Optional[int] = Query(None),
+    status: Optional[schemas.LeaveRequestStatus] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    List leave requests, newest first.
+    
+    Args:
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        employee_id: Filter by employee ID
+        status: Filter by status
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        List of leave requests
+    """
+    return service.LeaveService.get_requests(db, skip, limit, employee_id, status)
+
+
+@router.post("/requests", response_model=schemas.LeaveRequest, status_code=status.HTTP_201_CREATED)
+async def create_leave_request(
+    leave_request: schemas.LeaveRequestCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Submit a leave request for approval."""
+    return service.LeaveService.create_request(db, leave_request)
+
+
+@router.get("/requests/{request_id}", response_model=schemas.LeaveRequest)
+async def get_leave_request(
+    request_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get a leave request by ID."""
+    leave_request = service.LeaveService.get_request(db, request_id)
+    if not leave_request:
+        raise HTTPException(status_code=404, detail="Leave request not found")
+    return leave_request
+
+
+@router.put("/requests/{request_id}/status", response_model=schemas.LeaveRequest)
+async def decide_leave_request(
+    request_id: int,
+    decision: schemas.LeaveRequestDecision,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+):
+    """
+    Approve or reject a pending leave request.
+    
+    Approving deducts the days from the employee's balance in the same
+    transaction, and fails with 400 if the balance is insufficient.
+    
+    Args:
+        request_id: Leave request ID
+        decision: approved or rejected
+        db: Database session
+        current_user: Current superuser
+        
+    Returns:
+        Updated leave request
+    """
+    leave_request = service.LeaveService.decide(db, request_id, decision, current_user.id)
+    if not leave_request:
+        raise HTTPException(status_code=404, detail="Leave request not found")
+    return leave_request
+
+
+@router.get("/calendar", response_model=schemas.TeamCalendar)
+async def get_team_calendar(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    manager_id: Optional[int] = Query(None),
+    department_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get who on a team is out between two dates.
+    
+    Args:
+        start_date: First day of the range
+        end_date: Last day of the range
+        manager_id: Team of this manager's direct reports
+        department_id: Team of this department's employees
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Pending and approved absences overlapping the range
+    """
+    return service.LeaveService.get_team_calendar(db, start_date, end_date, manager_id, department_id)
+
+
+@router.get("/ledger", response_model=List[schemas.LedgerEntry])
+async def list_ledger_entries(
+    employee_id: int = Query(...),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """List an employee's leave ledger entries, newest first."""
+    return service.LeaveService.get_ledger(db, employee_id, skip, limit)
+
+
+@router.post("/ledger", response_model=schemas.LedgerEntry, status_code=status.HTTP_201_CREATED)
+async def create_ledger_entry(
+    entry: schemas.LedgerEntryCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+):
+    """Credit accrued leave or post a manual adjustment."""
+    return service.LeaveService.post_entry(db, entry, current_user.id)
+
+
+@router.post("/reconcile", response_model=schemas.ReconciliationReport)
+async def reconcile_leave_balances(
+    repair: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+):
+    """
+    Verify materialized leave balances against the ledger.
+    
+    Args:
+        repair: Overwrite mismatched balances with the ledger totals
+        db: Database session
+        current_user: Current superuser
+        
+    Returns:
+        Reconciliation report
+    """
+    return service.LeaveService.reconcile(db, repair)
+
+
+@balance_router.get("/{employee_id}/leave-balance", response_model=List[schemas.LeaveBalance])
+async def get_leave_balance(
+    employee_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get an employee's leave balances, one per leave type.
+    
+    Balances are maintained with every ledger entry, so this is a single
+    primary-key range read.
+    """
+    return service.LeaveService.get_balances(db, employee_id)
@@ -0,0 +1,154 @@
+"""
+Pydantic schemas for leave types, requests, ledger entries and balances.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from enum import Enum
+
+
+class LeaveRequestStatus(str, Enum):
+    """Leave request status enum."""
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+
+
+class LedgerEntryType(str, Enum):
+    """Leave ledger entry type enum."""
+    ACCRUAL = "accrual"
+    USAGE = "usage"
+    ADJUSTMENT = "adjustment"
+
+
+class LeaveTypeCreate(BaseModel):
+    """Schema for creating a leave type."""
+    name: str = Field(..., min_length=1, max_length=100)
+    description: Optional[str] = None
+    max_days: Decimal = Field(Decimal(0), ge=0)
+
+
+class LeaveType(LeaveTypeCreate):
+    """Schema for leave type response."""
+    id: int
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LeaveRequestCreate(BaseModel):
+    """Schema for creating a leave request."""
+    employee_id: int
+    leave_type_id: int
+    start_date: date
+    end_date: date
+    days: Decimal = Field(..., gt=0)
+    reason: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def check_dates(self) -> "LeaveRequestCreate":
+        if self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
+
+class LeaveRequestDecision(BaseModel):
+    """Schema for approving or rejecting a leave request."""
+    status: LeaveRequestStatus
+    
+    @model_validator(mode="after")
+    def check_status(self) -> "LeaveRequestDecision":
+        if self.status == LeaveRequestStatus.PENDING:
+            raise ValueError("status must be approved or rejected")
+        return self
+
+
+class LeaveRequest(LeaveRequestCreate):
+    """Schema for leave request response."""
+    id: int
+    status: LeaveRequestStatus
+    approved_by: Optional[int] = None
+    approved_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LedgerEntryCreate(BaseModel):
+    """Schema for crediting (or with a negative adjustment, debiting) leave days."""
+    employee_id: int
+    leave_type_id: int
+    entry_type: LedgerEntryType = LedgerEntryType.ACCRUAL
+    days: Decimal
+    note: Optional[str] = Field(None, max_length=255)
+    
+    @model_validator(mode="after")
+    def check_days(self) -> "LedgerEntryCreate":
+        if self.entry_type == LedgerEntryType.USAGE:
+            raise ValueError("Usage is recorded by approving a leave request")
+        if self.entry_type == LedgerEntryType.ACCRUAL and self.days <= 0:
+            raise ValueError("Accruals must be positive")
+        return self
+
+
+class LedgerEntry(BaseModel):
+    """Schema for leave ledger entry response."""
+    id: int
+    employee_id: int
+    leave_type_id: int
+    entry_type: LedgerEntryType
+    days: Decimal
+    leave_request_id: Optional[int] = None
+    note: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LeaveBalance(BaseModel):
+    """Schema for leave balance response."""
+    employee_id: int
+    leave_type_id: int
+    accrued: Decimal
+    used: Decimal
+    balance: Decimal
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BalanceMismatch(BaseModel):
+    """A materialized balance that disagrees with the ledger."""
+    employee_id: int
+    leave_type_id: int
+    ledger_balance: Decimal
+    materialized_balance: Optional[Decimal] = None
+
+
+class ReconciliationReport(BaseModel):
+    """Schema for a balance reconciliation result."""
+    checked: int
+    mismatches: List[BalanceMismatch]
+    repaired: bool
+
+
+class TeamAbsence(BaseModel):
+    """An absence on the team calendar."""
+    request_id: int
+    employee_id: int
+    first_name: str
+    last_name: str
+    leave_type_id: int
+    start_date: date
+    end_date: date
+    status: LeaveRequestStatus
+
+
+class TeamCalendar(BaseModel):
+    """Schema for a team absence calendar response."""
+    start_date: date
+    end_date: date
+    absences: List[TeamAbsence]
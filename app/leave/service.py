@@ -0,0 +1,411 @@
+"""
+Leave service layer for business logic.
+"""
+from dataclasses import asdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+
+from app.employees.models import Employee
+from app.leave import models, schemas
+from app.leave.calendar import absence_index
+
+CENT = Decimal("0.01")
+
+T = TypeVar("T")
+
+
+def _days(value) -> Decimal:
+    """Normalize a day count read from an aggregate, which some backends return as float."""
+    return Decimal(str(value or 0)).quantize(CENT)
+
+
+def _commit_with_retry(db: Session, work: Callable[[], T]) -> T:
+    """
+    Run ``work`` and commit, running it once more if the commit conflicts.
+    
+    The first entry for an employee and leave type inserts their balance
+    row. When two transactions do that at once, the loser's insert fails
+    on the primary key; on the retry it finds and locks the winner's row.
+    """
+    for attempt in range(2):
+        try:
+            result = work()
+            db.commit()
+            return result
+        except IntegrityError:
+            db.rollback()
+            if attempt:
+                raise
+        except Exception:
+            db.rollback()
+            raise
+
+
+def _ledger_totals(db: Session, *criteria) -> Dict[Tuple[int, int], object]:
+    """Sum ledger entries per employee and leave type."""
+    entry = models.LeaveLedgerEntry
+    usage = entry.entry_type == models.LedgerEntryType.USAGE
+    return {
+        (row.employee_id, row.leave_type_id): row
+        for row in db.execute(
+            select(
+                entry.employee_id,
+                entry.leave_type_id,
+                func.sum(case((usage, 0), else_=entry.days)).label("accrued"),
+                func.sum(case((usage, -entry.days), else_=0)).label("used"),
+                func.sum(entry.days).label("balance"),
+                func.max(entry.id).label("last_entry_id"),
+            ).where(*criteria).group_by(entry.employee_id, entry.leave_type_id)
+        )
+    }
+
+
+def _expected(totals) -> Tuple[Decimal, Decimal, Decimal]:
+    if totals is None:
+        return _days(0), _days(0), _days(0)
+    return _days(totals.accrued), _days(totals.used), _days(totals.balance)
+
+
+def _actual(balance: Optional[models.LeaveBalance]) -> Optional[Tuple[Decimal, Decimal, Decimal]]:
+    if balance is None:
+        return None
+    return _days(balance.accrued), _days(balance.used), _days(balance.balance)
+
+
+class LeaveService:
+    """Service class for leave operations."""
+    
+    @staticmethod
+    def get_types(db: Session) -> List[models.LeaveType]:
+        """Get all leave types."""
+        return db.query(models.LeaveType).order_by(models.LeaveType.name).all()
+    
+    @staticmethod
+    def create_type(db: Session, leave_type: schemas.LeaveTypeCreate) -> models.LeaveType:
+        """Create a new leave type."""
+        existing = db.query(models.LeaveType).filter(models.LeaveType.name == leave_type.name).first()
+        if existing:
+            raise HTTPException(status_code=400, detail="Leave type already exists")
+        
+        db_leave_type = models.LeaveType(**leave_type.model_dump())
+        db.add(db_leave_type)
+        db.commit()
+        db.refresh(db_leave_type)
+        return db_leave_type
+    
+    @staticmethod
+    def get_request(db: Session, request_id: int) -> Optional[models.LeaveRequest]:
+        """Get leave request by ID."""
+        return db.query(models.LeaveRequest).filter(models.LeaveRequest.id == request_id).first()
+    
+    @staticmethod
+    def get_requests(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        employee_id: Optional[int] = None,
+        status: Optional[str] = None
+    ) -> List[models.LeaveRequest]:
+        """Get leave requests, newest first."""
+        query = db.query(models.LeaveRequest)
+        
+        if employee_id:
+            query = query.filter(models.LeaveRequest.employee_id == employee_id)
+        
+        if status:
+            query = query.filter(models.LeaveRequest.status == status)
+        
+        return query.order_by(models.LeaveRequest.id.desc()).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def create_request(db: Session, leave_request: schemas.LeaveRequestCreate) -> models.LeaveRequest:
+        """
+        Create a pending leave request.
+        
+        The employee row is locked until the request is committed, so
+        concurrent requests of the same employee are checked for overlap one
+        after the other.
+        
+        Raises:
+            HTTPException: 409 if it overlaps a pending or approved request of
+                the same employee
+        """
+        if db.get(models.LeaveType, leave_request.leave_type_id) is None:
+            raise HTTPException(status_code=400, detail="Leave type not found")
+        locked = db.execute(
+            select(Employee.id).where(Employee.id == leave_request.employee_id).with_for_update()
+        ).first()
+        if locked is None:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Employee not found")
+        
+        # Authoritative check against the database, served by the
+        # (employee_id, start_date, end_date) index
+        overlapping = db.query(models.LeaveRequest.id).filter(
+            models.LeaveRequest.employee_id == leave_request.employee_id,
+            models.LeaveRequest.start_date <= leave_request.end_date,
+            models.LeaveRequest.end_date >= leave_request.start_date,
+            models.LeaveRequest.status != models.LeaveRequestStatus.REJECTED
+        ).first()
+        if overlapping:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Overlapping leave request")
+        
+        db_request = models.LeaveRequest(**leave_request.model_dump())
+        db.add(db_request)
+        db.commit()
+        db.refresh(db_request)
+        absence_index.upsert(db_request)
+        return db_request
+    
+    @staticmethod
+    def _post(
+        db: Session,
+        employee_id: int,
+        leave_type_id: int,
+        entry_type: models.LedgerEntryType,
+        days: Decimal,
+        leave_request_id: Optional[int] = None,
+        note: Optional[str] = None,
+        actor_id: Optional[int] = None
+    ) -> Tuple[models.LeaveLedgerEntry, models.LeaveBalance]:
+        """
+        Append a ledger entry and apply it to the locked materialized balance.
+        
+        The caller commits, so the entry and the balance change are atomic,
+        through ``_commit_with_retry`` in case it races another transaction
+        to create the balance.
+        """
+        balance = db.query(models.LeaveBalance).filter(
+            models.LeaveBalance.employee_id == employee_id,
+            models.LeaveBalance.leave_type_id == leave_type_id
+        ).with_for_update().first()
+        if balance is None:
+            balance = models.LeaveBalance(
+                employee_id=employee_id,
+                leave_type_id=leave_type_id,
+                accrued=Decimal(0),
+                used=Decimal(0),
+                balance=Decimal(0),
+            )
+            db.add(balance)
+        
+        entry = models.LeaveLedgerEntry(
+            employee_id=employee_id,
+            leave_type_id=leave_type_id,
+            entry_type=entry_type,
+            days=days,
+            leave_request_id=leave_request_id,
+            note=note,
+            created_by=actor_id,
+        )
+        db.add(entry)
+        db.flush()
+        
+        if entry_type == models.LedgerEntryType.USAGE:
+            balance.used += -days
+        else:
+            balance.accrued += days
+        balance.balance += days
+        balance.last_entry_id = entry.id
+        return entry, balance
+    
+    @staticmethod
+    def post_entry(
+        db: Session,
+        entry: schemas.LedgerEntryCreate,
+        actor_id: Optional[int] = None
+    ) -> models.LeaveLedgerEntry:
+        """Credit an accrual or post a manual adjustment to an employee's balance."""
+        if db.get(models.LeaveType, entry.leave_type_id) is None:
+            raise HTTPException(status_code=400, detail="Leave type not found")
+        
+        db_entry, _ = _commit_with_retry(db, lambda: LeaveService._post(
+            db,
+            entry.employee_id,
+            entry.leave_type_id,
+            models.LedgerEntryType(entry.entry_type),
+            entry.days,
+            note=entry.note,
+            actor_id=actor_id,
+        ))
+        db.refresh(db_entry)
+        return db_entry
+    
+    @staticmethod
+    def decide(
+        db: Session,
+        request_id: int,
+        decision: schemas.LeaveRequestDecision,
+        approver_id: int
+    ) -> Optional[models.LeaveRequest]:
+        """
+        Approve or reject a pending leave request.
+        
+        Approval posts a usage entry to the ledger and deducts the days from
+        the materialized balance in the same transaction.
+        
+        Raises:
+            HTTPException: 409 if the request was already decided, 400 if the
+                balance does not cover the requested days
+        """
+        def apply() -> Optional[models.LeaveRequest]:
+            db_request = db.query(models.LeaveRequest).filter(
+                models.LeaveRequest.id == request_id
+            ).with_for_update().first()
+            if db_request is None:
+                return None
+            if db_request.status != models.LeaveRequestStatus.PENDING:
+                raise HTTPException(status_code=409, detail="Leave request already processed")
+            
+            if decision.status == schemas.LeaveRequestStatus.APPROVED:
+                _, balance = LeaveService._post(
+                    db,
+                    db_request.employee_id,
+                    db_request.leave_type_id,
+                    models.LedgerEntryType.USAGE,
+                    -db_request.days,
+                    leave_request_id=db_request.id,
+                    actor_id=approver_id,
+                )
+                if balance.balance < 0:
+                    raise HTTPException(status_code=400, detail="Insufficient leave balance")
+            
+            db_request.status = models.LeaveRequestStatus(decision.status)
+            db_request.approved_by = approver_id
+            db_request.approved_at = datetime.now(timezone.utc)
+            return db_request
+        
+        db_request = _commit_with_retry(db, apply)
+        if db_request is None:
+            return None
+        db.refresh(db_request)
+        absence_index.upsert(db_request)
+        return db_request
+    
+    @staticmethod
+    def get_team_calendar(
+        db: Session,
+        start_date: date,
+        end_date: date,
+        manager_id: Optional[int] = None,
+        department_id: Optional[int] = None
+    ) -> Dict:
+        """
+        Get pending and approved leave overlapping a date range for a team.
+        
+        The team is a manager's direct reports or a department's employees.
+        Absences come from the in-memory interval index.
+        """
+        if manager_id is None and department_id is None:
+            raise HTTPException(status_code=400, detail="manager_id or department_id is required")
+        if end_date < start_date:
+            raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+        
+        query = select(Employee.id, Employee.first_name, Employee.last_name)
+        if manager_id is not None:
+            query = query.where(Employee.manager_id == manager_id)
+        if department_id is not None:
+            query = query.where(Employee.department_id == department_id)
+        members = {row.id: row for row in db.execute(query)}
+        
+        absence_index.refresh(db)
+        absences = [
+            {
+                **asdict(absence),
+                "first_name": members[absence.employee_id].first_name,
+                "last_name": members[absence.employee_id].last_name,
+            }
+            for absence in absence_index.overlapping(members, start_date, end_date)
+        ]
+        return {"start_date": start_date, "end_date": end_date, "absences": absences}
+    
+    @staticmethod
+    def get_balances(db: Session, employee_id: int) -> List[models.LeaveBalance]:
+        """Get an employee's materialized balances, one per leave type."""
+        return db.query(models.LeaveBalance).filter(
+            models.LeaveBalance.employee_id == employee_id
+        ).order_by(models.LeaveBalance.leave_type_id).all()
+    
+    @staticmethod
+    def get_ledger(
+        db: Session,
+        employee_id: int,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[models.LeaveLedgerEntry]:
+        """Get an employee's ledger entries, newest first."""
+        return db.query(models.LeaveLedgerEntry).filter(
+            models.LeaveLedgerEntry.employee_id == employee_id
+        ).order_by(models.LeaveLedgerEntry.id.desc()).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def reconcile(db: Session, repair: bool = False) -> Dict:
+        """
+        Verify every materialized balance against the sum of its ledger.
+        
+        Balances and ledger totals are first compared without locks. Each
+        apparent mismatch is then checked again with its balance row locked,
+        so an entry posted between the two reads is not mistaken for drift,
+        and a repair never overwrites a balance with stale totals.
+        
+        Args:
+            db: Database session
+            repair: Overwrite mismatched balances with the ledger totals
+            
+        Returns:
+            Number of balances checked, the mismatches found and whether
+            they were repaired
+        """
+        balances = {
+            (row.employee_id, row.leave_type_id): _actual(row)
+            for row in db.query(models.LeaveBalance)
+        }
+        ledger = _ledger_totals(db)
+        db.rollback()
+        keys = ledger.keys() | balances.keys()
+        suspects = sorted(key for key in keys if balances.get(key) != _expected(ledger.get(key)))
+        
+        mismatches = []
+        for employee_id, leave_type_id in suspects:
+            try:
+                balance = db.query(models.LeaveBalance).filter(
+                    models.LeaveBalance.employee_id == employee_id,
+                    models.LeaveBalance.leave_type_id == leave_type_id
+                ).with_for_update().populate_existing().first()
+                entry = models.LeaveLedgerEntry
+                totals = _ledger_totals(
+                    db, entry.employee_id == employee_id, entry.leave_type_id == leave_type_id
+                ).get((employee_id, leave_type_id))
+                expected = _expected(totals)
+                if _actual(balance) == expected:
+                    db.rollback()
+                    continue
+                mismatches.append({
+                    "employee_id": employee_id,
+                    "leave_type_id": leave_type_id,
+                    "ledger_balance": expected[2],
+                    "materialized_balance": balance.balance if balance else None,
+                })
+                if not repair:
+                    db.rollback()
+                    continue
+                if balance is None:
+                    balance = models.LeaveBalance(employee_id=employee_id, leave_type_id=leave_type_id)
+                    db.add(balance)
+                balance.accrued, balance.used, balance.balance = expected
+                balance.last_entry_id = totals.last_entry_id if totals else None
+                db.commit()
+            except IntegrityError:
+                # The balance was created concurrently, together with its first entry
+                db.rollback()
+                mismatches.pop()
+            except Exception:
+                db.rollback()
+                raise
+        return {"checked": len(keys), "mismatches": mismatches, "repaired": repair}
@@ -0,0 +1,129 @@
+"""
+Per-request batching loaders (the dataloader pattern).
+
+Loads requested in the same event loop iteration are collected and
+resolved with one batched service call, and each key is fetched at most
+once per request. Route code awaits ``loaders.<entity>.load(id)`` for
+whatever it needs, and gathering those awaits turns them into a single
+query per entity.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.departments.service import DepartmentService
+from app.employees.service import EmployeeService
+from app.positions.service import PositionService
+from app.users.service import UserService
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Batches and caches lookups by key for the lifetime of one request."""
+    
+    def __init__(self, batch_fn: Callable[[List[K]], Dict[K, V]]):
+        self.batch_fn = batch_fn
+        self._cache: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+    
+    def load(self, key: K) -> "asyncio.Future[Optional[V]]":
+        """
+        Schedule a key to be loaded with the next batch.
+        
+        Args:
+            key: Key to load
+            
+        Returns:
+            Future resolving to the value, or None if there is none
+        """
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._cache[key] = future
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                loop.call_soon(self._dispatch)
+        return future
+    
+    async def load_many(self, keys: List[K]) -> List[Optional[V]]:
+        """Load several keys in one batch."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+    
+    def prime(self, key: K, value: V) -> None:
+        """Cache a value obtained some other way, unless already loaded."""
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+    
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        try:
+            values = self.batch_fn(keys)
+        except Exception as exc:
+            for key in keys:
+                self._cache.pop(key).set_exception(exc)
+            return
+        for key in keys:
+            self._cache[key].set_result(values.get(key))
+
+
+def _by_id(rows: List[Any]) -> Dict[int, Any]:
+    return {row.id: row for row in rows}
+
+
+class Loaders:
+    """The batching loaders of one request."""
+    
+    def __init__(self, db: Session):
+        self.employees: DataLoader[int, Any] = DataLoader(
+            lambda ids: _by_id(EmployeeService.get_by_ids(db, ids, include_archived=True))
+        )
+        self.subordinates: DataLoader[int, List[Any]] = DataLoader(
+            lambda ids: EmployeeService.get_subordinates_of(db, ids)
+        )
+        self.departments: DataLoader[int, Any] = DataLoader(
+            lambda ids: _by_id(DepartmentService.get_by_ids(db, ids))
+        )
+        self.positions: DataLoader[int, Any] = DataLoader(
+            lambda ids: _by_id(PositionService.get_by_ids(db, ids))
+        )
+        self.users: DataLoader[int, Any] = DataLoader(
+            lambda ids: _by_id(UserService.get_by_ids(db, ids))
+        )
+        self.department_chains: DataLoader[int, List[Any]] = DataLoader(self._load_chains(db))
+    
+    def _load_chains(self, db: Session) -> Callable[[List[int]], Dict[int, List[Any]]]:
+        def load(department_ids: List[int]) -> Dict[int, List[Any]]:
+            departments = _by_id(DepartmentService.get_with_ancestors(db, department_ids))
+            for department in departments.values():
+                self.departments.prime(department.id, department)
+            chains = {}
+            for department_id in department_ids:
+                chain = []
+                department = departments.get(department_id)
+                while department is not None and len(chain) <= len(departments):
+                    chain.append(department)
+                    department = departments.get(department.parent_department_id)
+                chains[department_id] = chain
+            return chains
+        return load
+
+
+async def get_loaders(db: Session = Depends(get_db)) -> Loaders:
+    """
+    Dependency providing the request's batching loaders.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        Loaders sharing the request's session
+    """
+    return Loaders(db)
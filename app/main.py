@@ -2,18 +2,88 @@
 JHRIS - Human Resources Information System
 FastAPI application entry point.
 """
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.database import pool_metrics
 from app.auth.router import router as auth_router
 from app.users.router import router as users_router
 from app.employees.router import router as employees_router
+from app.employees.archiver import run_archiver
+from app.counts.reconciler import run_reconciler
 from app.departments.router import router as departments_router
 from app.positions.router import router as positions_router
+from app.events.router import router as events_router
+from app.audit.router import router as audit_router
+from app.attendance.router import router as attendance_router
+from app.attendance.buffer import punch_buffer
+from app.timesheets.router import router as timesheets_router
+from app.leave.router import router as leave_router, balance_router as leave_balance_router
+from app.orgsnapshot.router import router as org_router
+from app.jobs.router import router as jobs_router
+from app.export.router import router as export_router
+from app.jobs.runner import job_runner
+from app.auth.revocation import revocation_list
+from app.auth.keys import key_ring
+from app.ratelimit.middleware import RateLimitMiddleware
+from app.audit.writer import audit_writer
+from app.events.dispatcher import dispatcher
+from app.events.stream import broker
+from app.idempotency.service import IdempotentReplay
+from app.warmup import warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up before serving, run the webhook dispatcher, Redis event listener,
+    audit writer, employee archiver, job runner, token revocation refresh and
+    row count reconciler in the background and
+    stop reporting ready while shutting down.
+    """
+    app.state.ready = False
+    app.state.shutting_down = False
+    if settings.WARMUP_ON_STARTUP:
+        failed = await run_in_threadpool(warm_up, app)
+        app.state.ready = not failed
+    else:
+        app.state.ready = True
+    
+    background_tasks = []
+    if settings.WEBHOOK_DISPATCH_ENABLED:
+        background_tasks.append(asyncio.create_task(dispatcher.run()))
+    if settings.REDIS_ENABLED:
+        background_tasks.append(asyncio.create_task(broker.listen_redis()))
+    if settings.EMPLOYEE_ARCHIVE_ENABLED:
+        background_tasks.append(asyncio.create_task(run_archiver()))
+    if settings.COUNTS_RECONCILE_ENABLED:
+        background_tasks.append(asyncio.create_task(run_reconciler()))
+    if settings.JOBS_ENABLED:
+        background_tasks.append(asyncio.create_task(job_runner.run()))
+    if settings.AUTH_REVOCATION_REFRESH_SECONDS:
+        background_tasks.append(asyncio.create_task(revocation_list.run()))
+    if settings.AUDIT_ENABLED:
+        audit_writer.start()
+    
+    yield
+    
+    app.state.shutting_down = True
+    app.state.ready = False
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await punch_buffer.aclose()
+    await run_in_threadpool(audit_writer.stop)
+
 
 # Create FastAPI application
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="Human Resources Information System API",
@@ -22,6 +92,10 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json"
 )
 
+# Shed load and enforce quotas before a request reaches the database; added
+# first so CORS headers still apply to its 429 and 503 responses
+app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -29,14 +103,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
+
+@app.exception_handler(IdempotentReplay)
+async def idempotent_replay_handler(request: Request, exc: IdempotentReplay):
+    """Answer a retried request with its stored response."""
+    return Response(
+        content=exc.stored.body,
+        status_code=exc.stored.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
 # Include routers
 app.include_router(auth_router, prefix=settings.API_V1_PREFIX)
 app.include_router(users_router, prefix=settings.API_V1_PREFIX)
 app.include_router(employees_router, prefix=settings.API_V1_PREFIX)
 app.include_router(departments_router, prefix=settings.API_V1_PREFIX)
 app.include_router(positions_router, prefix=settings.API_V1_PREFIX)
+app.include_router(events_router, prefix=settings.API_V1_PREFIX)
+app.include_router(audit_router, prefix=settings.API_V1_PREFIX)
+app.include_router(attendance_router, prefix=settings.API_V1_PREFIX)
+app.include_router(timesheets_router, prefix=settings.API_V1_PREFIX)
+app.include_router(leave_router, prefix=settings.API_V1_PREFIX)
+app.include_router(leave_balance_router, prefix=settings.API_V1_PREFIX)
+app.include_router(org_router, prefix=settings.API_V1_PREFIX)
+app.include_router(jobs_router, prefix=settings.API_V1_PREFIX)
+app.include_router(export_router, prefix=settings.API_V1_PREFIX)
 
 
 @app.get("/")
@@ -49,7 +145,57 @@ async def root():
     }
 
 
+@app.get("/.well-known/jwks.json")
+async def jwks(request: Request):
+    """
+    Public keys that verify our tokens, as a JSON Web Key Set.
+    
+    Cacheable for JWT_JWKS_MAX_AGE_SECONDS; conditional requests with the
+    returned ETag are answered with 304 while the keys are unchanged.
+    """
+    body, etag = key_ring.jwks()
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWT_JWKS_MAX_AGE_SECONDS}",
+        "ETag": etag,
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/health/pool")
+async def pool_status():
+    """
+    Database pool metrics.
+    
+    Reports pool usage and wait time, and how many requests completed
+    without checking out a connection.
+    """
+    return pool_metrics.snapshot()
+
+
+@app.get("/health/ready")
+async def readiness_check(response: Response):
+    """
+    Readiness check endpoint.
+    
+    Reports ready only once startup warmup has completed; failed warmup
+    steps are retried on each check. Never ready again once shutdown has
+    begun.
+    """
+    if getattr(app.state, "shutting_down", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "shutting_down"}
+    if not getattr(app.state, "ready", False):
+        failed = await run_in_threadpool(warm_up, app)
+        app.state.ready = not failed
+    if not app.state.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming_up"}
+    return {"status": "ready"}
@@ -0,0 +1,397 @@
+"""
+Columnar in-memory snapshot of the organization for analytics.
+
+Employees, departments and positions are held as NumPy arrays: int64
+columns for IDs and foreign keys (-1 for NULL), and int8 codes for
+dictionary-encoded enums. Parent-pointer arrays (manager slot per
+employee, parent department slot per department) are derived from the
+foreign keys on demand. Span of control, org depth, subtree headcounts and
+managers of managers are then computed with array operations instead of
+ORM queries. A row costs a few dozen bytes, against kilobytes for an ORM
+instance.
+
+The snapshot is loaded on first use and kept current from the outbox:
+every employee, department and position write appends an event with the
+row's new state, and committed events are applied here. A full reload
+every ORG_SNAPSHOT_MAX_AGE_SECONDS picks up writes that bypass the
+services, such as archiving, and other workers' writes.
+"""
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.departments.models import Department
+from app.employees.models import Employee
+from app.events.models import OutboxEvent
+from app.positions.models import Position
+
+INITIAL_CAPACITY = 1024
+NULL = -1
+
+
+class Dictionary:
+    """Dictionary encoding of a string-valued column."""
+    
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+    
+    def encode(self, value: Any) -> int:
+        if value is None:
+            return NULL
+        value = getattr(value, "value", value)
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+    
+    def decode(self, code: int) -> Optional[str]:
+        return self.values[code] if code >= 0 else None
+    
+    def lookup(self, value: str) -> Optional[int]:
+        return self._codes.get(value)
+
+
+class ColumnTable:
+    """Growable set of equal-length columns addressed by row ID."""
+    
+    def __init__(self, columns: Dict[str, type]):
+        self.dtypes = {"id": np.int64, **columns}
+        self._reset(INITIAL_CAPACITY)
+    
+    def _reset(self, capacity: int) -> None:
+        self.size = 0
+        self.data = {name: np.full(capacity, NULL, dtype) for name, dtype in self.dtypes.items()}
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.slot_by_id = np.full(INITIAL_CAPACITY, NULL, dtype=np.int32)
+    
+    def _grow_slots(self, max_id: int) -> None:
+        if max_id < len(self.slot_by_id):
+            return
+        grown = np.full(max(max_id + 1, 2 * len(self.slot_by_id)), NULL, dtype=np.int32)
+        grown[:len(self.slot_by_id)] = self.slot_by_id
+        self.slot_by_id = grown
+    
+    def load(self, columns: Dict[str, np.ndarray]) -> None:
+        """Replace all rows."""
+        count = len(columns["id"])
+        self._reset(max(INITIAL_CAPACITY, count))
+        for name, values in columns.items():
+            self.data[name][:count] = values
+        self.alive[:count] = True
+        self.size = count
+        if count:
+            self._grow_slots(int(columns["id"].max()))
+            self.slot_by_id[columns["id"]] = np.arange(count, dtype=np.int32)
+    
+    def upsert(self, row: Dict[str, int]) -> None:
+        """Insert or overwrite one row."""
+        row_id = row["id"]
+        self._grow_slots(row_id)
+        slot = int(self.slot_by_id[row_id])
+        if slot == NULL:
+            slot = self.size
+            if slot == len(self.alive):
+                for name, values in self.data.items():
+                    self.data[name] = np.concatenate([values, np.full(len(values), NULL, values.dtype)])
+                self.alive = np.concatenate([self.alive, np.zeros(len(self.alive), dtype=bool)])
+            self.size += 1
+            self.slot_by_id[row_id] = slot
+        for name in self.dtypes:
+            self.data[name][slot] = row[name]
+        self.alive[slot] = True
+    
+    def remove(self, row_id: int) -> None:
+        """Drop one row; its slot stays allocated until the next load."""
+        if row_id < len(self.slot_by_id) and self.slot_by_id[row_id] != NULL:
+            self.alive[self.slot_by_id[row_id]] = False
+            self.slot_by_id[row_id] = NULL
+    
+    def column(self, name: str) -> np.ndarray:
+        return self.data[name][:self.size]
+    
+    def live(self) -> np.ndarray:
+        return self.alive[:self.size]
+    
+    def slots(self, ids: np.ndarray) -> np.ndarray:
+        """Map row IDs to slots; NULL and unknown IDs map to NULL."""
+        known = (ids >= 0) & (ids < len(self.slot_by_id))
+        return np.where(known, self.slot_by_id[np.where(known, ids, 0)], NULL)
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in self.data.values()) + self.alive.nbytes + self.slot_by_id.nbytes
+
+
+def _ref(data: Dict[str, Any], name: str) -> int:
+    value = data.get(name)
+    return NULL if value is None else value
+
+
+def _depths(parents: np.ndarray) -> np.ndarray:
+    """Distance of every node from its root, following a parent-pointer array."""
+    depth = np.zeros(len(parents), dtype=np.int32)
+    current = parents.copy()
+    # A chain cannot be longer than the number of nodes; stop there on cycles
+    for _ in range(len(parents)):
+        has_parent = current != NULL
+        if not has_parent.any():
+            break
+        depth += has_parent
+        current = np.where(has_parent, parents[np.where(has_parent, current, 0)], NULL)
+    return depth
+
+
+class OrgSnapshot:
+    """Columnar snapshot of employees, departments and positions."""
+    
+    def __init__(self):
+        self.employees = ColumnTable({
+            "department_id": np.int64,
+            "position_id": np.int64,
+            "manager_id": np.int64,
+            "status": np.int8,
+            "type": np.int8,
+        })
+        self.departments = ColumnTable({"parent_id": np.int64, "manager_id": np.int64})
+        self.positions = ColumnTable({"department_id": np.int64})
+        self.statuses = Dictionary()
+        self.types = Dictionary()
+        self._tables = {"employee": self.employees, "department": self.departments, "position": self.positions}
+        self.loaded_at: Optional[float] = None
+        self._parents: Dict[str, np.ndarray] = {}
+        self._lock = threading.RLock()
+    
+    # Loading and incremental updates
+    
+    def load(self, db: Session) -> None:
+        """Replace the snapshot with the current contents of the database."""
+        def fetch(*columns):
+            rows = db.execute(select(*columns)).all()
+            return [list(values) for values in zip(*rows)] if rows else [[] for _ in columns]
+        
+        def ids(values):
+            return np.array([NULL if value is None else value for value in values], dtype=np.int64)
+        
+        employee_ids, departments, positions, managers, statuses, types = fetch(
+            Employee.id, Employee.department_id, Employee.position_id, Employee.manager_id,
+            Employee.employment_status, Employee.employment_type,
+        )
+        department_ids, parents, department_managers = fetch(
+            Department.id, Department.parent_department_id, Department.manager_id,
+        )
+        position_ids, position_departments = fetch(Position.id, Position.department_id)
+        
+        with self._lock:
+            self.employees.load({
+                "id": ids(employee_ids),
+                "department_id": ids(departments),
+                "position_id": ids(positions),
+                "manager_id": ids(managers),
+                "status": np.array([self.statuses.encode(value) for value in statuses], dtype=np.int8),
+                "type": np.array([self.types.encode(value) for value in types], dtype=np.int8),
+            })
+            self.departments.load({
+                "id": ids(department_ids),
+                "parent_id": ids(parents),
+                "manager_id": ids(department_managers),
+            })
+            self.positions.load({"id": ids(position_ids), "department_id": ids(position_departments)})
+            self._parents.clear()
+            self.loaded_at = time.monotonic()
+    
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next query reloads it."""
+        with self._lock:
+            self.loaded_at = None
+    
+    def ensure_fresh(self, db: Session) -> None:
+        """Load the snapshot if it was never loaded or is older than ORG_SNAPSHOT_MAX_AGE_SECONDS."""
+        with self._lock:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at > settings.ORG_SNAPSHOT_MAX_AGE_SECONDS:
+                self.load(db)
+    
+    def apply(self, events: Iterable[Dict[str, Any]]) -> None:
+        """Apply committed outbox events (``entity``, ``event_type``, ``entity_id``, ``data``)."""
+        with self._lock:
+            if self.loaded_at is None:
+                return
+            for item in events:
+                entity, data = item["entity"], item["data"] or {}
+                table = self._tables.get(entity)
+                if table is None:
+                    continue
+                if item["event_type"].endswith(".deleted"):
+                    table.remove(item["entity_id"])
+                    continue
+                
+                if entity == "employee":
+                    table.upsert({
+                        "id": item["entity_id"],
+                        "department_id": _ref(data, "department_id"),
+                        "position_id": _ref(data, "position_id"),
+                        "manager_id": _ref(data, "manager_id"),
+                        "status": self.statuses.encode(data.get("employment_status")),
+                        "type": self.types.encode(data.get("employment_type")),
+                    })
+                elif entity == "department":
+                    table.upsert({
+                        "id": item["entity_id"],
+                        "parent_id": _ref(data, "parent_department_id"),
+                        "manager_id": _ref(data, "manager_id"),
+                    })
+                else:
+                    table.upsert({"id": item["entity_id"], "department_id": _ref(data, "department_id")})
+            self._parents.clear()
+    
+    # Derived hierarchies
+    
+    def _manager_slots(self) -> np.ndarray:
+        if "employees" not in self._parents:
+            # Removed employees map to NULL, so their reports become roots
+            slots = self.employees.slots(self.employees.column("manager_id"))
+            slots[~self.employees.live()] = NULL
+            self._parents["employees"] = slots
+        return self._parents["employees"]
+    
+    def _department_parent_slots(self) -> np.ndarray:
+        if "departments" not in self._parents:
+            slots = self.departments.slots(self.departments.column("parent_id"))
+            slots[~self.departments.live()] = NULL
+            self._parents["departments"] = slots
+        return self._parents["departments"]
+    
+    # Analytics
+    
+    def span_of_control(self, limit: int = 20) -> Dict[str, Any]:
+        """Direct reports per manager, largest spans first."""
+        with self._lock:
+            managers = self._manager_slots()
+            live = self.employees.live()
+            spans = np.bincount(managers[live & (managers != NULL)], minlength=self.employees.size)
+            manager_slots = np.flatnonzero(spans)
+            top = manager_slots[np.argsort(-spans[manager_slots], kind="stable")[:limit]]
+            ids = self.employees.column("id")
+            return {
+                "managers": int(len(manager_slots)),
+                "average": float(spans[manager_slots].mean()) if len(manager_slots) else 0.0,
+                "max": int(spans.max()) if len(spans) else 0,
+                "top": [{"employee_id": int(ids[slot]), "direct_reports": int(spans[slot])} for slot in top],
+            }
+    
+    def depth(self) -> Dict[str, Any]:
+        """Depth of the management hierarchy and headcount per level (0 = no manager)."""
+        with self._lock:
+            live = self.employees.live()
+            depths = _depths(self._manager_slots())[live]
+            by_level = np.bincount(depths) if len(depths) else np.zeros(0, dtype=np.int64)
+            return {
+                "max_depth": int(depths.max()) if len(depths) else 0,
+                "employees_by_depth": by_level.tolist(),
+            }
+    
+    def managers_of_managers(self) -> List[int]:
+        """IDs of employees with at least one direct report who is a manager."""
+        with self._lock:
+            managers = self._manager_slots()
+            live = self.employees.live()
+            is_manager = np.bincount(managers[live & (managers != NULL)], minlength=self.employees.size) > 0
+            second = managers[live & is_manager & (managers != NULL)]
+            return sorted(self.employees.column("id")[np.unique(second)].tolist())
+    
+    def headcount(
+        self,
+        department_id: Optional[int] = None,
+        employment_status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Headcount by position and employment status.
+        
+        With ``department_id``, counts employees of that department and all
+        its subdepartments.
+        """
+        with self._lock:
+            live = self.employees.live().copy()
+            if department_id is not None:
+                parents = self._department_parent_slots()
+                target = int(self.departments.slots(np.array([department_id]))[0])
+                if target == NULL:
+                    return []
+                in_subtree = np.arange(self.departments.size) == target
+                current = parents.copy()
+                for _ in range(self.departments.size):
+                    has_parent = current != NULL
+                    if not has_parent.any():
+                        break
+                    in_subtree |= current == target
+                    current = np.where(has_parent, parents[np.where(has_parent, current, 0)], NULL)
+                department_slots = self.departments.slots(self.employees.column("department_id"))
+                live &= (department_slots != NULL) & in_subtree[np.where(department_slots != NULL, department_slots, 0)]
+            if employment_status is not None:
+                code = self.statuses.lookup(employment_status)
+                if code is None:
+                    return []
+                live &= self.employees.column("status") == code
+            
+            positions = self.employees.column("position_id")[live]
+            statuses = self.employees.column("status")[live].astype(np.int64)
+            keys = np.stack([positions, statuses], axis=1)
+            groups, counts = np.unique(keys, axis=0, return_counts=True) if len(keys) else (keys, [])
+            return [
+                {
+                    "position_id": int(position) if position != NULL else None,
+                    "employment_status": self.statuses.decode(int(status)),
+                    "count": int(count),
+                }
+                for (position, status), count in zip(groups, counts)
+            ]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Row counts and memory footprint of the snapshot."""
+        with self._lock:
+            return {
+                "employees": int(self.employees.live().sum()),
+                "departments": int(self.departments.live().sum()),
+                "positions": int(self.positions.live().sum()),
+                "memory_bytes": self.employees.nbytes + self.departments.nbytes + self.positions.nbytes,
+                "age_seconds": time.monotonic() - self.loaded_at if self.loaded_at is not None else None,
+            }
+
+
+org_snapshot = OrgSnapshot()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_org_events(session: Session, flush_context) -> None:
+    if org_snapshot.loaded_at is None:
+        return
+    events = [
+        {
+            "entity": instance.entity,
+            "event_type": instance.event_type,
+            "entity_id": instance.entity_id,
+            "data": instance.data,
+        }
+        for instance in session.new
+        if isinstance(instance, OutboxEvent) and instance.entity in org_snapshot._tables
+    ]
+    if events:
+        session.info.setdefault("org_events", []).extend(events)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_org_events(session: Session) -> None:
+    events = session.info.pop("org_events", None)
+    if events:
+        org_snapshot.apply(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_org_events(session: Session) -> None:
+    session.info.pop("org_events", None)
@@ -0,0 +1,88 @@
+"""
+Org analytics API routes.
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.dependencies import get_current_active_user
+from app.orgsnapshot import schemas
+from app.orgsnapshot.engine import org_snapshot
+from app.users.schemas import User
+
+router = APIRouter(prefix="/org", tags=["org"])
+
+
+@router.get("/span-of-control", response_model=schemas.SpanOfControl)
+def get_span_of_control(
+    limit: int = Query(20, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get direct reports per manager, largest spans first.
+    
+    Args:
+        limit: Number of managers to list
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Manager count, average and maximum span, and the largest spans
+    """
+    org_snapshot.ensure_fresh(db)
+    return org_snapshot.span_of_control(limit)
+
+
+@router.get("/depth", response_model=schemas.OrgDepth)
+def get_org_depth(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get the depth of the management hierarchy and headcount per level."""
+    org_snapshot.ensure_fresh(db)
+    return org_snapshot.depth()
+
+
+@router.get("/headcount", response_model=List[schemas.HeadcountGroup])
+def get_headcount(
+    department_id: Optional[int] = Query(None),
+    employment_status: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get headcount by position and employment status.
+    
+    Args:
+        department_id: Count this department and all its subdepartments
+        employment_status: Only count employees with this status
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        One group per position and status
+    """
+    org_snapshot.ensure_fresh(db)
+    return org_snapshot.headcount(department_id, employment_status)
+
+
+@router.get("/managers-of-managers", response_model=List[int])
+def get_managers_of_managers(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get IDs of employees who manage at least one manager."""
+    org_snapshot.ensure_fresh(db)
+    return org_snapshot.managers_of_managers()
+
+
+@router.get("/stats", response_model=schemas.SnapshotStats)
+def get_snapshot_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get row counts, memory footprint and age of the org snapshot."""
+    org_snapshot.ensure_fresh(db)
+    return org_snapshot.stats()
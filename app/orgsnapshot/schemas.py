@@ -0,0 +1,41 @@
+"""
+Pydantic schemas for org analytics.
+"""
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class ManagerSpan(BaseModel):
+    """Direct reports of one manager."""
+    employee_id: int
+    direct_reports: int
+
+
+class SpanOfControl(BaseModel):
+    """Schema for span of control response."""
+    managers: int
+    average: float
+    max: int
+    top: List[ManagerSpan]
+
+
+class OrgDepth(BaseModel):
+    """Schema for management hierarchy depth response."""
+    max_depth: int
+    employees_by_depth: List[int]
+
+
+class HeadcountGroup(BaseModel):
+    """Headcount of one position and employment status."""
+    position_id: Optional[int] = None
+    employment_status: Optional[str] = None
+    count: int
+
+
+class SnapshotStats(BaseModel):
+    """Schema for org snapshot statistics."""
+    employees: int
+    departments: int
+    positions: int
+    memory_bytes: int
+    age_seconds: Optional[float] = None
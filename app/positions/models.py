@@ -2,7 +2,7 @@
 SQLAlchemy Position model.
 """
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Numeric, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -11,6 +11,9 @@ class Position(Base):
     """Position (job title) model."""
     
     __tablename__ = "positions"
+    __table_args__ = (
+        Index("ix_positions_updated_at_id", "updated_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -21,6 +24,9 @@ class Position(Base):
     max_salary = Column(Numeric(10, 2), nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    version = Column(Integer, nullable=False, default=1)
+    
+    __mapper_args__ = {"version_id_col": version}
     
     # Relationships
     department = relationship("Department", back_populates="positions")
@@ -1,13 +1,14 @@
 """
 Position API routes.
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_active_user
+from app.dependencies import get_current_active_user, get_idempotency, get_if_match_version
 from app.positions import schemas, service
+from app.idempotency.service import IdempotencyGuard
 from app.users.schemas import User
 
 router = APIRouter(prefix="/positions", tags=["positions"])
@@ -15,29 +16,89 @@ router = APIRouter(prefix="/positions", tags=["positions"])
 
 @router.get("/", response_model=List[schemas.Position])
 async def list_positions(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """List all positions with pagination."""
+    """List all positions with pagination; ``include_total`` adds an X-Total-Count header."""
     positions = service.PositionService.get_all(db, skip=skip, limit=limit)
+    if include_total:
+        response.headers["X-Total-Count"] = str(service.PositionService.count(db))
     return positions
 
 
+@router.get("/changes", response_model=schemas.PositionChanges)
+async def get_position_changes(
+    since: Optional[str] = Query(None, description="Cursor from a previous page"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get positions created, updated or deleted since a cursor.
+    
+    Start without ``since`` for a full sync, then pass ``next_cursor`` from
+    each page. Keep paging while ``has_more`` is true.
+    
+    Args:
+        since: Cursor from a previous page
+        limit: Maximum number of changes to return
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Changed positions, deleted IDs and the cursor to resume from
+    """
+    return service.PositionService.get_changes(db, since, limit)
+
+
 @router.post("/", response_model=schemas.Position, status_code=status.HTTP_201_CREATED)
 async def create_position(
     position: schemas.PositionCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    idempotency: IdempotencyGuard = Depends(get_idempotency),
+):
+    """
+    Create a new position.
+    
+    Retries carrying the same Idempotency-Key get the original response.
+    """
+    db_position = service.PositionService.create(db, position)
+    idempotency.save(db_position, schemas.Position, status.HTTP_201_CREATED)
+    return db_position
+
+
+@router.post("/batch-get", response_model=schemas.PositionBatchGetResponse)
+async def batch_get_positions(
+    request: schemas.PositionBatchGetRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
 ):
-    """Create a new position."""
-    return service.PositionService.create(db, position)
+    """
+    Get many positions by ID in a single request.
+    
+    Args:
+        request: IDs to resolve
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Found positions in request order and the IDs that do not exist
+    """
+    items = service.PositionService.get_by_ids(db, request.ids)
+    found_ids = {item.id for item in items}
+    missing = [position_id for position_id in dict.fromkeys(request.ids) if position_id not in found_ids]
+    return {"items": items, "missing": missing}
 
 
 @router.get("/{position_id}", response_model=schemas.Position)
 async def get_position(
     position_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -45,6 +106,7 @@ async def get_position(
     position = service.PositionService.get_by_id(db, position_id)
     if not position:
         raise HTTPException(status_code=404, detail="Position not found")
+    response.headers["ETag"] = f'"{position.version}"'
     return position
 
 
@@ -52,13 +114,21 @@ async def get_position(
 async def update_position(
     position_id: int,
     position: schemas.PositionUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(get_if_match_version),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Update a position."""
-    updated_position = service.PositionService.update(db, position_id, position)
+    """
+    Update a position.
+    
+    Send the ETag from a previous GET as If-Match to reject the update
+    with 412 if someone else changed the position in the meantime.
+    """
+    updated_position = service.PositionService.update(db, position_id, position, expected_version)
     if not updated_position:
         raise HTTPException(status_code=404, detail="Position not found")
+    response.headers["ETag"] = f'"{updated_position.version}"'
     return updated_position
 
 
@@ -2,9 +2,11 @@
 Pydantic schemas for Position model.
 """
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict
+
+from app.changes.schemas import ChangePage
 
 
 class PositionBase(BaseModel):
@@ -37,5 +39,22 @@ class Position(PositionBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    version: int
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class PositionBatchGetRequest(BaseModel):
+    """Schema for resolving many positions by ID in one request."""
+    ids: List[int] = Field(..., min_length=1, max_length=5000)
+
+
+class PositionBatchGetResponse(BaseModel):
+    """Schema for batch get response."""
+    items: List[Position]
+    missing: List[int]
+
+
+class PositionChanges(ChangePage):
+    """Schema for a page of the position change feed."""
+    upserts: List[Position]
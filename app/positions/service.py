@@ -1,12 +1,19 @@
 """
 Position service layer for business logic.
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
+from app.changes.service import ChangeFeedService
+from app.counts.service import CountService
+from app.database import versioned_update
+from app.events.service import OutboxService
 from app.positions import models, schemas
 
+# Keep IN lists well under backend bind-parameter limits (SQLite: 999)
+BATCH_CHUNK_SIZE = 500
+
 
 class PositionService:
     """Service class for position operations."""
@@ -16,6 +23,22 @@ class PositionService:
         """Get position by ID."""
         return db.query(models.Position).filter(models.Position.id == position_id).first()
     
+    @staticmethod
+    def get_by_ids(db: Session, position_ids: List[int]) -> List[models.Position]:
+        """
+        Get positions by a list of IDs using chunked IN queries.
+        
+        Results follow the order of the requested IDs; duplicates are
+        collapsed and unknown IDs are skipped.
+        """
+        unique_ids = list(dict.fromkeys(position_ids))
+        found = {}
+        for start in range(0, len(unique_ids), BATCH_CHUNK_SIZE):
+            chunk = unique_ids[start:start + BATCH_CHUNK_SIZE]
+            for row in db.query(models.Position).filter(models.Position.id.in_(chunk)):
+                found[row.id] = row
+        return [found[position_id] for position_id in unique_ids if position_id in found]
+    
     @staticmethod
     def get_by_code(db: Session, code: str) -> Optional[models.Position]:
         """Get position by code."""
@@ -26,6 +49,16 @@ class PositionService:
         """Get all positions with pagination."""
         return db.query(models.Position).offset(skip).limit(limit).all()
     
+    @staticmethod
+    def count(db: Session) -> int:
+        """Get the number of positions, from the maintained row counts."""
+        return CountService.total(db, "positions")
+    
+    @staticmethod
+    def get_changes(db: Session, cursor: Optional[str] = None, limit: int = 500) -> Dict[str, Any]:
+        """Get positions created, updated or deleted after a change feed cursor."""
+        return ChangeFeedService.get_changes(db, models.Position, "positions", cursor, limit)
+    
     @staticmethod
     def create(db: Session, position: schemas.PositionCreate) -> models.Position:
         """Create a new position."""
@@ -36,6 +69,9 @@ class PositionService:
         
         db_position = models.Position(**position.model_dump())
         db.add(db_position)
+        db.flush()
+        CountService.adjust(db, "positions", 1)
+        OutboxService.append(db, "position.created", db_position.id, schemas.Position.model_validate(db_position))
         db.commit()
         db.refresh(db_position)
         return db_position
@@ -44,20 +80,24 @@ class PositionService:
     def update(
         db: Session,
         position_id: int,
-        position: schemas.PositionUpdate
+        position: schemas.PositionUpdate,
+        expected_version: Optional[int] = None
     ) -> Optional[models.Position]:
-        """Update a position."""
-        db_position = PositionService.get_by_id(db, position_id)
-        if not db_position:
-            return None
+        """
+        Update a position.
         
+        Raises:
+            HTTPException: 412 if expected_version no longer matches
+        """
         update_data = position.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_position, field, value)
         
-        db.commit()
-        db.refresh(db_position)
-        return db_position
+        def record_event(db_position: models.Position) -> None:
+            snapshot = schemas.Position.model_validate(db_position)
+            OutboxService.append(db, "position.updated", position_id, snapshot, update_data)
+        
+        return versioned_update(
+            db, models.Position, position_id, update_data, expected_version, before_commit=record_event
+        )
     
     @staticmethod
     def delete(db: Session, position_id: int) -> bool:
@@ -66,6 +106,9 @@ class PositionService:
         if not db_position:
             return False
         
+        OutboxService.append(db, "position.deleted", position_id, schemas.Position.model_validate(db_position))
+        CountService.adjust(db, "positions", -1)
         db.delete(db_position)
+        ChangeFeedService.record_delete(db, "positions", position_id)
         db.commit()
         return True
@@ -0,0 +1,126 @@
+"""
+Token buckets for rate limiting.
+
+Buckets live in Redis when it is reachable, so every app worker shares the
+same quota, and in this process otherwise.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Tuple
+
+import redis
+
+from app.cache import get_redis
+
+# Buckets kept by the in-process store before the least recently used are dropped
+MEMORY_MAX_BUCKETS = 100_000
+
+# Refill, take one token and report the wait for the next one, atomically.
+# Uses the Redis clock so workers with skewed clocks agree.
+TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+local retry_after = 0
+if allowed == 0 then
+    retry_after = (1 - tokens) / rate
+end
+return {allowed, tostring(retry_after)}
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    """A token bucket refilling ``per_minute`` tokens a minute, holding at most ``burst``."""
+    per_minute: float
+    burst: int
+    
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60
+
+
+class MemoryBuckets:
+    """Token buckets held in this process."""
+    
+    def __init__(self, max_buckets: int = MEMORY_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+    
+    def take(self, key: str, limit: Limit) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (limit.burst, now))
+            tokens = min(limit.burst, tokens + (now - updated) * limit.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / limit.rate
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisBuckets:
+    """Token buckets shared by all workers through Redis."""
+    
+    def __init__(self, client: redis.Redis):
+        self.client = client
+        self.script = client.register_script(TAKE_SCRIPT)
+    
+    def take(self, key: str, limit: Limit) -> Tuple[bool, float]:
+        allowed, retry_after = self.script(
+            keys=[f"ratelimit:{key}"], args=[limit.rate, limit.burst]
+        )
+        return bool(allowed), float(retry_after)
+
+
+memory_buckets = MemoryBuckets()
+_redis_buckets = None
+
+
+def take(key: str, limit: Limit) -> Tuple[bool, int]:
+    """
+    Take a token from a bucket.
+    
+    Args:
+        key: Bucket name, e.g. ``read:user:42``
+        limit: Size and refill rate of the bucket
+        
+    Returns:
+        Whether the request is allowed, and whole seconds until it would be
+    """
+    global _redis_buckets
+    
+    client = get_redis()
+    allowed, retry_after = None, 0.0
+    if client is not None:
+        if _redis_buckets is None or _redis_buckets.client is not client:
+            _redis_buckets = RedisBuckets(client)
+        try:
+            allowed, retry_after = _redis_buckets.take(key, limit)
+        except redis.RedisError:
+            allowed = None
+    if allowed is None:
+        allowed, retry_after = memory_buckets.take(key, limit)
+    return allowed, max(1, math.ceil(retry_after)) if not allowed else 0
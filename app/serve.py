@@ -0,0 +1,67 @@
+"""
+Production server launcher.
+
+Usage:
+    python -m app.serve [--host HOST] [--port PORT] [--workers N]
+
+Runs the API under uvicorn with the configured number of worker processes.
+Each worker completes the application's lifespan warmup before it accepts
+connections, and on SIGTERM/SIGINT stops accepting new connections and lets
+in-flight requests finish for up to SERVER_GRACEFUL_TIMEOUT seconds.
+"""
+import argparse
+import logging
+from typing import List, Optional
+
+import uvicorn
+
+from app.config import settings
+
+
+def build_config(argv: Optional[List[str]] = None) -> uvicorn.Config:
+    """
+    Build the uvicorn configuration from settings and command-line overrides.
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+        
+    Returns:
+        Uvicorn configuration
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS)
+    parser.add_argument("--graceful-timeout", type=int, default=settings.SERVER_GRACEFUL_TIMEOUT)
+    args = parser.parse_args(argv)
+    
+    return uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        lifespan="on",
+        proxy_headers=True,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        log_level=settings.LOG_LEVEL.lower(),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Start the server."""
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    config = build_config(argv)
+    server = uvicorn.Server(config)
+    
+    if config.workers > 1:
+        # The supervisor binds the socket once and spawns the workers
+        from uvicorn.supervisors import Multiprocess
+        
+        sock = config.bind_socket()
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+
+
+if __name__ == "__main__":
+    main()
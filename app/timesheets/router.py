@@ -0,0 +1,35 @@
+"""
+Timesheet API routes.
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.dependencies import get_current_active_user
+from app.timesheets import schemas, service
+from app.users.schemas import User
+
+router = APIRouter(prefix="/timesheets", tags=["timesheets"])
+
+
+@router.get("/", response_model=schemas.Timesheet)
+def get_timesheet(
+    period: str = Query(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    department_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get worked hours, overtime and late arrivals per employee for a pay period.
+    
+    Args:
+        period: Monthly pay period as YYYY-MM
+        department_id: Only include employees of this department
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Timesheet with one entry per employee who punched in the period
+    """
+    return service.TimesheetService.get_timesheet(db, period, department_id)
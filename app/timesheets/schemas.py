@@ -0,0 +1,27 @@
+"""
+Pydantic schemas for timesheets.
+"""
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+
+
+class TimesheetEntry(BaseModel):
+    """Totals of one employee over a pay period."""
+    employee_id: int
+    worked_hours: float
+    regular_hours: float
+    overtime_hours: float
+    days_worked: int
+    late_arrivals: int
+    late_minutes: float
+    unmatched_punches: int
+
+
+class Timesheet(BaseModel):
+    """Schema for a pay period timesheet response."""
+    period: str
+    start: datetime
+    end: datetime
+    closed: bool
+    entries: List[TimesheetEntry]
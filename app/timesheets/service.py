@@ -0,0 +1,204 @@
+"""
+Timesheet service layer.
+
+Punches for a pay period are loaded as columns (employee id, seconds since
+the period start, clock-out flag) and aggregated with NumPy array
+operations: sorting pairs each clock-in with the clock-out that follows
+it, and per employee-day totals are summed with ``bincount``. Nothing
+iterates over punches in Python.
+
+All times are UTC. A shift belongs to the day it starts on; a day's hours
+above TIMESHEET_DAILY_HOURS count as overtime, and a first clock-in of the
+day later than TIMESHEET_SHIFT_START plus TIMESHEET_LATE_GRACE_MINUTES is
+a late arrival.
+"""
+import calendar
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.attendance.models import Punch, PunchType
+from app.config import settings
+from app.employees.models import Employee
+
+SECONDS_PER_DAY = 86400
+
+_cache: "OrderedDict[str, Tuple[tuple, List[dict]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class PunchColumns:
+    """Punches of a period in columnar form, in no particular order."""
+    employee_ids: np.ndarray
+    seconds: np.ndarray
+    is_out: np.ndarray
+
+
+def period_bounds(period: str) -> Tuple[datetime, datetime]:
+    """Start and end of a monthly pay period given as ``YYYY-MM``."""
+    year, month = (int(part) for part in period.split("-"))
+    days = calendar.monthrange(year, month)[1]
+    start = datetime(year, month, 1)
+    return start, start + timedelta(days=days)
+
+
+def _clock_seconds(value: str) -> int:
+    hours, minutes = (int(part) for part in value.split(":"))
+    return hours * 3600 + minutes * 60
+
+
+def compute_timesheets(columns: PunchColumns, days: int) -> Dict[str, np.ndarray]:
+    """
+    Aggregate punches into per-employee totals.
+    
+    Args:
+        columns: Punches with times in seconds since the period start;
+            clock-outs may run up to TIMESHEET_MAX_SHIFT_HOURS past the end
+        days: Number of days in the period
+        
+    Returns:
+        Arrays indexed alike, keyed by TimesheetEntry field name
+    """
+    order = np.lexsort((columns.seconds, columns.employee_ids))
+    employee_ids = columns.employee_ids[order]
+    seconds = columns.seconds[order]
+    is_out = columns.is_out[order]
+    in_period = seconds < days * SECONDS_PER_DAY
+    
+    employees, employee_index = np.unique(employee_ids, return_inverse=True)
+    count = len(employees)
+    
+    # A shift is a clock-in immediately followed by a clock-out of the same employee
+    durations = np.diff(seconds)
+    paired = (
+        ~is_out[:-1] & is_out[1:]
+        & (employee_ids[:-1] == employee_ids[1:])
+        & (durations <= settings.TIMESHEET_MAX_SHIFT_HOURS * 3600)
+        & in_period[:-1]
+    )
+    shift_starts = np.flatnonzero(paired)
+    shift_days = seconds[shift_starts] // SECONDS_PER_DAY
+    day_seconds = np.bincount(
+        employee_index[shift_starts] * days + shift_days,
+        weights=durations[shift_starts],
+        minlength=count * days,
+    ).reshape(count, days)
+    
+    worked = day_seconds.sum(axis=1)
+    overtime = np.clip(day_seconds - settings.TIMESHEET_DAILY_HOURS * 3600, 0, None).sum(axis=1)
+    
+    # Rows are sorted by employee then time, so the first clock-in of each
+    # employee-day is the first occurrence of its key
+    clock_ins = np.flatnonzero(~is_out & in_period)
+    in_keys = employee_index[clock_ins] * days + seconds[clock_ins] // SECONDS_PER_DAY
+    first_keys, first = np.unique(in_keys, return_index=True)
+    time_of_day = seconds[clock_ins[first]] % SECONDS_PER_DAY
+    shift_start = _clock_seconds(settings.TIMESHEET_SHIFT_START)
+    late = time_of_day > shift_start + settings.TIMESHEET_LATE_GRACE_MINUTES * 60
+    late_employees = first_keys[late] // days
+    
+    # Clock-outs just past the period end that close a shift are not counted
+    punches = np.bincount(employee_index[in_period], minlength=count)
+    paired_punches = np.bincount(
+        employee_index[shift_starts], weights=1 + in_period[shift_starts + 1], minlength=count
+    ).astype(np.int64)
+    
+    return {
+        "employee_id": employees,
+        "worked_hours": worked / 3600,
+        "regular_hours": (worked - overtime) / 3600,
+        "overtime_hours": overtime / 3600,
+        "days_worked": (day_seconds > 0).sum(axis=1),
+        "late_arrivals": np.bincount(late_employees, minlength=count),
+        "late_minutes": np.bincount(
+            late_employees, weights=(time_of_day[late] - shift_start) / 60, minlength=count
+        ),
+        "unmatched_punches": punches - paired_punches,
+    }
+
+
+class TimesheetService:
+    """Service class for timesheet operations."""
+    
+    @staticmethod
+    def load_punches(db: Session, start: datetime, end: datetime) -> PunchColumns:
+        """Load punches from ``start`` until the latest clock-out of a shift starting before ``end``."""
+        horizon = end + timedelta(hours=settings.TIMESHEET_MAX_SHIFT_HOURS)
+        rows = db.execute(
+            select(
+                Punch.employee_id,
+                Punch.punched_at,
+                case((Punch.punch_type == PunchType.OUT, 1), else_=0),
+            ).where(Punch.punched_at >= start, Punch.punched_at < horizon)
+        ).all()
+        if not rows:
+            empty = np.empty(0, dtype=np.int64)
+            return PunchColumns(empty, empty, np.empty(0, dtype=bool))
+        
+        employee_ids, punched_at, is_out = zip(*rows)
+        offsets = np.array(punched_at, dtype="datetime64[s]") - np.datetime64(start, "s")
+        return PunchColumns(
+            employee_ids=np.array(employee_ids, dtype=np.int64),
+            seconds=offsets.astype(np.int64),
+            is_out=np.array(is_out, dtype=bool),
+        )
+    
+    @staticmethod
+    def _fingerprint(db: Session, start: datetime, end: datetime) -> tuple:
+        horizon = end + timedelta(hours=settings.TIMESHEET_MAX_SHIFT_HOURS)
+        return tuple(db.execute(
+            select(func.count(Punch.id), func.max(Punch.id)).where(
+                Punch.punched_at >= start, Punch.punched_at < horizon
+            )
+        ).one())
+    
+    @staticmethod
+    def get_timesheet(db: Session, period: str, department_id: Optional[int] = None) -> dict:
+        """
+        Get per-employee totals for a monthly pay period.
+        
+        Closed periods are cached per process. A cached result is reused
+        only while the count and highest ID of the period's punches are
+        unchanged, so a late correction still shows up.
+        """
+        start, end = period_bounds(period)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        closed = end + timedelta(hours=settings.TIMESHEET_MAX_SHIFT_HOURS) <= now
+        
+        entries = None
+        fingerprint = None
+        if closed:
+            fingerprint = TimesheetService._fingerprint(db, start, end)
+            with _cache_lock:
+                cached = _cache.get(period)
+                if cached is not None and cached[0] == fingerprint:
+                    _cache.move_to_end(period)
+                    entries = cached[1]
+        
+        if entries is None:
+            totals = compute_timesheets(
+                TimesheetService.load_punches(db, start, end), (end - start).days
+            )
+            columns = {name: values.tolist() for name, values in totals.items()}
+            entries = [dict(zip(columns, values)) for values in zip(*columns.values())]
+            if closed:
+                with _cache_lock:
+                    _cache[period] = (fingerprint, entries)
+                    _cache.move_to_end(period)
+                    while len(_cache) > settings.TIMESHEET_CACHE_SIZE:
+                        _cache.popitem(last=False)
+        
+        if department_id is not None:
+            members = set(db.execute(
+                select(Employee.id).where(Employee.department_id == department_id)
+            ).scalars())
+            entries = [entry for entry in entries if entry["employee_id"] in members]
+        
+        return {"period": period, "start": start, "end": end, "closed": closed, "entries": entries}
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_active_user, get_current_superuser
+from app.dependencies import get_current_active_user, get_current_superuser, get_current_user
 from app.users import schemas, service
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/me", response_model=schemas.User)
 async def read_users_me(
-    current_user: schemas.User = Depends(get_current_active_user),
+    current_user: schemas.User = Depends(get_current_user),
 ):
     """Get current user."""
     return current_user
@@ -31,3 +31,22 @@ async def read_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
+
+
+@router.patch("/{user_id}", response_model=schemas.User)
+async def update_user(
+    user_id: int,
+    user_in: schemas.UserUpdate,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_superuser),
+):
+    """
+    Update a user (superuser only).
+    
+    Deactivating a user, changing their role or password revokes the
+    tokens issued to them.
+    """
+    user = service.UserService.get_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return service.UserService.update(db, user, user_in)
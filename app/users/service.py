@@ -1,10 +1,12 @@
 """
 User service layer for business logic.
 """
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 
+from app.auth.principals import invalidate_principal
+from app.auth.revocation import revocation_list
 from app.users import models, schemas
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -33,6 +35,13 @@ class UserService:
         """Get user by ID."""
         return db.query(models.User).filter(models.User.id == user_id).first()
     
+    @staticmethod
+    def get_by_ids(db: Session, user_ids: List[int]) -> List[models.User]:
+        """Get users by a list of IDs; unknown IDs are skipped."""
+        if not user_ids:
+            return []
+        return db.query(models.User).filter(models.User.id.in_(list(dict.fromkeys(user_ids)))).all()
+    
     @staticmethod
     def create(db: Session, user: schemas.UserCreate) -> models.User:
         """Create a new user."""
@@ -46,6 +55,32 @@ class UserService:
         db.refresh(db_user)
         return db_user
     
+    @staticmethod
+    def update(db: Session, db_user: models.User, user: schemas.UserUpdate) -> models.User:
+        """
+        Update a user.
+        
+        Deactivations, role changes and password changes revoke every token
+        issued to the user so far, in the same transaction.
+        """
+        update_data = user.model_dump(exclude_unset=True)
+        password = update_data.pop("password", None)
+        if password is not None:
+            update_data["hashed_password"] = UserService.get_password_hash(password)
+        
+        revoke = password is not None or any(
+            field in update_data and update_data[field] != getattr(db_user, field)
+            for field in ("is_active", "is_superuser")
+        )
+        for field, value in update_data.items():
+            setattr(db_user, field, value)
+        if revoke:
+            revocation_list.revoke_user(db, db_user.id)
+        db.commit()
+        db.refresh(db_user)
+        invalidate_principal(db_user.id)
+        return db_user
+    
     @staticmethod
     def authenticate(db: Session, email: str, password: str) -> Optional[models.User]:
         """Authenticate a user."""
@@ -0,0 +1,106 @@
+"""
+Startup warmup so the first requests after a deploy are not slow.
+
+Each step does once per process what would otherwise happen lazily on the
+first request that needs it.
+"""
+import logging
+from functools import partial
+from typing import List, Set
+
+from fastapi import FastAPI
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import configure_mappers
+
+from app.cache import get_redis
+from app.database import SessionLocal, engine, replica_set
+
+logger = logging.getLogger(__name__)
+
+# Names of warmup steps that have completed in this process
+_completed: Set[str] = set()
+
+
+def open_connection_pool(db_engine: Engine) -> None:
+    """Open pool_size connections up front and return them to the pool."""
+    size = db_engine.pool.size() if hasattr(db_engine.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(max(size, 1)):
+            connection = db_engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def warm_password_hashing() -> None:
+    """Make passlib load and self-test its bcrypt backend."""
+    from app.users.service import pwd_context
+    
+    pwd_context.verify("warmup", pwd_context.hash("warmup"))
+
+
+def load_signing_keys() -> None:
+    """Read and parse the token signing keys."""
+    from app.auth.keys import key_ring
+    
+    key_ring.jwks()
+
+
+def build_response_schemas(app: FastAPI) -> None:
+    """Generate the OpenAPI document, which builds every model's JSON schema."""
+    app.openapi()
+
+
+def prime_query_caches() -> None:
+    """Configure ORM mappers and compile the common reference-data queries."""
+    from app.departments.models import Department
+    from app.positions.models import Position
+    
+    configure_mappers()
+    db = SessionLocal()
+    try:
+        db.execute(select(Department).limit(1)).all()
+        db.execute(select(Position).limit(1)).all()
+    finally:
+        db.close()
+
+
+def warm_up(app: FastAPI) -> List[str]:
+    """
+    Run the warmup steps that have not yet completed in this process.
+    
+    Args:
+        app: Application whose schemas should be built
+        
+    Returns:
+        Names of steps that failed; empty when fully warm
+    """
+    engines = [engine] + (replica_set.engines if replica_set else [])
+    steps = [
+        (f"connection pool {db_engine.url.render_as_string()}", partial(open_connection_pool, db_engine))
+        for db_engine in engines
+    ]
+    steps += [
+        ("password hashing", warm_password_hashing),
+        ("signing keys", load_signing_keys),
+        ("response schemas", partial(build_response_schemas, app)),
+        ("query caches", prime_query_caches),
+        ("redis", get_redis),
+    ]
+    
+    failed = []
+    for name, step in steps:
+        if name in _completed:
+            continue
+        try:
+            step()
+        except Exception:
+            logger.exception("Warmup step failed: %s", name)
+            failed.append(name)
+        else:
+            _completed.add(name)
+    return failed
@@ -8,6 +8,8 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
+from app.audit.writer import audit_writer
+from app.attendance.buffer import punch_buffer
 from app.database import Base, get_db
 from app.config import settings
 
@@ -21,6 +23,30 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Tests drive the webhook dispatcher, employee archiver and job runner
+# directly against the test database
+settings.WEBHOOK_DISPATCH_ENABLED = False
+settings.EMPLOYEE_ARCHIVE_ENABLED = False
+settings.COUNTS_RECONCILE_ENABLED = False
+settings.JOBS_ENABLED = False
+
+# Rate limits are exercised by their own tests
+settings.RATE_LIMIT_ENABLED = False
+
+# Tests change users directly in the database, so load them per request
+settings.AUTH_PRINCIPAL_CACHE_SECONDS = 0
+
+# Without the background refresh, token revocations are checked in the table
+settings.AUTH_REVOCATION_REFRESH_SECONDS = 0
+
+# The test database is a single shared connection, so audit records are only
+# written when a test flushes them (or on app shutdown), never concurrently
+settings.AUDIT_FLUSH_INTERVAL_SECONDS = 3600
+audit_writer.session_factory = TestingSessionLocal
+
+# Attendance punches are committed through the test database as well
+punch_buffer.session_factory = TestingSessionLocal
+
 
 @pytest.fixture
 def db_session():
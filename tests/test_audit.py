@@ -0,0 +1,112 @@
+"""
+Tests for the asynchronous audit trail.
+"""
+import queue
+
+import pytest
+from app.audit.service import AuditService
+from app.audit.writer import audit_writer
+from app.config import settings
+
+
+@pytest.fixture
+def employee_id(client, auth_headers):
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/employees/",
+        headers=auth_headers,
+        json={
+            "employee_number": "EMP001",
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": "john.doe@example.com",
+            "hire_date": "2024-01-01",
+            "employment_type": "full_time",
+        },
+    )
+    return response.json()["id"]
+
+
+def test_update_records_changed_fields(client, auth_headers, employee_id, db_session, test_user):
+    """Only fields whose value changed are recorded, with old and new values."""
+    test_user.is_superuser = True
+    db_session.commit()
+    client.put(
+        f"{settings.API_V1_PREFIX}/employees/{employee_id}",
+        headers=auth_headers,
+        json={"first_name": "Johnny", "last_name": "Doe"},
+    )
+    audit_writer.flush()
+    
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/audit/employees/{employee_id}",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    records = response.json()
+    assert [(r["action"], r["field"]) for r in records] == [("update", "first_name"), ("create", None)]
+    assert records[0]["old_value"] == '"John"'
+    assert records[0]["new_value"] == '"Johnny"'
+    assert records[0]["actor_id"] == test_user.id
+
+
+def test_history_requires_superuser(client, auth_headers, employee_id):
+    """Regular users cannot read the audit trail."""
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/audit/employees/{employee_id}",
+        headers=auth_headers,
+    )
+    assert response.status_code == 403
+
+
+def test_full_queue_drops_or_writes_inline(db_session, monkeypatch):
+    """A full queue drops records under "drop" and writes inline under "block"."""
+    monkeypatch.setattr(audit_writer, "queue", queue.Queue(maxsize=1))
+    monkeypatch.setattr(audit_writer, "metrics", dict.fromkeys(audit_writer.metrics, 0))
+    changes = {"first_name": ("A", "B"), "last_name": ("C", "D")}
+    
+    monkeypatch.setattr(settings, "AUDIT_BACKPRESSURE", "drop")
+    AuditService.record("employee", 1, "update", None, changes)
+    assert audit_writer.metrics["dropped"] == 1
+    
+    monkeypatch.setattr(settings, "AUDIT_BACKPRESSURE", "block")
+    monkeypatch.setattr(settings, "AUDIT_BLOCK_TIMEOUT_SECONDS", 0.01)
+    AuditService.record("employee", 2, "update", None, changes)
+    assert audit_writer.metrics["written_inline"] == 2
+    
+    audit_writer.flush()
+    assert len(AuditService.get_history(db_session, "employee", 1)) == 1
+    assert len(AuditService.get_history(db_session, "employee", 2)) == 2
+
+
+def test_failed_batch_is_retried(db_session, monkeypatch):
+    """A batch whose insert fails is written on the next flush instead of being lost."""
+    monkeypatch.setattr(audit_writer, "metrics", dict.fromkeys(audit_writer.metrics, 0))
+    AuditService.record("employee", 3, "update", None, {"first_name": ("A", "B")})
+    
+    def failing_session():
+        raise RuntimeError("database unavailable")
+    
+    monkeypatch.setattr(audit_writer, "session_factory", failing_session)
+    with pytest.raises(RuntimeError):
+        audit_writer.flush()
+    assert audit_writer.metrics["failed_batches"] == 1
+    
+    monkeypatch.undo()
+    assert audit_writer.flush() == 1
+    assert len(AuditService.get_history(db_session, "employee", 3)) == 1
+
+
+async def test_full_queue_on_event_loop_writes_inline_without_waiting(db_session, monkeypatch):
+    """Under "block", async callers write inline at once instead of stalling the loop."""
+    import time
+    
+    monkeypatch.setattr(audit_writer, "queue", queue.Queue(maxsize=1))
+    monkeypatch.setattr(audit_writer, "metrics", dict.fromkeys(audit_writer.metrics, 0))
+    monkeypatch.setattr(settings, "AUDIT_BACKPRESSURE", "block")
+    monkeypatch.setattr(settings, "AUDIT_BLOCK_TIMEOUT_SECONDS", 5)
+    
+    started = time.monotonic()
+    AuditService.record("employee", 4, "update", None, {"first_name": ("A", "B"), "last_name": ("C", "D")})
+    assert time.monotonic() - started < 1
+    assert audit_writer.metrics["written_inline"] == 1
+    audit_writer.flush()
@@ -72,3 +72,229 @@ def test_refresh_token(client, auth_headers):
     data = response.json()
     assert "access_token" in data
     assert "refresh_token" in data
+
+
+def test_current_user_served_from_principal_cache(client, auth_headers, db_session, test_user, monkeypatch):
+    """Test that cached users answer /auth/me without loading the row."""
+    from app.auth.principals import invalidate_principal
+    
+    monkeypatch.setattr(settings, "AUTH_PRINCIPAL_CACHE_SECONDS", 30)
+    invalidate_principal()
+    url = f"{settings.API_V1_PREFIX}/auth/me"
+    assert client.get(url, headers=auth_headers).status_code == 200
+    
+    db_session.delete(test_user)
+    db_session.commit()
+    response = client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "test@example.com"
+    
+    invalidate_principal(test_user.id)
+    assert client.get(url, headers=auth_headers).status_code == 401
+
+
+def test_superuser_check_skips_principal_cache(client, auth_headers, db_session, test_user, monkeypatch):
+    """Test that role changes made on another worker apply to tokens without the claim."""
+    from app.auth.principals import invalidate_principal
+    
+    monkeypatch.setattr(settings, "AUTH_PRINCIPAL_CACHE_SECONDS", 30)
+    invalidate_principal()
+    url = f"{settings.API_V1_PREFIX}/users/{test_user.id}"
+    assert client.get(f"{settings.API_V1_PREFIX}/auth/me", headers=auth_headers).status_code == 200
+    assert client.patch(url, headers=auth_headers, json={}).status_code == 403
+    
+    # Neither change invalidates this worker's cache
+    test_user.is_superuser = True
+    db_session.commit()
+    assert client.patch(url, headers=auth_headers, json={}).status_code == 200
+    test_user.is_superuser = False
+    db_session.commit()
+    assert client.patch(url, headers=auth_headers, json={}).status_code == 403
+
+
+@pytest.fixture
+def revocations():
+    """Revocation list loaded from the test database."""
+    from app.auth.revocation import revocation_list
+    from tests.conftest import TestingSessionLocal
+    
+    revocation_list.session_factory = TestingSessionLocal
+    revocation_list.refresh()
+    yield revocation_list
+    revocation_list.clear()
+
+
+class _NoDatabase:
+    """Session stand-in that fails the test if it is used."""
+    
+    def __getattr__(self, name):
+        raise AssertionError(f"database accessed: {name}")
+
+
+async def test_claims_authorize_without_database(client, db_session, test_user, revocations):
+    """Test that tokens carrying role claims authorize without loading the user."""
+    from app.auth.service import AuthService
+    from app.auth.utils import decode_token
+    from app.dependencies import get_current_active_user, get_current_superuser
+    
+    test_user.is_superuser = True
+    db_session.commit()
+    claims = decode_token(AuthService.create_tokens(test_user).access_token)
+    assert claims["su"] is True and claims["active"] is True and claims["jti"]
+    
+    assert not revocations.is_revoked(_NoDatabase(), claims)
+    principal = await get_current_superuser(claims, _NoDatabase())
+    assert principal.id == test_user.id
+    assert (await get_current_active_user(claims, _NoDatabase())).is_superuser
+
+
+def test_deactivation_revokes_tokens(client, auth_headers, db_session, test_user, revocations):
+    """Test that deactivating a user rejects their existing tokens at once."""
+    from app.users.schemas import UserCreate
+    from app.users.service import UserService
+    
+    admin = UserService.create(db_session, UserCreate(email="admin@example.com", password="adminpass123"))
+    admin.is_superuser = True
+    db_session.commit()
+    token = client.post(
+        f"{settings.API_V1_PREFIX}/auth/login",
+        data={"username": "admin@example.com", "password": "adminpass123"}
+    ).json()["access_token"]
+    admin_headers = {"Authorization": f"Bearer {token}"}
+    
+    url = f"{settings.API_V1_PREFIX}/users/{test_user.id}"
+    assert client.get(url, headers=auth_headers).status_code == 200
+    response = client.patch(url, headers=admin_headers, json={"is_active": False})
+    assert response.status_code == 200
+    assert response.json()["is_active"] is False
+    
+    response = client.get(url, headers=auth_headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token has been revoked"
+    assert client.patch(url, headers=auth_headers, json={"is_active": True}).status_code == 401
+    
+    # Other users' tokens are unaffected
+    assert client.get(url, headers=admin_headers).status_code == 200
+
+
+def test_logout_revokes_token(client, test_user, revocations):
+    """Test that logging out revokes only the presented token."""
+    login = {"username": test_user.email, "password": "testpassword123"}
+    first = client.post(f"{settings.API_V1_PREFIX}/auth/login", data=login).json()["access_token"]
+    second = client.post(f"{settings.API_V1_PREFIX}/auth/login", data=login).json()["access_token"]
+    
+    response = client.post(f"{settings.API_V1_PREFIX}/auth/logout", headers={"Authorization": f"Bearer {first}"})
+    assert response.status_code == 204
+    me = f"{settings.API_V1_PREFIX}/auth/me"
+    assert client.get(me, headers={"Authorization": f"Bearer {first}"}).status_code == 401
+    assert client.get(me, headers={"Authorization": f"Bearer {second}"}).status_code == 200
+
+
+def test_refresh_loads_revocations_committed_out_of_order(db_session, revocations):
+    """Test that a revocation committed after a higher ID was loaded is still picked up."""
+    from datetime import timedelta
+    from app.auth.models import TokenRevocation
+    from app.auth.revocation import _utcnow
+    
+    expires_at = _utcnow() + timedelta(days=1)
+    db_session.add(TokenRevocation(id=10, key="jti:later", revoked_at=_utcnow(), expires_at=expires_at))
+    db_session.commit()
+    revocations.refresh()
+    assert revocations.might_contain("jti:later")
+    
+    # Its transaction took the lower ID but committed after the refresh
+    db_session.add(TokenRevocation(id=5, key="jti:earlier", revoked_at=_utcnow(), expires_at=expires_at))
+    db_session.commit()
+    assert not revocations.might_contain("jti:earlier")
+    revocations.refresh()
+    assert revocations.might_contain("jti:earlier")
+
+
+def test_bloom_filter():
+    """Test that the Bloom filter has no false negatives and few false positives."""
+    from app.auth.revocation import BloomFilter
+    
+    bloom = BloomFilter(bits=1 << 16, hashes=7)
+    for i in range(2000):
+        bloom.add(f"user:{i}")
+    assert all(f"user:{i}" in bloom for i in range(2000))
+    false_positives = sum(f"jti:{i}" in bloom for i in range(10000))
+    assert false_positives < 100
+
+
+@pytest.fixture
+def rotated_keys(tmp_path, monkeypatch):
+    """Two signing keys on disk, with the second one active."""
+    from app.auth.keys import _generate_pem, key_ring
+    
+    paths = {}
+    for kid in ("old", "new"):
+        paths[kid] = str(tmp_path / f"{kid}.pem")
+        (tmp_path / f"{kid}.pem").write_bytes(_generate_pem("RS256"))
+    monkeypatch.setattr(settings, "JWT_SIGNING_KEYS", {"old": paths["old"]})
+    monkeypatch.setattr(settings, "JWT_ACTIVE_KID", "")
+    key_ring.reset()
+    yield paths
+    key_ring.reset()
+
+
+def test_tokens_verify_with_published_keys(client, auth_headers):
+    """Test that downstream services can verify tokens from the JWKS endpoint alone."""
+    from jose import jwt
+    
+    token = auth_headers["Authorization"].split()[1]
+    kid = jwt.get_unverified_header(token)["kid"]
+    
+    response = client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert "max-age" in response.headers["Cache-Control"]
+    keys = {key["kid"]: key for key in response.json()["keys"]}
+    assert "d" not in keys[kid]
+    assert jwt.decode(token, keys[kid], algorithms=["RS256"])["sub"]
+    
+    cached = client.get("/.well-known/jwks.json", headers={"If-None-Match": response.headers["ETag"]})
+    assert cached.status_code == 304
+
+
+def test_key_rotation(client, test_user, rotated_keys, monkeypatch):
+    """Test that tokens signed with a retired key verify until it is removed."""
+    from jose import JWTError, jwt
+    from app.auth.keys import key_ring
+    from app.auth.utils import create_access_token, decode_token
+    
+    old_token = create_access_token({"sub": str(test_user.id)})
+    assert jwt.get_unverified_header(old_token)["kid"] == "old"
+    
+    monkeypatch.setattr(settings, "JWT_SIGNING_KEYS", {**settings.JWT_SIGNING_KEYS, "new": rotated_keys["new"]})
+    monkeypatch.setattr(settings, "JWT_ACTIVE_KID", "new")
+    key_ring.reset()
+    new_token = create_access_token({"sub": str(test_user.id)})
+    assert jwt.get_unverified_header(new_token)["kid"] == "new"
+    assert decode_token(old_token)["sub"] == decode_token(new_token)["sub"]
+    assert {key["kid"] for key in client.get("/.well-known/jwks.json").json()["keys"]} == {"old", "new"}
+    
+    monkeypatch.setattr(settings, "JWT_SIGNING_KEYS", {"new": rotated_keys["new"]})
+    key_ring.reset()
+    with pytest.raises(JWTError):
+        decode_token(old_token)
+    
+    legacy_token = jwt.encode({"sub": str(test_user.id)}, settings.SECRET_KEY, algorithm="HS256")
+    monkeypatch.setattr(settings, "JWT_ACCEPT_HS256", True)
+    assert decode_token(legacy_token)["sub"] == str(test_user.id)
+    monkeypatch.setattr(settings, "JWT_ACCEPT_HS256", False)
+    with pytest.raises(JWTError):
+        decode_token(legacy_token)
+
+
+def test_signing_keys_required_outside_development(rotated_keys):
+    """Test that production settings without signing keys are rejected at startup."""
+    from pydantic import ValidationError
+    from app.config import Settings
+    
+    required = {"SECRET_KEY": "secret", "DATABASE_URL": "sqlite://", "JWT_SIGNING_KEYS": {}}
+    with pytest.raises(ValidationError, match="JWT_SIGNING_KEYS is required"):
+        Settings(**required, ENVIRONMENT="production", ALGORITHM="RS256")
+    assert Settings(**required, ENVIRONMENT="production", ALGORITHM="HS256").ALGORITHM == "HS256"
+    assert Settings(**required, ENVIRONMENT="development", ALGORITHM="RS256").ALGORITHM == "RS256"
+    keys = {"old": rotated_keys["old"]}
+    assert Settings(**{**required, "JWT_SIGNING_KEYS": keys}, ENVIRONMENT="production").JWT_SIGNING_KEYS == keys
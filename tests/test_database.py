@@ -0,0 +1,170 @@
+"""
+Tests for engine configuration and read-replica routing.
+"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.database
+from app.config import settings
+from app.database import Base, ReplicaSet, RoutingSession, create_db_engine, get_db, pool_metrics
+
+
+def _sqlite_engine(path):
+    """Create a file-backed SQLite database with the schema and one department."""
+    from app.departments.models import Department
+    
+    db_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=db_engine)
+    session = RoutingSession(bind=db_engine)
+    session.add(Department(name=path.stem, code=path.stem.upper()))
+    session.commit()
+    session.close()
+    return db_engine
+
+
+@pytest.fixture
+def primary(tmp_path):
+    return _sqlite_engine(tmp_path / "primary.db")
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    return [_sqlite_engine(tmp_path / "replica1.db"), _sqlite_engine(tmp_path / "replica2.db")]
+
+
+def _department_codes(session):
+    from app.departments.models import Department
+    
+    return [department.code for department in session.query(Department).all()]
+
+
+def test_create_db_engine_applies_pool_settings(tmp_path):
+    """Test that pool sizing from settings reaches the engine."""
+    db_engine = create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    assert db_engine.pool.size() == settings.DATABASE_POOL_SIZE
+    assert db_engine.pool._timeout == settings.DATABASE_POOL_TIMEOUT
+
+
+def test_read_only_session_reads_from_replicas_round_robin(primary, replicas):
+    """Test that read-only sessions alternate between replicas."""
+    replica_set = ReplicaSet(replicas, health_interval=60)
+    seen = []
+    for _ in range(4):
+        session = RoutingSession(bind=primary, replicas=replica_set)
+        session.read_only = True
+        seen.append(_department_codes(session))
+        session.close()
+    assert seen == [["REPLICA1"], ["REPLICA2"], ["REPLICA1"], ["REPLICA2"]]
+
+
+def test_writes_and_read_after_write_use_primary(primary, replicas):
+    """Test that writes go to the primary and pin later reads there."""
+    from app.departments.models import Department
+    
+    session = RoutingSession(bind=primary, replicas=ReplicaSet(replicas))
+    session.read_only = True
+    assert _department_codes(session) == ["REPLICA1"]
+    
+    session.add(Department(name="New", code="NEW"))
+    session.commit()
+    assert session.wrote
+    assert _department_codes(session) == ["PRIMARY", "NEW"]
+    session.close()
+
+
+def test_default_session_uses_primary(primary, replicas):
+    """Test that sessions not marked read-only never touch replicas."""
+    session = RoutingSession(bind=primary, replicas=ReplicaSet(replicas))
+    assert _department_codes(session) == ["PRIMARY"]
+    session.close()
+
+
+def test_unhealthy_replica_is_skipped(primary, replicas, tmp_path):
+    """Test that a replica failing its health check is taken out of rotation."""
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replica_set = ReplicaSet([broken, replicas[0]], health_interval=60)
+    
+    for _ in range(3):
+        assert replica_set.choose() is replicas[0]
+    
+    session = RoutingSession(bind=primary, replicas=ReplicaSet([broken]))
+    session.read_only = True
+    assert _department_codes(session) == ["PRIMARY"]
+    session.close()
+
+
+def test_lazy_session_checks_out_only_when_used(primary, monkeypatch):
+    """Test that request sessions are created and connected on first use."""
+    monkeypatch.setattr(app.database, "SessionLocal", sessionmaker(class_=RoutingSession, bind=primary))
+    request = SimpleNamespace(method="GET", headers={}, state=SimpleNamespace())
+    before = pool_metrics.snapshot()
+    
+    unused = get_db(request)
+    db = next(unused)
+    assert db._session is None
+    unused.close()
+    
+    used = get_db(request)
+    db = next(used)
+    assert _department_codes(db) == ["PRIMARY"]
+    assert db.checked_out
+    used.close()
+    
+    after = pool_metrics.snapshot()
+    assert after["requests"] - before["requests"] == 2
+    assert after["requests_without_checkout"] - before["requests_without_checkout"] == 1
+
+
+def test_read_after_write_follows_user_across_tokens(primary, monkeypatch):
+    """Test that after a write, reads with any token of the same user use the primary."""
+    from starlette.requests import Request
+    from app.auth.utils import create_access_token, request_claims
+    from app.database import RecentWriters
+    from app.departments.models import Department
+    
+    monkeypatch.setattr(settings, "REDIS_ENABLED", False)
+    monkeypatch.setattr(app.database, "recent_writers", RecentWriters())
+    monkeypatch.setattr(app.database, "replica_set", ReplicaSet([primary], health_interval=60))
+    monkeypatch.setattr(app.database, "SessionLocal", sessionmaker(class_=RoutingSession, bind=primary))
+    
+    def request(method, subject):
+        token = create_access_token({"sub": subject})
+        headers = [(b"authorization", f"Bearer {token}".encode())]
+        request = Request({"type": "http", "method": method, "headers": headers})
+        # Decoded by the rate limiter or the auth dependencies
+        request_claims(request)
+        return request
+    
+    assert next(get_db(request("GET", "7"))).session.read_only
+    
+    writing = get_db(request("POST", "7"))
+    db = next(writing)
+    db.add(Department(name="New", code="NEW"))
+    db.commit()
+    writing.close()
+    
+    assert not next(get_db(request("GET", "7"))).session.read_only
+    assert next(get_db(request("GET", "8"))).session.read_only
+
+
+def test_without_replicas_requests_skip_read_routing(primary, monkeypatch):
+    """Test that without replicas no caller is looked up or recorded."""
+    from app.departments.models import Department
+    
+    monkeypatch.setattr(app.database, "replica_set", None)
+    monkeypatch.setattr(app.database, "recent_writers", None)
+    monkeypatch.setattr(app.database, "SessionLocal", sessionmaker(class_=RoutingSession, bind=primary))
+    state = SimpleNamespace(token_subject="7")
+    
+    writing = get_db(SimpleNamespace(method="POST", headers={}, state=state))
+    db = next(writing)
+    db.add(Department(name="New", code="NEW"))
+    db.commit()
+    writing.close()
+    
+    reading = get_db(SimpleNamespace(method="GET", headers={}, state=state))
+    assert not next(reading).session.read_only
+    reading.close()
@@ -122,3 +122,46 @@ def test_delete_department(client, auth_headers, db_session):
         headers=auth_headers
     )
     assert response.status_code == 204
+
+
+def test_batch_get_departments(client, auth_headers, db_session):
+    """Test resolving several departments by ID in one request."""
+    from app.departments.models import Department
+    
+    dept1 = Department(name="Support", code="SUP")
+    dept2 = Department(name="Research", code="RND")
+    db_session.add_all([dept1, dept2])
+    db_session.commit()
+    
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/departments/batch-get",
+        json={"ids": [dept2.id, 4242, dept1.id]},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["code"] for item in data["items"]] == ["RND", "SUP"]
+    assert data["missing"] == [4242]
+
+
+def test_update_department_stale_version(client, auth_headers, db_session):
+    """Test that an update with an outdated If-Match is rejected."""
+    from app.departments.models import Department
+    
+    department = Department(name="Facilities", code="FAC")
+    db_session.add(department)
+    db_session.commit()
+    
+    response = client.put(
+        f"{settings.API_V1_PREFIX}/departments/{department.id}",
+        json={"name": "Workplace"},
+        headers={**auth_headers, "If-Match": '"5"'}
+    )
+    assert response.status_code == 412
+    
+    response = client.put(
+        f"{settings.API_V1_PREFIX}/departments/9999",
+        json={"name": "Nowhere"},
+        headers={**auth_headers, "If-Match": '"1"'}
+    )
+    assert response.status_code == 404
@@ -101,6 +101,115 @@ def test_list_employees(client, auth_headers, test_department, test_position):
     assert len(data) >= 1
 
 
+def test_list_employees_total(client, auth_headers, db_session, test_department):
+    """Totals come from maintained counters kept in step with every write."""
+    from app.counts.service import CountService
+    from app.employees.models import Employee
+    
+    url = f"{settings.API_V1_PREFIX}/employees/"
+    ids = []
+    for i, department_id in enumerate([test_department.id, test_department.id, None]):
+        response = client.post(url, json={
+            "employee_number": f"EMP40{i}",
+            "first_name": "Counted",
+            "last_name": f"Person{i}",
+            "email": f"counted{i}@example.com",
+            "hire_date": "2024-01-01",
+            "department_id": department_id,
+        }, headers=auth_headers)
+        ids.append(response.json()["id"])
+    
+    def total(query=""):
+        response = client.get(f"{url}?include_total=true{query}", headers=auth_headers)
+        assert response.status_code == 200
+        return int(response.headers["X-Total-Count"])
+    
+    assert "X-Total-Count" not in client.get(url, headers=auth_headers).headers
+    assert total() == 3
+    assert total(f"&department_id={test_department.id}") == 2
+    assert total("&employment_status=ACTIVE") == 3
+    
+    client.put(f"{url}{ids[0]}", json={"employment_status": "terminated"}, headers=auth_headers)
+    client.patch(f"{url}bulk", json={
+        "filter": {"ids": [ids[1], ids[2]]},
+        "changes": {"department_id": test_department.id},
+    }, headers=auth_headers)
+    client.delete(f"{url}{ids[2]}", headers=auth_headers)
+    assert total() == 2
+    assert total(f"&department_id={test_department.id}&employment_status=active") == 1
+    assert total("&employment_status=terminated") == 1
+    
+    # Rows written behind the services' back are picked up by reconciliation
+    db_session.add(Employee(
+        employee_number="EMP409",
+        first_name="Uncounted",
+        last_name="Person",
+        email="uncounted@example.com",
+        hire_date=date(2024, 1, 1),
+    ))
+    db_session.commit()
+    assert total() == 2
+    assert CountService.reconcile(db_session)["employees"] == 1
+    assert total() == 3
+    assert total(f"&department_id={test_department.id}") == 2
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/departments/?include_total=true", headers=auth_headers)
+    assert response.headers["X-Total-Count"] == "1"
+
+
+def test_count_adjust_compiles_for_mysql(db_session):
+    """Counter updates do not filter row_counts by a subquery on itself, which MySQL rejects."""
+    from sqlalchemy import event
+    from sqlalchemy.dialects import mysql
+    from sqlalchemy.sql import Update
+    from app.counts.service import CountService
+    from tests.conftest import engine
+    
+    updates = []
+    
+    def capture(conn, clauseelement, multiparams, params, execution_options):
+        if isinstance(clauseelement, Update):
+            updates.append(str(clauseelement.compile(dialect=mysql.dialect())))
+    
+    event.listen(engine, "before_execute", capture)
+    try:
+        CountService.adjust(db_session, "employees", 1, None, "active")
+        CountService.adjust(db_session, "employees", 1, None, "active")
+        db_session.commit()
+    finally:
+        event.remove(engine, "before_execute", capture)
+    
+    [statement] = updates
+    assert "SELECT" not in statement
+    assert CountService.total(db_session, "employees") == 2
+
+
+def test_delete_archived_employee_adjusts_archive_count(client, auth_headers, db_session):
+    """Deleting an employee found in the archive decrements the archive's counter."""
+    from datetime import datetime, timedelta
+    from app.counts.service import CountService
+    from app.employees.models import Employee
+    from app.employees.schemas import EmployeeCreate
+    from app.employees.service import EmployeeService
+    
+    kept, leaver = [
+        EmployeeService.create(db_session, EmployeeCreate(
+            employee_number=f"EMP42{i}", first_name="Counted", last_name=f"Person{i}",
+            email=f"archive-count{i}@example.com", hire_date=date(2020, 1, 1), employment_status=status,
+        ))
+        for i, status in enumerate(["active", "terminated"])
+    ]
+    db_session.get(Employee, leaver.id).terminated_at = datetime.utcnow() - timedelta(days=400)
+    db_session.commit()
+    leaver_id = leaver.id
+    assert EmployeeService.archive_terminated(db_session, after_days=365) == 1
+    assert (CountService.total(db_session, "employees"), CountService.total(db_session, "employees_archive")) == (1, 1)
+    
+    response = client.delete(f"{settings.API_V1_PREFIX}/employees/{leaver_id}", headers=auth_headers)
+    assert response.status_code == 204
+    assert (CountService.total(db_session, "employees"), CountService.total(db_session, "employees_archive")) == (1, 0)
+
+
 def test_get_employee(client, auth_headers, db_session, test_department, test_position):
     """Test getting an employee by ID."""
     from app.employees.models import Employee
@@ -187,3 +296,733 @@ def test_delete_employee(client, auth_headers, db_session, test_department, test
         headers=auth_headers
     )
     assert response.status_code == 204
+
+
+def test_batch_get_employees(client, auth_headers, db_session, test_department):
+    """Test resolving several employees by ID in one request."""
+    from app.employees.models import Employee
+    
+    employees = [
+        Employee(
+            employee_number=f"EMP10{i}",
+            first_name="Batch",
+            last_name=f"Person{i}",
+            email=f"batch{i}@example.com",
+            hire_date=date(2024, 1, 1),
+            department_id=test_department.id
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(employees)
+    db_session.commit()
+    ids = [employees[2].id, 9999, employees[0].id, employees[2].id]
+    
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/employees/batch-get",
+        json={"ids": ids},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [employees[2].id, employees[0].id]
+    assert data["missing"] == [9999]
+
+
+def test_batch_get_employees_chunks_large_requests(db_session, test_department):
+    """Test that batch lookups larger than one chunk keep request order."""
+    from app.employees.models import Employee
+    from app.employees import service
+    
+    employees = [
+        Employee(
+            employee_number=f"CHUNK{i:04d}",
+            first_name="Chunk",
+            last_name=str(i),
+            email=f"chunk{i}@example.com",
+            hire_date=date(2024, 1, 1)
+        )
+        for i in range(service.BATCH_CHUNK_SIZE + 10)
+    ]
+    db_session.add_all(employees)
+    db_session.commit()
+    ids = [employee.id for employee in reversed(employees)]
+    
+    result = service.EmployeeService.get_by_ids(db_session, ids)
+    assert [employee.id for employee in result] == ids
+
+
+def test_bulk_update_employees(client, auth_headers, db_session, test_department):
+    """Test moving a group of employees to another department in one request."""
+    from app.departments.models import Department
+    from app.employees.models import Employee
+    
+    target = Department(name="Platform", code="PLAT")
+    db_session.add(target)
+    employees = [
+        Employee(
+            employee_number=f"BULK{i}",
+            first_name="Bulk",
+            last_name=str(i),
+            email=f"bulk{i}@example.com",
+            hire_date=date(2024, 1, 1),
+            department_id=test_department.id
+        )
+        for i in range(4)
+    ]
+    db_session.add_all(employees)
+    db_session.commit()
+    before = employees[0].updated_at
+    
+    response = client.patch(
+        f"{settings.API_V1_PREFIX}/employees/bulk",
+        json={
+            "filter": {"department_id": test_department.id, "ids": [e.id for e in employees[:3]]},
+            "changes": {"department_id": target.id, "manager_id": employees[3].id}
+        },
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["affected"] == 3
+    
+    db_session.refresh(employees[0])
+    db_session.refresh(employees[3])
+    assert employees[0].department_id == target.id
+    assert employees[0].manager_id == employees[3].id
+    assert employees[0].updated_at >= before
+    assert employees[3].department_id == test_department.id
+
+
+def test_bulk_update_employees_requires_filter(client, auth_headers):
+    """Test that a bulk update without a filter is rejected."""
+    response = client.patch(
+        f"{settings.API_V1_PREFIX}/employees/bulk",
+        json={"filter": {}, "changes": {"employment_status": "inactive"}},
+        headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+def test_bulk_update_rejects_unique_fields(client, auth_headers, db_session):
+    """Test that unique fields cannot be set on many employees at once."""
+    from app.employees.models import Employee
+    
+    db_session.add_all([
+        Employee(
+            employee_number=f"EMP60{i}",
+            first_name="Bulk",
+            last_name=str(i),
+            email=f"unique{i}@example.com",
+            hire_date=date(2024, 1, 1),
+        )
+        for i in range(2)
+    ])
+    db_session.commit()
+    ids = [employee.id for employee in db_session.query(Employee)]
+    
+    for changes in ({"employee_number": "EMP999"}, {"user_id": 1}):
+        response = client.patch(
+            f"{settings.API_V1_PREFIX}/employees/bulk",
+            json={"filter": {"ids": ids}, "changes": changes},
+            headers=auth_headers
+        )
+        assert response.status_code == 422
+    db_session.expire_all()
+    assert sorted(employee.employee_number for employee in db_session.query(Employee)) == ["EMP600", "EMP601"]
+
+
+def test_update_employee_if_match(client, auth_headers, db_session):
+    """Test optimistic concurrency on employee updates."""
+    from app.employees.models import Employee
+    
+    employee = Employee(
+        employee_number="EMP006",
+        first_name="Dana",
+        last_name="White",
+        email="dana.white@example.com",
+        hire_date=date(2024, 1, 1)
+    )
+    db_session.add(employee)
+    db_session.commit()
+    
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/employees/{employee.id}",
+        headers=auth_headers
+    )
+    etag = response.headers["ETag"]
+    assert etag == '"1"'
+    
+    response = client.put(
+        f"{settings.API_V1_PREFIX}/employees/{employee.id}",
+        json={"city": "Lisbon"},
+        headers={**auth_headers, "If-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert response.headers["ETag"] == '"2"'
+    
+    # A second writer still holding the old ETag is rejected
+    response = client.put(
+        f"{settings.API_V1_PREFIX}/employees/{employee.id}",
+        json={"city": "Porto"},
+        headers={**auth_headers, "If-Match": etag}
+    )
+    assert response.status_code == 412
+    db_session.refresh(employee)
+    assert employee.city == "Lisbon"
+
+
+def test_update_employee_without_returning(client, auth_headers, db_session, monkeypatch):
+    """Test the ORM version check used on backends without UPDATE ... RETURNING."""
+    from app.employees.models import Employee
+    
+    employee = Employee(
+        employee_number="EMP007",
+        first_name="Eve",
+        last_name="Black",
+        email="eve.black@example.com",
+        hire_date=date(2024, 1, 1)
+    )
+    db_session.add(employee)
+    db_session.commit()
+    monkeypatch.setattr(db_session.get_bind().dialect, "update_returning", False)
+    
+    response = client.put(
+        f"{settings.API_V1_PREFIX}/employees/{employee.id}",
+        json={"first_name": "Evelyn"},
+        headers={**auth_headers, "If-Match": '"1"'}
+    )
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    
+    response = client.put(
+        f"{settings.API_V1_PREFIX}/employees/{employee.id}",
+        json={"first_name": "Eva"},
+        headers={**auth_headers, "If-Match": '"1"'}
+    )
+    assert response.status_code == 412
+
+
+def test_employee_change_feed(client, auth_headers, db_session, monkeypatch):
+    """Test paging through employee changes and resuming from a cursor."""
+    from app.employees.models import Employee
+    
+    monkeypatch.setattr(settings, "CHANGE_FEED_LAG_SECONDS", 0)
+    employees = [
+        Employee(
+            employee_number=f"FEED{i}",
+            first_name="Feed",
+            last_name=str(i),
+            email=f"feed{i}@example.com",
+            hire_date=date(2024, 1, 1)
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(employees)
+    db_session.commit()
+    ids = [employee.id for employee in employees]
+    url = f"{settings.API_V1_PREFIX}/employees/changes"
+    
+    first = client.get(url, params={"limit": 2}, headers=auth_headers).json()
+    assert [e["id"] for e in first["upserts"]] == ids[:2]
+    assert first["has_more"] is True
+    second = client.get(
+        url, params={"since": first["next_cursor"], "limit": 2}, headers=auth_headers
+    ).json()
+    assert [e["id"] for e in second["upserts"]] == ids[2:]
+    assert second["has_more"] is False
+    cursor = second["next_cursor"]
+    
+    # An update and a delete show up after the last cursor
+    client.put(f"{settings.API_V1_PREFIX}/employees/{ids[0]}", json={"city": "Oslo"}, headers=auth_headers)
+    client.delete(f"{settings.API_V1_PREFIX}/employees/{ids[1]}", headers=auth_headers)
+    third = client.get(url, params={"since": cursor}, headers=auth_headers).json()
+    assert [e["id"] for e in third["upserts"]] == [ids[0]]
+    assert third["upserts"][0]["city"] == "Oslo"
+    assert [d["id"] for d in third["deletes"]] == [ids[1]]
+    
+    # Nothing new: the cursor stays put
+    fourth = client.get(url, params={"since": third["next_cursor"]}, headers=auth_headers).json()
+    assert fourth["upserts"] == [] and fourth["deletes"] == []
+    assert fourth["next_cursor"] == third["next_cursor"]
+
+
+def test_employee_change_feed_invalid_cursor(client, auth_headers):
+    """Test that a malformed cursor is rejected."""
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/employees/changes",
+        params={"since": "not-a-cursor"},
+        headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+def test_archive_terminated_employees(client, auth_headers, db_session, test_department):
+    """Long-terminated employees move to the archive but stay readable by ID."""
+    from datetime import datetime, timedelta
+    from app.employees.models import Employee, EmploymentStatus
+    from app.employees.service import EmployeeService
+    
+    long_ago = datetime.utcnow() - timedelta(days=400)
+    employees = [
+        Employee(
+            employee_number=f"EMP20{i}",
+            first_name="Archive",
+            last_name=f"Person{i}",
+            email=f"archive{i}@example.com",
+            hire_date=date(2020, 1, 1),
+            department_id=test_department.id,
+            employment_status=status,
+            terminated_at=long_ago if status == EmploymentStatus.TERMINATED else None,
+        )
+        for i, status in enumerate([
+            EmploymentStatus.ACTIVE,
+            EmploymentStatus.TERMINATED,
+            EmploymentStatus.TERMINATED,
+            EmploymentStatus.TERMINATED,
+        ])
+    ]
+    db_session.add_all(employees)
+    db_session.commit()
+    # A terminated manager is still referenced, so it stays in the hot table
+    employees[0].manager_id = employees[3].id
+    db_session.commit()
+    ids = [employee.id for employee in employees]
+    
+    assert EmployeeService.archive_terminated(db_session, after_days=365, batch_size=1) == 2
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/employees/", headers=auth_headers)
+    assert sorted(item["id"] for item in response.json()) == [ids[0], ids[3]]
+    
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/employees/?include_archived=true&skip=1",
+        headers=auth_headers
+    )
+    assert [item["id"] for item in response.json()][-2:] == [ids[1], ids[2]]
+    assert len(response.json()) == 3
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/employees/{ids[1]}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["archived_at"] is not None
+    
+    # Archived employees are read-only, with or without a version
+    url = f"{settings.API_V1_PREFIX}/employees/{ids[1]}"
+    response = client.put(url, json={"first_name": "Changed"}, headers=auth_headers)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Employee is archived"
+    response = client.put(url, json={"first_name": "Changed"}, headers={**auth_headers, "If-Match": '"1"'})
+    assert response.status_code == 409
+    response = client.put(f"{settings.API_V1_PREFIX}/employees/999999", json={}, headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_archive_keeps_employees_with_dependent_rows(db_session):
+    """Employees still referenced by punches or leave stay hot, even with foreign keys enforced."""
+    from datetime import datetime, timedelta
+    from decimal import Decimal
+    from sqlalchemy import text
+    from app.attendance.models import Punch, PunchType
+    from app.employees.models import Employee, EmployeeArchive, EmploymentStatus
+    from app.employees.service import EmployeeService
+    from app.leave.models import LeaveRequest, LeaveType
+    
+    long_ago = datetime.utcnow() - timedelta(days=400)
+    employees = [
+        Employee(
+            employee_number=f"EMP24{i}",
+            first_name="Referenced",
+            last_name=f"Person{i}",
+            email=f"referenced{i}@example.com",
+            hire_date=date(2020, 1, 1),
+            employment_status=EmploymentStatus.TERMINATED,
+            terminated_at=long_ago,
+        )
+        for i in range(3)
+    ]
+    leave_type = LeaveType(name="Annual", max_days=Decimal("20"))
+    db_session.add_all(employees + [leave_type])
+    db_session.commit()
+    ids = [employee.id for employee in employees]
+    db_session.add(Punch(employee_id=ids[0], punch_type=PunchType.IN, punched_at=long_ago))
+    db_session.add(LeaveRequest(
+        employee_id=ids[1], leave_type_id=leave_type.id,
+        start_date=date(2023, 1, 2), end_date=date(2023, 1, 3), days=Decimal("2"),
+    ))
+    db_session.commit()
+    
+    db_session.execute(text("PRAGMA foreign_keys=ON"))
+    try:
+        assert EmployeeService.archive_terminated(db_session, after_days=365) == 1
+    finally:
+        db_session.execute(text("PRAGMA foreign_keys=OFF"))
+    assert sorted(row.id for row in db_session.query(Employee)) == ids[:2]
+    assert [row.id for row in db_session.query(EmployeeArchive)] == [ids[2]]
+
+
+def test_update_reads_previous_values_in_one_select(db_session, test_department, monkeypatch):
+    """Test that audit values and the count cell are read in a single locked select."""
+    from sqlalchemy import event
+    from app.audit.writer import audit_writer
+    from app.employees.models import Employee
+    from app.employees.schemas import EmployeeUpdate
+    from app.employees.service import EmployeeService
+    from tests.conftest import engine
+    
+    monkeypatch.setattr(settings, "AUDIT_ENABLED", True)
+    employee = Employee(
+        employee_number="EMP501",
+        first_name="Moving",
+        last_name="Person",
+        email="moving@example.com",
+        hire_date=date(2024, 1, 1),
+    )
+    db_session.add(employee)
+    db_session.commit()
+    employee_id, department_id = employee.id, test_department.id
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+    
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        changes = EmployeeUpdate(first_name="Moved", department_id=department_id)
+        assert EmployeeService.update(db_session, employee_id, changes).department_id == department_id
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    audit_writer.flush()
+    
+    assert statements.index("UPDATE") == 1
+    assert statements[0] == "SELECT"
+
+
+def test_termination_date_is_kept_across_edits(client, auth_headers, db_session):
+    """Terminating stamps terminated_at, later edits keep it and rehiring clears it."""
+    from datetime import datetime, timedelta
+    from app.employees.models import Employee
+    from app.employees.schemas import EmployeeCreate
+    from app.employees.service import EmployeeService
+    
+    created = client.post(
+        f"{settings.API_V1_PREFIX}/employees/",
+        json={
+            "employee_number": "EMP250",
+            "first_name": "Leaving",
+            "last_name": "Person",
+            "email": "leaving@example.com",
+            "hire_date": "2020-01-01"
+        },
+        headers=auth_headers
+    ).json()
+    assert created["terminated_at"] is None
+    url = f"{settings.API_V1_PREFIX}/employees/{created['id']}"
+    
+    terminated = client.put(url, json={"employment_status": "terminated"}, headers=auth_headers).json()
+    assert terminated["terminated_at"] is not None
+    
+    # Backdate the termination; an edit afterwards must not restart the archive clock
+    employee = db_session.get(Employee, created["id"])
+    employee.terminated_at = datetime.utcnow() - timedelta(days=400)
+    db_session.commit()
+    edited = client.put(url, json={"city": "Quito", "employment_status": "terminated"}, headers=auth_headers).json()
+    assert edited["terminated_at"] == employee.terminated_at.isoformat()
+    assert EmployeeService.archive_terminated(db_session, after_days=365) == 1
+    
+    rehired = EmployeeService.create(db_session, EmployeeCreate(
+        employee_number="EMP251", first_name="Back", last_name="Again",
+        email="back@example.com", hire_date=date(2020, 1, 1), employment_status="terminated",
+    ))
+    assert rehired.terminated_at is not None
+    response = client.put(
+        f"{settings.API_V1_PREFIX}/employees/{rehired.id}", json={"employment_status": "active"}, headers=auth_headers
+    )
+    assert response.json()["terminated_at"] is None
+
+
+def test_purge_retention_anonymizes_and_reassigns(client, auth_headers, db_session, test_department):
+    """Purged managers are anonymized, their reports move up and departments lose them."""
+    from datetime import datetime, timedelta
+    from app.employees.models import Employee, EmploymentStatus
+    from app.employees.service import ANONYMIZED_VALUES, EmployeeService
+    from app.events.models import OutboxEvent
+    
+    long_ago = datetime.utcnow() - timedelta(days=8 * 366)
+    boss, manager, report, recent = [
+        Employee(
+            employee_number=f"EMP30{i}",
+            first_name="Retained",
+            last_name=f"Person{i}",
+            email=f"retention{i}@example.com",
+            phone="555-0100",
+            hire_date=date(2010, 1, 1),
+            employment_status=status,
+            terminated_at=long_ago if i < 3 else datetime.utcnow(),
+        )
+        for i, status in enumerate([
+            EmploymentStatus.ACTIVE,
+            EmploymentStatus.TERMINATED,
+            EmploymentStatus.ACTIVE,
+            EmploymentStatus.TERMINATED,
+        ])
+    ]
+    db_session.add_all([boss, manager, report, recent])
+    db_session.commit()
+    manager.manager_id = boss.id
+    report.manager_id = manager.id
+    test_department.manager_id = manager.id
+    db_session.commit()
+    ids = [boss.id, manager.id, report.id, recent.id]
+    
+    preview = EmployeeService.purge_retention(db_session, after_years=7, dry_run=True)
+    assert (preview["eligible"], preview["purged"]) == (1, 0)
+    assert (preview["reports_updated"], preview["departments_cleared"]) == (1, 1)
+    db_session.expire_all()
+    assert manager.first_name == "Retained"
+    
+    progress = []
+    purge_started = datetime.utcnow()
+    result = EmployeeService.purge_retention(
+        db_session, after_years=7, batch_size=1, on_chunk=lambda done, total: progress.append((done, total))
+    )
+    assert progress == [(1, 1)]
+    assert (result["purged"], result["reports_reassigned"], result["departments_cleared"]) == (1, 1, 1)
+    
+    # Every change goes through the outbox and the change feed like any other update
+    events = db_session.query(OutboxEvent).order_by(OutboxEvent.id).all()
+    assert [(event.event_type, event.entity_id, event.changed_fields) for event in events] == [
+        ("employee.updated", ids[2], ["manager_id"]),
+        ("department.updated", test_department.id, ["manager_id"]),
+        ("employee.updated", ids[1], sorted(ANONYMIZED_VALUES.keys() | {"purged_at"})),
+    ]
+    assert events[2].data["first_name"] == "Redacted"
+    db_session.expire_all()
+    assert (report.version, manager.version, test_department.version) == (3, 3, 3)
+    assert report.updated_at > purge_started and test_department.updated_at > purge_started
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/employees/{ids[1]}", headers=auth_headers)
+    purged = response.json()
+    assert (purged["first_name"], purged["email"], purged["phone"]) == ("Redacted", "redacted@example.com", None)
+    assert purged["purged_at"] is not None
+    response = client.get(f"{settings.API_V1_PREFIX}/employees/{ids[2]}", headers=auth_headers)
+    assert response.json()["manager_id"] == ids[0]
+    response = client.get(f"{settings.API_V1_PREFIX}/departments/{test_department.id}", headers=auth_headers)
+    assert response.json()["manager_id"] is None
+    response = client.get(f"{settings.API_V1_PREFIX}/employees/{ids[3]}", headers=auth_headers)
+    assert response.json()["first_name"] == "Retained"
+    
+    assert EmployeeService.purge_retention(db_session, after_years=7)["purged"] == 0
+
+
+def test_purge_retention_delete_mode(client, auth_headers, db_session):
+    """Delete mode removes hot and archived employees with their attendance."""
+    from datetime import datetime, timedelta
+    from app.attendance.models import Punch, PunchType
+    from app.changes.models import Tombstone
+    from app.employees.models import Employee, EmployeeArchive, EmploymentStatus
+    from app.employees.service import EmployeeService
+    from app.events.models import OutboxEvent
+    
+    long_ago = datetime.utcnow() - timedelta(days=8 * 366)
+    employees = [
+        Employee(
+            employee_number=f"EMP31{i}",
+            first_name="Deleted",
+            last_name=f"Person{i}",
+            email=f"deleted{i}@example.com",
+            hire_date=date(2010, 1, 1),
+            employment_status=EmploymentStatus.TERMINATED,
+            terminated_at=long_ago,
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(employees)
+    db_session.commit()
+    ids = [employee.id for employee in employees]
+    db_session.add(Punch(employee_id=ids[0], punch_type=PunchType.IN, punched_at=long_ago))
+    db_session.commit()
+    # Two of them have already been archived; the one with a punch stays hot
+    assert EmployeeService.archive_terminated(db_session, after_days=365, batch_size=1) == 2
+    hot = Employee(
+        employee_number="EMP319",
+        first_name="Deleted",
+        last_name="Hot",
+        email="deleted-hot@example.com",
+        hire_date=date(2010, 1, 1),
+        employment_status=EmploymentStatus.TERMINATED,
+        terminated_at=long_ago,
+    )
+    db_session.add(hot)
+    db_session.commit()
+    hot_id = hot.id
+    
+    result = EmployeeService.purge_retention(db_session, after_years=7, mode="delete", batch_size=2)
+    assert (result["eligible"], result["eligible_archived"], result["purged"]) == (4, 2, 4)
+    assert db_session.query(Employee).count() == 0
+    assert db_session.query(EmployeeArchive).count() == 0
+    assert db_session.query(Punch).count() == 0
+    
+    # Archived employees leave tombstones and events too
+    assert sorted(row.entity_id for row in db_session.query(Tombstone)) == sorted(ids + [hot_id])
+    deleted = db_session.query(OutboxEvent).filter(OutboxEvent.event_type == "employee.deleted")
+    assert sorted(event.entity_id for event in deleted) == sorted(ids + [hot_id])
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/employees/{ids[0]}", headers=auth_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("mode", ["anonymize", "delete"])
+def test_purge_retention_leaves_no_personal_data(client, auth_headers, db_session, mode):
+    """No earlier value of a purged employee survives in the audit trail or the outbox."""
+    import json
+    from datetime import datetime, timedelta
+    from app.audit.models import AuditRecord
+    from app.audit.writer import audit_writer
+    from app.employees.models import Employee
+    from app.employees.service import EmployeeService
+    from app.events.models import OutboxEvent
+    
+    url = f"{settings.API_V1_PREFIX}/employees/"
+    employee_id = client.post(url, headers=auth_headers, json={
+        "employee_number": "EMP401",
+        "first_name": "Private",
+        "last_name": "Person",
+        "email": "private.person@example.com",
+        "phone": "+1 555 0101",
+        "hire_date": "2010-01-01",
+    }).json()["id"]
+    response = client.put(f"{url}{employee_id}", headers=auth_headers, json={
+        "phone": "+1 555 0199",
+        "address": "1 Hidden Lane",
+        "employment_status": "terminated",
+    })
+    assert response.status_code == 200
+    audit_writer.flush()
+    db_session.query(Employee).filter(Employee.id == employee_id).update(
+        {"terminated_at": datetime.utcnow() - timedelta(days=8 * 366)}
+    )
+    db_session.commit()
+    
+    result = EmployeeService.purge_retention(db_session, after_years=7, mode=mode)
+    assert result["purged"] == 1
+    audit_writer.flush()
+    
+    stored = [
+        record.old_value or "" for record in db_session.query(AuditRecord)
+    ] + [
+        record.new_value or "" for record in db_session.query(AuditRecord)
+    ] + [
+        json.dumps(event.data) for event in db_session.query(OutboxEvent)
+    ]
+    assert db_session.query(AuditRecord).filter(AuditRecord.entity_id == employee_id).count() >= 2
+    for value in ("Private", "Person", "private.person@example.com", "555 0101", "555 0199", "Hidden"):
+        assert not any(value in text for text in stored), value
+
+
+def test_employee_profile(client, auth_headers, db_session, test_user, test_department, test_position):
+    """Test that the profile assembles related records in a fixed number of queries."""
+    from sqlalchemy import event
+    from app.departments.models import Department
+    from app.employees.models import Employee
+    from tests.conftest import engine
+    
+    division = Department(name="Technology", code="TECH")
+    db_session.add(division)
+    db_session.commit()
+    test_department.parent_department_id = division.id
+    db_session.commit()
+    
+    def employee(number, **kwargs):
+        return Employee(
+            employee_number=number,
+            first_name="Profile",
+            last_name=number,
+            email=f"{number.lower()}@example.com",
+            hire_date=date(2024, 1, 1),
+            **kwargs
+        )
+    
+    manager = employee("MGR1")
+    db_session.add(manager)
+    db_session.commit()
+    subject = employee(
+        "EMP1",
+        department_id=test_department.id,
+        position_id=test_position.id,
+        manager_id=manager.id,
+        user_id=test_user.id,
+    )
+    db_session.add(subject)
+    db_session.commit()
+    db_session.add_all([employee(f"SUB{i}", manager_id=subject.id) for i in range(3)])
+    db_session.commit()
+    url = f"{settings.API_V1_PREFIX}/employees/{subject.id}/profile"
+    db_session.expire_all()
+    
+    statements = []
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if "token_revocations" not in statement:
+            statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        response = client.get(url, headers=auth_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["employee"]["employee_number"] == "EMP1"
+    assert data["department"]["code"] == "ENG"
+    assert [d["code"] for d in data["department_chain"]] == ["TECH"]
+    assert data["position"]["code"] == "SE"
+    assert data["manager"]["employee_number"] == "MGR1"
+    assert [e["employee_number"] for e in data["subordinates"]] == ["SUB0", "SUB1", "SUB2"]
+    assert data["user"]["email"] == test_user.email
+    # Employee, then department chain, position, manager, reports and user
+    assert len(statements) == 6
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/employees/{manager.id}/profile", headers=auth_headers)
+    data = response.json()
+    assert data["department"] is None and data["manager"] is None and data["user"] is None
+    assert [e["employee_number"] for e in data["subordinates"]] == ["EMP1"]
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/employees/9999/profile", headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_employee_profile_of_archived_team(client, auth_headers, db_session):
+    """Test that archived employees and their archived managers appear in profiles."""
+    from datetime import datetime, timedelta
+    from app.employees.models import Employee, EmployeeArchive, EmploymentStatus
+    from app.employees.service import EmployeeService
+    
+    def terminated(number, **kwargs):
+        return Employee(
+            employee_number=number,
+            first_name="Former",
+            last_name=number,
+            email=f"{number.lower()}@example.com",
+            hire_date=date(2010, 1, 1),
+            employment_status=EmploymentStatus.TERMINATED,
+            terminated_at=datetime.utcnow() - timedelta(days=400),
+            **kwargs
+        )
+    
+    manager = terminated("MGR2")
+    db_session.add(manager)
+    db_session.commit()
+    report = terminated("EMP2", manager_id=manager.id)
+    db_session.add(report)
+    db_session.commit()
+    report_id = report.id
+    # The report goes first, then the manager it no longer blocks
+    while EmployeeService.archive_terminated(db_session, after_days=365):
+        pass
+    assert db_session.query(EmployeeArchive).count() == 2
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/employees/{report_id}/profile", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["employee"]["employee_number"] == "EMP2"
+    assert data["manager"]["employee_number"] == "MGR2"
+    assert data["manager"]["archived_at"] is not None
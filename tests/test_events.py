@@ -0,0 +1,364 @@
+"""
+Tests for the transactional outbox and webhook dispatcher.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from app.config import settings
+
+
+class Receiver:
+    """Local HTTP server recording webhook deliveries."""
+    
+    def __init__(self):
+        self.batches = []
+        self.status_codes = []
+        receiver = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                status = receiver.status_codes.pop(0) if receiver.status_codes else 200
+                if status == 200:
+                    receiver.batches.append(json.loads(body)["events"])
+                self.send_response(status)
+                self.end_headers()
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def receiver():
+    receiver = Receiver()
+    yield receiver
+    receiver.close()
+
+
+@pytest.fixture
+def admin_headers(auth_headers, db_session, test_user):
+    """Authentication headers for a superuser."""
+    test_user.is_superuser = True
+    db_session.commit()
+    return auth_headers
+
+
+@pytest.fixture
+def dispatcher(monkeypatch):
+    from app.events.dispatcher import WebhookDispatcher
+    from tests.conftest import TestingSessionLocal
+    
+    monkeypatch.setattr(settings, "WEBHOOK_COMMIT_LAG_SECONDS", 0)
+    return WebhookDispatcher(session_factory=TestingSessionLocal)
+
+
+def _create_employee(client, headers, number):
+    return client.post(
+        f"{settings.API_V1_PREFIX}/employees/",
+        json={
+            "employee_number": number,
+            "first_name": "Hook",
+            "last_name": number,
+            "email": f"{number.lower()}@example.com",
+            "hire_date": "2024-01-01"
+        },
+        headers=headers
+    ).json()
+
+
+def test_service_writes_append_outbox_events(client, auth_headers, db_session):
+    """Test that creates, updates and deletes record events in the outbox."""
+    from app.events.models import OutboxEvent
+    
+    employee = _create_employee(client, auth_headers, "OUT1")
+    client.put(
+        f"{settings.API_V1_PREFIX}/employees/{employee['id']}",
+        json={"employment_status": "terminated"},
+        headers=auth_headers
+    )
+    client.delete(f"{settings.API_V1_PREFIX}/employees/{employee['id']}", headers=auth_headers)
+    
+    events = db_session.query(OutboxEvent).order_by(OutboxEvent.id).all()
+    assert [e.event_type for e in events] == [
+        "employee.created", "employee.updated", "employee.terminated", "employee.deleted"
+    ]
+    assert events[0].data["employee_number"] == "OUT1"
+    assert events[1].changed_fields == ["employment_status"]
+
+
+def test_bulk_update_appends_event_per_employee(client, auth_headers, db_session):
+    """Test that a bulk update records one event for each updated employee."""
+    from app.events.models import OutboxEvent
+    
+    ids = [_create_employee(client, auth_headers, f"OUTB{i}")["id"] for i in range(3)]
+    client.patch(
+        f"{settings.API_V1_PREFIX}/employees/bulk",
+        json={"filter": {"ids": ids}, "changes": {"city": "Quito"}},
+        headers=auth_headers
+    )
+    
+    events = db_session.query(OutboxEvent).filter(OutboxEvent.event_type == "employee.updated").all()
+    assert sorted(e.entity_id for e in events) == ids
+    assert all(e.data["city"] == "Quito" for e in events)
+
+
+async def test_dispatcher_delivers_to_local_receiver(client, admin_headers, receiver, dispatcher):
+    """Test batched delivery with event type filtering."""
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/events/webhooks",
+        json={"url": receiver.url, "event_types": ["employee.created"]},
+        headers=admin_headers
+    )
+    assert response.status_code == 201
+    
+    first = _create_employee(client, admin_headers, "HOOK1")
+    second = _create_employee(client, admin_headers, "HOOK2")
+    client.post(
+        f"{settings.API_V1_PREFIX}/departments/",
+        json={"name": "Filtered", "code": "FLT"},
+        headers=admin_headers
+    )
+    
+    delivered = await dispatcher.dispatch_once()
+    await dispatcher.aclose()
+    assert delivered == 2
+    assert len(receiver.batches) == 1
+    assert [e["entity_id"] for e in receiver.batches[0]] == [first["id"], second["id"]]
+    assert dispatcher.metrics["events_delivered"] == 2
+    
+    # Everything, including the filtered department event, is behind the cursor
+    assert await dispatcher.dispatch_once() == 0
+    endpoints = client.get(f"{settings.API_V1_PREFIX}/events/webhooks", headers=admin_headers).json()
+    assert endpoints[0]["failure_count"] == 0
+
+
+async def test_dispatcher_keeps_database_work_off_the_event_loop(
+    client, admin_headers, receiver, dispatcher, monkeypatch
+):
+    """Test that collecting, leasing and recording deliveries run in worker threads."""
+    import threading
+    
+    client.post(f"{settings.API_V1_PREFIX}/events/webhooks", json={"url": receiver.url}, headers=admin_headers)
+    _create_employee(client, admin_headers, "HOOK1")
+    loop_thread = threading.get_ident()
+    threads = {}
+    for name in ("_collect_due", "_lease", "_record_results"):
+        original = getattr(dispatcher, name)
+        
+        def tracked(*args, name=name, original=original):
+            threads[name] = threading.get_ident()
+            return original(*args)
+        
+        monkeypatch.setattr(dispatcher, name, tracked)
+    
+    assert await dispatcher.dispatch_once() == 1
+    await dispatcher.aclose()
+    assert len(threads) == 3
+    assert loop_thread not in threads.values()
+
+
+async def test_dispatcher_backs_off_after_failure(client, admin_headers, receiver, dispatcher, db_session):
+    """Test that a failed delivery is retried later without losing events."""
+    from app.events.models import WebhookEndpoint
+    
+    client.post(
+        f"{settings.API_V1_PREFIX}/events/webhooks",
+        json={"url": receiver.url},
+        headers=admin_headers
+    )
+    _create_employee(client, admin_headers, "RETRY1")
+    receiver.status_codes = [500]
+    
+    assert await dispatcher.dispatch_once() == 0
+    endpoint = db_session.query(WebhookEndpoint).one()
+    db_session.refresh(endpoint)
+    assert endpoint.failure_count == 1
+    assert endpoint.next_attempt_at is not None
+    assert endpoint.last_error == "HTTP 500"
+    
+    # Not due again until the backoff expires
+    assert await dispatcher.dispatch_once() == 0
+    endpoint.next_attempt_at = None
+    db_session.commit()
+    assert await dispatcher.dispatch_once() == 1
+    await dispatcher.aclose()
+    assert receiver.batches[0][0]["event_type"] == "employee.created"
+
+
+async def test_dispatcher_waits_for_late_commits(
+    client, admin_headers, receiver, dispatcher, db_session, monkeypatch
+):
+    """Test that the cursor never moves past an event that is still within the commit lag."""
+    from datetime import datetime, timedelta
+    from app.events.models import OutboxEvent, WebhookEndpoint
+    
+    monkeypatch.setattr(settings, "WEBHOOK_COMMIT_LAG_SECONDS", 60)
+    client.post(
+        f"{settings.API_V1_PREFIX}/events/webhooks",
+        json={"url": receiver.url},
+        headers=admin_headers
+    )
+    _create_employee(client, admin_headers, "LATE1")
+    _create_employee(client, admin_headers, "LATE2")
+    
+    # The lower id belongs to a transaction that only just committed
+    late, settled = db_session.query(OutboxEvent).order_by(OutboxEvent.id).all()
+    late.created_at = datetime.utcnow()
+    settled.created_at = datetime.utcnow() - timedelta(minutes=5)
+    db_session.commit()
+    
+    assert await dispatcher.dispatch_once() == 0
+    endpoint = db_session.query(WebhookEndpoint).one()
+    db_session.refresh(endpoint)
+    assert endpoint.last_event_id < late.id
+    
+    late.created_at = datetime.utcnow() - timedelta(minutes=5)
+    db_session.commit()
+    assert await dispatcher.dispatch_once() == 2
+    await dispatcher.aclose()
+    assert [e["id"] for e in receiver.batches[0]] == [late.id, settled.id]
+
+
+def test_stream_requires_authentication(client):
+    """Test that the event stream rejects anonymous clients."""
+    response = client.get(f"{settings.API_V1_PREFIX}/events/stream")
+    assert response.status_code == 401
+
+
+def _employee(number, department_id=None):
+    from app.employees.schemas import EmployeeCreate
+    
+    return EmployeeCreate(
+        employee_number=number,
+        first_name="Live",
+        last_name=number,
+        email=f"{number.lower()}@example.com",
+        hire_date="2024-01-01",
+        department_id=department_id
+    )
+
+
+async def _next_event(stream):
+    import asyncio
+    
+    return await asyncio.wait_for(stream.__anext__(), timeout=2)
+
+
+async def test_stream_pushes_committed_events_for_department(db_session):
+    """Test live delivery with department filtering."""
+    from app.departments.schemas import DepartmentCreate
+    from app.departments.service import DepartmentService
+    from app.employees.service import EmployeeService
+    from app.events.stream import broker
+    from tests.conftest import TestingSessionLocal
+    
+    department = DepartmentService.create(db_session, DepartmentCreate(name="Live", code="LIVE"))
+    stream = broker.stream(department_id=department.id, session_factory=TestingSessionLocal)
+    assert await _next_event(stream) == "retry: 3000\n\n"
+    
+    EmployeeService.create(db_session, _employee("LIVE0"))
+    hired = EmployeeService.create(db_session, _employee("LIVE1", department.id))
+    
+    message = await _next_event(stream)
+    lines = message.strip().split("\n")
+    assert lines[1] == "event: employee.created"
+    assert json.loads(lines[2][len("data: "):])["entity_id"] == hired.id
+    await stream.aclose()
+    assert not broker.subscribers
+
+
+async def test_stream_resumes_after_last_event_id(db_session):
+    """Test that missed events are replayed from the outbox on reconnect."""
+    from app.employees.service import EmployeeService
+    from app.events.models import OutboxEvent
+    from app.events.stream import broker
+    from tests.conftest import TestingSessionLocal
+    
+    for i in range(3):
+        EmployeeService.create(db_session, _employee(f"MISS{i}"))
+    ids = [event.id for event in db_session.query(OutboxEvent).order_by(OutboxEvent.id)]
+    
+    stream = broker.stream(last_event_id=ids[0], session_factory=TestingSessionLocal)
+    await _next_event(stream)
+    replayed = [await _next_event(stream) for _ in range(2)]
+    assert [int(m.split("\n")[0][len("id: "):]) for m in replayed] == ids[1:]
+    
+    # Live events continue after the replay
+    EmployeeService.create(db_session, _employee("MISS3"))
+    assert (await _next_event(stream)).startswith(f"id: {ids[-1] + 1}\n")
+    await stream.aclose()
+
+
+async def test_stream_ends_when_subscriber_falls_behind(db_session, monkeypatch):
+    """Test that a full queue ends the stream so the client resumes by ID."""
+    import asyncio
+    from app.employees.service import EmployeeService
+    from app.events.stream import broker
+    
+    monkeypatch.setattr(settings, "SSE_QUEUE_SIZE", 2)
+    stream = broker.stream()
+    await _next_event(stream)
+    for i in range(4):
+        EmployeeService.create(db_session, _employee(f"SLOW{i}"))
+    await asyncio.sleep(0)
+    
+    with pytest.raises(StopAsyncIteration):
+        await _next_event(stream)
+
+
+async def test_stream_delivers_live_events_out_of_id_order(db_session):
+    """Test that live events are only deduplicated against the replay, not by id order."""
+    from app.employees.service import EmployeeService
+    from app.events.models import OutboxEvent
+    from app.events.stream import broker
+    from tests.conftest import TestingSessionLocal
+    
+    for i in range(2):
+        EmployeeService.create(db_session, _employee(f"ORDER{i}"))
+    first, second = [event.id for event in db_session.query(OutboxEvent).order_by(OutboxEvent.id)]
+    
+    stream = broker.stream(last_event_id=first, session_factory=TestingSessionLocal)
+    await _next_event(stream)
+    assert (await _next_event(stream)).startswith(f"id: {second}\n")
+    
+    # Published by other workers: a duplicate of the replay, then a higher id before a lower one
+    for event_id in (second, second + 5, second + 3):
+        broker.deliver({"id": event_id, "event_type": "employee.updated", "entity": "employee",
+                        "entity_id": 1, "data": None})
+    assert (await _next_event(stream)).startswith(f"id: {second + 5}\n")
+    assert (await _next_event(stream)).startswith(f"id: {second + 3}\n")
+    await stream.aclose()
+
+
+async def test_stream_replay_is_capped(db_session, monkeypatch):
+    """Test that a long replay ends the stream with the last ID so the client resumes."""
+    import app.events.stream
+    from app.employees.service import EmployeeService
+    from app.events.models import OutboxEvent
+    from app.events.stream import broker
+    from tests.conftest import TestingSessionLocal
+    
+    monkeypatch.setattr(app.events.stream, "REPLAY_PAGE_SIZE", 2)
+    monkeypatch.setattr(settings, "SSE_REPLAY_MAX_EVENTS", 2)
+    for i in range(5):
+        EmployeeService.create(db_session, _employee(f"CAP{i}"))
+    ids = [event.id for event in db_session.query(OutboxEvent).order_by(OutboxEvent.id)]
+    
+    stream = broker.stream(last_event_id=0, session_factory=TestingSessionLocal)
+    await _next_event(stream)
+    replayed = [await _next_event(stream) for _ in range(2)]
+    assert [int(m.split("\n")[0][len("id: "):]) for m in replayed] == ids[:2]
+    assert await _next_event(stream) == f"id: {ids[1]}\n\n"
+    with pytest.raises(StopAsyncIteration):
+        await _next_event(stream)
@@ -0,0 +1,158 @@
+"""
+Tests for the Parquet warehouse export.
+"""
+import io
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from app.config import settings
+
+
+def _read(data: bytes) -> pa.Table:
+    # pre_buffer=False reads on the calling thread instead of Arrow's IO pool
+    return pq.read_table(io.BytesIO(data), pre_buffer=False)
+
+
+@pytest.fixture(autouse=True)
+def export_sessions(monkeypatch):
+    """Exports open their own sessions, on the test database, and include rows just written."""
+    from app.export.router import get_session_factory
+    from app.main import app
+    from tests.conftest import TestingSessionLocal
+    
+    monkeypatch.setattr(settings, "CHANGE_FEED_LAG_SECONDS", 0)
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    yield
+    app.dependency_overrides.pop(get_session_factory, None)
+
+
+@pytest.fixture
+def admin_headers(auth_headers, db_session, test_user):
+    """Authentication headers for a superuser."""
+    test_user.is_superuser = True
+    db_session.commit()
+    return auth_headers
+
+
+@pytest.fixture
+def staff(db_session):
+    """A department, a position and a few employees."""
+    from app.departments.models import Department
+    from app.employees.models import Employee, EmploymentStatus
+    from app.positions.models import Position
+    
+    department = Department(name="Engineering", code="ENG")
+    db_session.add(department)
+    db_session.commit()
+    position = Position(
+        title="Engineer", code="SE", department_id=department.id,
+        min_salary=Decimal("50000.50"), max_salary=Decimal("100000.00"),
+    )
+    db_session.add(position)
+    db_session.commit()
+    employees = [
+        Employee(
+            employee_number=f"EMP{i:03d}",
+            first_name="Export",
+            last_name=f"Person{i}",
+            email=f"export{i}@example.com",
+            hire_date=date(2024, 1, 1) + timedelta(days=i),
+            department_id=department.id,
+            position_id=position.id,
+            employment_status=EmploymentStatus.TERMINATED if i % 2 else EmploymentStatus.ACTIVE,
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(employees)
+    db_session.commit()
+    return employees
+
+
+def test_export_employees_parquet(client, admin_headers, staff):
+    """Test that employees export in batches with their column types."""
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/export/employees.parquet?batch_size=2",
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    
+    metadata = pq.ParquetFile(io.BytesIO(response.content)).metadata
+    assert metadata.num_row_groups == 3
+    assert metadata.row_group(0).column(0).compression == settings.EXPORT_COMPRESSION.upper()
+    
+    table = _read(response.content)
+    assert table.num_rows == 5
+    assert table.schema.field("id").type == pa.int64()
+    assert table.schema.field("hire_date").type == pa.date32()
+    assert table.schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+    assert pa.types.is_dictionary(table.schema.field("employment_status").type)
+    assert table.column("employment_status").to_pylist() == [
+        "active", "terminated", "active", "terminated", "active"
+    ]
+    assert table.column("hire_date").to_pylist()[4] == date(2024, 1, 5)
+
+
+def test_export_positions_keeps_decimals(client, admin_headers, staff):
+    """Test that Numeric salaries export as decimals."""
+    response = client.get(f"{settings.API_V1_PREFIX}/export/positions.parquet", headers=admin_headers)
+    table = _read(response.content)
+    assert table.schema.field("min_salary").type == pa.decimal128(10, 2)
+    assert table.column("min_salary").to_pylist() == [Decimal("50000.50")]
+
+
+def test_incremental_export(client, admin_headers, db_session, staff):
+    """Test that since/X-Export-Until export exactly the rows changed and deleted in between."""
+    url = f"{settings.API_V1_PREFIX}/export/employees.parquet"
+    deletes_url = f"{settings.API_V1_PREFIX}/export/employees/deletes.parquet"
+    until = client.get(url, headers=admin_headers).headers["X-Export-Until"]
+    
+    staff[3].updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    db_session.commit()
+    deleted_id = staff[4].id
+    assert client.delete(f"{settings.API_V1_PREFIX}/employees/{deleted_id}", headers=admin_headers).status_code == 204
+    
+    response = client.get(url, headers=admin_headers, params={"since": until})
+    assert _read(response.content).column("employee_number").to_pylist() == ["EMP003"]
+    response = client.get(deletes_url, headers=admin_headers, params={"since": until})
+    assert response.status_code == 200
+    assert _read(response.content).column("id").to_pylist() == [deleted_id]
+    
+    until = response.headers["X-Export-Until"]
+    response = client.get(deletes_url, headers=admin_headers, params={"since": until})
+    assert _read(response.content).num_rows == 0
+
+
+def test_export_window_trails_commit_lag(client, admin_headers, staff, monkeypatch):
+    """Test that the export window stops CHANGE_FEED_LAG_SECONDS before now."""
+    monkeypatch.setattr(settings, "CHANGE_FEED_LAG_SECONDS", 60)
+    before = datetime.now(timezone.utc)
+    response = client.get(f"{settings.API_V1_PREFIX}/export/employees.parquet", headers=admin_headers)
+    until = datetime.fromisoformat(response.headers["X-Export-Until"])
+    assert until <= before - timedelta(seconds=59)
+    # Rows updated within the lag are left to the next export
+    assert _read(response.content).num_rows == 0
+
+
+def test_export_permissions(client, auth_headers, db_session, test_user):
+    """Test that exports need a superuser and a known entity."""
+    url = f"{settings.API_V1_PREFIX}/export"
+    assert client.get(f"{url}/employees.parquet", headers=auth_headers).status_code == 403
+    test_user.is_superuser = True
+    db_session.commit()
+    assert client.get(f"{url}/users.parquet", headers=auth_headers).status_code == 404
+    assert client.get(f"{url}/departments.parquet", headers=auth_headers).status_code == 200
+
+
+def test_export_cli(tmp_path, staff, capsys):
+    """Test that the CLI writes one Parquet file per entity."""
+    from app.export.__main__ import main
+    from tests.conftest import TestingSessionLocal
+    
+    main(["employees", "departments", "--output-dir", str(tmp_path)], session_factory=TestingSessionLocal)
+    assert pq.ParquetFile(tmp_path / "employees.parquet").metadata.num_rows == 5
+    assert pq.ParquetFile(tmp_path / "departments.parquet").metadata.num_rows == 1
+    assert "until=" in capsys.readouterr().out
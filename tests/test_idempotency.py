@@ -0,0 +1,97 @@
+"""
+Tests for Idempotency-Key handling on POST endpoints.
+"""
+import pytest
+from datetime import datetime, timedelta
+from app.config import settings
+
+
+@pytest.fixture(autouse=True)
+def database_store(monkeypatch):
+    """Use the database-backed store regardless of a local Redis."""
+    monkeypatch.setattr(settings, "REDIS_ENABLED", False)
+
+
+def test_retry_replays_stored_response(client, auth_headers, db_session):
+    """Test that a retried POST returns the first response without re-executing."""
+    from app.departments.models import Department
+    
+    headers = {**auth_headers, "Idempotency-Key": "sync-42"}
+    payload = {"name": "Payroll", "code": "PAY"}
+    
+    first = client.post(f"{settings.API_V1_PREFIX}/departments/", json=payload, headers=headers)
+    assert first.status_code == 201
+    
+    retry = client.post(f"{settings.API_V1_PREFIX}/departments/", json=payload, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert db_session.query(Department).filter(Department.code == "PAY").count() == 1
+
+
+def test_key_reused_for_different_request(client, auth_headers):
+    """Test that reusing a key with another payload is rejected."""
+    headers = {**auth_headers, "Idempotency-Key": "sync-43"}
+    
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/positions/",
+        json={"title": "Analyst", "code": "AN"},
+        headers=headers
+    )
+    assert response.status_code == 201
+    
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/positions/",
+        json={"title": "Architect", "code": "AR"},
+        headers=headers
+    )
+    assert response.status_code == 422
+
+
+def test_failed_request_releases_key(client, auth_headers, db_session):
+    """Test that a request that errors can be retried with the same key."""
+    from app.departments.models import Department
+    
+    db_session.add(Department(name="Taken", code="TAKEN"))
+    db_session.commit()
+    headers = {**auth_headers, "Idempotency-Key": "sync-44"}
+    
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/departments/",
+        json={"name": "Taken", "code": "TAKEN"},
+        headers=headers
+    )
+    assert response.status_code == 400
+    
+    db_session.query(Department).filter(Department.code == "TAKEN").delete()
+    db_session.commit()
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/departments/",
+        json={"name": "Taken", "code": "TAKEN"},
+        headers=headers
+    )
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+
+
+def test_in_flight_key_conflict(client, auth_headers, db_session, test_user, monkeypatch):
+    """Test that a request waiting on an in-flight key gives up with 409."""
+    from app.idempotency.models import IdempotencyRecord
+    from app.idempotency.service import fingerprint_request
+    
+    path = f"{settings.API_V1_PREFIX}/departments/"
+    body = b'{"name": "Audit", "code": "AUD"}'
+    db_session.add(IdempotencyRecord(
+        key=f"{test_user.id}:sync-45",
+        fingerprint=fingerprint_request("POST", path, body),
+        expires_at=datetime.utcnow() + timedelta(minutes=5),
+    ))
+    db_session.commit()
+    monkeypatch.setattr(settings, "IDEMPOTENCY_LOCK_TIMEOUT_SECONDS", 0)
+    
+    response = client.post(
+        path,
+        content=body,
+        headers={**auth_headers, "Idempotency-Key": "sync-45", "Content-Type": "application/json"}
+    )
+    assert response.status_code == 409
@@ -0,0 +1,164 @@
+"""
+Tests for the background job runner.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+
+import pytest
+from app.config import settings
+
+
+@pytest.fixture
+def admin_headers(client, auth_headers, db_session, test_user):
+    """Authentication headers for a superuser, with a token carrying the role."""
+    test_user.is_superuser = True
+    db_session.commit()
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/auth/login",
+        data={"username": test_user.email, "password": "testpassword123"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def runner():
+    from app.jobs.runner import JobRunner
+    from tests.conftest import TestingSessionLocal
+    
+    executor = ThreadPoolExecutor(max_workers=settings.JOBS_MAX_WORKERS)
+    yield JobRunner(session_factory=TestingSessionLocal, executor=executor)
+    executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def blocking_job_type():
+    """A job type that waits until released, then reports progress."""
+    from app.jobs.registry import JOB_TYPES, job_type
+    
+    started, release = threading.Event(), threading.Event()
+    
+    # The test database is one shared connection, so the handler stays off it
+    # until the test releases it
+    @job_type("test.block", concurrency=1)
+    def block(ctx, params):
+        """Wait for the test to release it."""
+        started.set()
+        release.wait(10)
+        ctx.progress(0.5)
+        return {"released": True}
+    
+    yield started, release
+    release.set()
+    del JOB_TYPES["test.block"]
+
+
+async def test_job_lifecycle(client, admin_headers, runner):
+    """Test that a queued job runs and its result can be polled."""
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/jobs/",
+        headers=admin_headers,
+        json={"job_type": "leave.reconcile", "params": {"repair": True}}
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    
+    started = await runner.run_once()
+    assert await asyncio.gather(*started) == ["succeeded"]
+    
+    job = client.get(f"{settings.API_V1_PREFIX}/jobs/{job['id']}", headers=admin_headers).json()
+    assert job["status"] == "succeeded"
+    assert job["progress"] == 1.0
+    assert job["result"] == {"checked": 0, "mismatches": [], "repaired": True}
+
+
+async def test_concurrency_limit_and_cancellation(client, admin_headers, runner, blocking_job_type, monkeypatch):
+    """Test per-type concurrency and cancelling queued and running jobs."""
+    import app.jobs.registry
+    
+    monkeypatch.setattr(app.jobs.registry, "PROGRESS_WRITE_INTERVAL", 0)
+    url = f"{settings.API_V1_PREFIX}/jobs/"
+    first = client.post(url, headers=admin_headers, json={"job_type": "test.block"}).json()
+    second = client.post(url, headers=admin_headers, json={"job_type": "test.block"}).json()
+    
+    handler_started, release = blocking_job_type
+    futures = await runner.run_once()
+    assert len(futures) == 1
+    assert await asyncio.to_thread(handler_started.wait, 10)
+    assert await runner.run_once() == []
+    
+    response = client.post(f"{url}{second['id']}/cancel", headers=admin_headers)
+    assert response.json()["status"] == "cancelled"
+    
+    response = client.post(f"{url}{first['id']}/cancel", headers=admin_headers)
+    assert response.json()["status"] == "running"
+    assert response.json()["cancel_requested"] is True
+    release.set()
+    assert await asyncio.gather(*futures) == ["cancelled"]
+    
+    response = client.post(f"{url}{first['id']}/cancel", headers=admin_headers)
+    assert response.status_code == 409
+
+
+async def test_claims_lock_their_job_type(client, admin_headers, runner, db_session):
+    """Test that each job type has a claim lock row, including types registered later."""
+    from app.jobs.models import JobTypeLock
+    from app.jobs.registry import JOB_TYPES, job_type
+    
+    assert await runner.run_once() == []
+    assert db_session.get(JobTypeLock, "leave.reconcile") is not None
+    
+    @job_type("test.late")
+    def late(ctx, params):
+        """Return at once."""
+        return {}
+    
+    try:
+        client.post(f"{settings.API_V1_PREFIX}/jobs/", headers=admin_headers, json={"job_type": "test.late"})
+        # Skipped until the next cycle creates its lock row
+        assert await runner.run_once() == []
+        started = await runner.run_once()
+        assert await asyncio.gather(*started) == ["succeeded"]
+        assert db_session.get(JobTypeLock, "test.late") is not None
+    finally:
+        del JOB_TYPES["test.late"]
+
+
+def test_job_permissions_and_params(client, auth_headers):
+    """Test that superuser-only types and invalid parameters are rejected."""
+    url = f"{settings.API_V1_PREFIX}/jobs/"
+    response = client.post(url, headers=auth_headers, json={"job_type": "leave.reconcile"})
+    assert response.status_code == 403
+    response = client.post(url, headers=auth_headers, json={"job_type": "nope"})
+    assert response.status_code == 400
+    assert client.get(f"{settings.API_V1_PREFIX}/jobs/types", headers=auth_headers).json() == []
+
+
+def test_job_runs_in_spawned_process(tmp_path, monkeypatch):
+    """Test that a job executes in a separate process with its own database connection."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base
+    from app.jobs.models import Job, JobStatus
+    from app.jobs.runner import execute_job
+    
+    url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    job = Job(job_type="leave.reconcile", params={"repair": False}, status=JobStatus.RUNNING)
+    db.add(job)
+    db.commit()
+    
+    monkeypatch.setenv("DATABASE_URL", url)
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        assert pool.submit(execute_job, job.id).result(timeout=60) == "succeeded"
+        assert pool.submit(os.getpid).result() != os.getpid()
+    
+    db.refresh(job)
+    assert job.result == {"checked": 0, "mismatches": [], "repaired": False}
+    db.close()
+    engine.dispose()
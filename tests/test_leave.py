@@ -0,0 +1,330 @@
+"""
+Tests for leave requests, the ledger and materialized balances.
+"""
+import time
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+from app.config import settings
+
+
+@pytest.fixture(autouse=True)
+def reset_absence_index():
+    """Each test starts from an empty database, so start from an empty index."""
+    from app.leave.calendar import absence_index
+    
+    absence_index.clear()
+    yield
+    absence_index.clear()
+
+
+@pytest.fixture
+def admin_headers(auth_headers, db_session, test_user):
+    """Authentication headers for a superuser."""
+    test_user.is_superuser = True
+    db_session.commit()
+    return auth_headers
+
+
+@pytest.fixture
+def employee(db_session):
+    """Create an employee."""
+    from app.employees.models import Employee
+    
+    employee = Employee(
+        employee_number="EMP001",
+        first_name="John",
+        last_name="Doe",
+        email="john.doe@example.com",
+        hire_date=date(2024, 1, 1)
+    )
+    db_session.add(employee)
+    db_session.commit()
+    return employee
+
+
+@pytest.fixture
+def annual_leave(client, admin_headers):
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/leave/types",
+        headers=admin_headers,
+        json={"name": "Annual Leave", "max_days": 15}
+    )
+    return response.json()["id"]
+
+
+def request_leave(client, headers, employee_id, leave_type_id, days, start="2024-06-03", end="2024-06-05"):
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/leave/requests",
+        headers=headers,
+        json={
+            "employee_id": employee_id,
+            "leave_type_id": leave_type_id,
+            "start_date": start,
+            "end_date": end,
+            "days": days,
+        }
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_approval_updates_balance(client, admin_headers, employee, annual_leave):
+    """Test that approval posts usage and deducts from the balance atomically."""
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/leave/ledger",
+        headers=admin_headers,
+        json={"employee_id": employee.id, "leave_type_id": annual_leave, "days": "10"}
+    )
+    assert response.status_code == 201
+    
+    request_id = request_leave(client, admin_headers, employee.id, annual_leave, "3")
+    response = client.put(
+        f"{settings.API_V1_PREFIX}/leave/requests/{request_id}/status",
+        headers=admin_headers,
+        json={"status": "approved"}
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "approved"
+    
+    response = client.put(
+        f"{settings.API_V1_PREFIX}/leave/requests/{request_id}/status",
+        headers=admin_headers,
+        json={"status": "rejected"}
+    )
+    assert response.status_code == 409
+    
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/employees/{employee.id}/leave-balance",
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    [balance] = response.json()
+    assert float(balance["accrued"]) == 10
+    assert float(balance["used"]) == 3
+    assert float(balance["balance"]) == 7
+    
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/leave/ledger?employee_id={employee.id}",
+        headers=admin_headers
+    )
+    assert [entry["entry_type"] for entry in response.json()] == ["usage", "accrual"]
+
+
+def test_approval_rejects_insufficient_balance(client, admin_headers, employee, annual_leave):
+    """Test that an approval exceeding the balance leaves no trace."""
+    request_id = request_leave(client, admin_headers, employee.id, annual_leave, "2")
+    response = client.put(
+        f"{settings.API_V1_PREFIX}/leave/requests/{request_id}/status",
+        headers=admin_headers,
+        json={"status": "approved"}
+    )
+    assert response.status_code == 400
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/leave/requests/{request_id}", headers=admin_headers)
+    assert response.json()["status"] == "pending"
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/leave/ledger?employee_id={employee.id}",
+        headers=admin_headers
+    )
+    assert response.json() == []
+
+
+def test_reconcile_detects_and_repairs_drift(client, admin_headers, db_session, employee, annual_leave):
+    """Test that reconciliation compares balances against the ledger."""
+    from app.leave.models import LeaveBalance
+    
+    client.post(
+        f"{settings.API_V1_PREFIX}/leave/ledger",
+        headers=admin_headers,
+        json={"employee_id": employee.id, "leave_type_id": annual_leave, "days": "5.5"}
+    )
+    url = f"{settings.API_V1_PREFIX}/leave/reconcile"
+    assert client.post(url, headers=admin_headers).json() == {"checked": 1, "mismatches": [], "repaired": False}
+    
+    balance = db_session.get(LeaveBalance, (employee.id, annual_leave))
+    balance.balance = 99
+    db_session.commit()
+    
+    report = client.post(f"{url}?repair=true", headers=admin_headers).json()
+    assert len(report["mismatches"]) == 1
+    assert float(report["mismatches"][0]["ledger_balance"]) == 5.5
+    assert client.post(url, headers=admin_headers).json()["mismatches"] == []
+
+
+def test_reconcile_ignores_entries_posted_meanwhile(db_session, monkeypatch, employee, annual_leave):
+    """Test that an entry posted between the unlocked reads is not repaired away."""
+    from app.leave import service
+    from app.leave.models import LeaveBalance
+    from app.leave.schemas import LedgerEntryCreate
+    from app.leave.service import LeaveService
+    
+    accrual = LedgerEntryCreate(employee_id=employee.id, leave_type_id=annual_leave, days="5")
+    LeaveService.post_entry(db_session, accrual)
+    ledger_totals = service._ledger_totals
+    
+    def post_then_total(db, *criteria):
+        # Another request posts after the balances were read
+        monkeypatch.setattr(service, "_ledger_totals", ledger_totals)
+        LeaveService.post_entry(db_session, accrual)
+        return ledger_totals(db, *criteria)
+    
+    monkeypatch.setattr(service, "_ledger_totals", post_then_total)
+    report = LeaveService.reconcile(db_session, repair=True)
+    
+    assert report["mismatches"] == []
+    assert float(db_session.get(LeaveBalance, (employee.id, annual_leave)).balance) == 10
+    
+
+def test_leave_request_validates_dates(client, auth_headers, employee):
+    """Test that a leave request cannot end before it starts."""
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/leave/requests",
+        headers=auth_headers,
+        json={
+            "employee_id": employee.id,
+            "leave_type_id": 1,
+            "start_date": "2024-06-05",
+            "end_date": "2024-06-03",
+            "days": 1,
+        }
+    )
+    assert response.status_code == 422
+
+
+def test_overlapping_request_is_rejected(client, auth_headers, employee, annual_leave):
+    """Test that an employee cannot request leave overlapping pending leave."""
+    request_leave(client, auth_headers, employee.id, annual_leave, "3")
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/leave/requests",
+        headers=auth_headers,
+        json={
+            "employee_id": employee.id,
+            "leave_type_id": annual_leave,
+            "start_date": "2024-06-05",
+            "end_date": "2024-06-07",
+            "days": 3,
+        }
+    )
+    assert response.status_code == 409
+    request_leave(client, auth_headers, employee.id, annual_leave, "1", "2024-06-06", "2024-06-06")
+
+
+def test_request_locks_employee_before_overlap_check(client, auth_headers, employee, annual_leave):
+    """Test that the employee row is locked before overlapping requests are looked up."""
+    from sqlalchemy import event
+    from sqlalchemy.dialects import mysql
+    from sqlalchemy.sql import Select
+    from tests.conftest import engine
+    
+    selects = []
+    
+    def capture(conn, clauseelement, multiparams, params, execution_options):
+        if isinstance(clauseelement, Select):
+            selects.append(str(clauseelement.compile(dialect=mysql.dialect())))
+    
+    event.listen(engine, "before_execute", capture)
+    try:
+        request_leave(client, auth_headers, employee.id, annual_leave, "3")
+    finally:
+        event.remove(engine, "before_execute", capture)
+    
+    [lock] = [index for index, statement in enumerate(selects) if "FOR UPDATE" in statement]
+    assert "FROM employees" in selects[lock]
+    assert "FROM leave_requests" in selects[lock + 1]
+    
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/leave/requests",
+        headers=auth_headers,
+        json={
+            "employee_id": employee.id + 1,
+            "leave_type_id": annual_leave,
+            "start_date": "2024-07-01",
+            "end_date": "2024-07-01",
+            "days": 1,
+        }
+    )
+    assert response.status_code == 400
+
+
+def test_team_calendar(client, admin_headers, db_session, employee, annual_leave):
+    """Test that the calendar lists the team's overlapping, non-rejected leave."""
+    from app.employees.models import Employee
+    
+    reports = [
+        Employee(
+            employee_number=f"EMP10{i}",
+            first_name="Report",
+            last_name=str(i),
+            email=f"report{i}@example.com",
+            hire_date=date(2024, 1, 1),
+            manager_id=employee.id
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(reports)
+    db_session.commit()
+    
+    first = request_leave(client, admin_headers, reports[0].id, annual_leave, "3", "2024-06-03", "2024-06-05")
+    rejected = request_leave(client, admin_headers, reports[1].id, annual_leave, "1", "2024-06-04", "2024-06-04")
+    request_leave(client, admin_headers, reports[2].id, annual_leave, "1", "2024-07-01", "2024-07-01")
+    # The manager's own leave is not part of their team
+    request_leave(client, admin_headers, employee.id, annual_leave, "1", "2024-06-04", "2024-06-04")
+    client.put(
+        f"{settings.API_V1_PREFIX}/leave/requests/{rejected}/status",
+        headers=admin_headers,
+        json={"status": "rejected"}
+    )
+    
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/leave/calendar",
+        headers=admin_headers,
+        params={"start_date": "2024-06-05", "end_date": "2024-06-30", "manager_id": employee.id}
+    )
+    assert response.status_code == 200
+    absences = response.json()["absences"]
+    assert [(a["request_id"], a["first_name"], a["status"]) for a in absences] == [(first, "Report", "pending")]
+
+
+def test_team_calendar_benchmark(db_session, employee, annual_leave):
+    """A team of 50 over a quarter answers in milliseconds amid years of history."""
+    from app.employees.models import Employee
+    from app.leave.calendar import absence_index
+    from app.leave.models import LeaveRequest, LeaveRequestStatus
+    from app.leave.service import LeaveService
+    
+    db_session.execute(insert(Employee), [
+        {
+            "employee_number": f"EMP{i:05d}",
+            "first_name": "Staff",
+            "last_name": str(i),
+            "email": f"staff{i}@example.com",
+            "hire_date": date(2020, 1, 1),
+            "manager_id": employee.id if i < 50 else None,
+        }
+        for i in range(1000)
+    ])
+    ids = [row.id for row in db_session.query(Employee.id).filter(Employee.id != employee.id)]
+    # Ten one-week absences a year for five years per employee
+    db_session.execute(insert(LeaveRequest), [
+        {
+            "employee_id": employee_id,
+            "leave_type_id": annual_leave,
+            "start_date": date(2020, 1, 6) + timedelta(days=36 * n + employee_id % 30),
+            "end_date": date(2020, 1, 10) + timedelta(days=36 * n + employee_id % 30),
+            "days": 5,
+            "status": LeaveRequestStatus.APPROVED,
+        }
+        for employee_id in ids
+        for n in range(50)
+    ])
+    db_session.commit()
+    absence_index.refresh(db_session, force=True)
+    
+    start = time.perf_counter()
+    calendar = LeaveService.get_team_calendar(db_session, date(2024, 4, 1), date(2024, 6, 30), employee.id)
+    elapsed = time.perf_counter() - start
+    
+    assert {absence["employee_id"] for absence in calendar["absences"]} == set(ids[:50])
+    assert elapsed < 0.05
@@ -0,0 +1,159 @@
+"""
+Tests for the columnar org snapshot.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import insert
+from app.config import settings
+
+
+@pytest.fixture(autouse=True)
+def fresh_snapshot():
+    from app.orgsnapshot.engine import org_snapshot
+    
+    org_snapshot.invalidate()
+    yield org_snapshot
+    org_snapshot.invalidate()
+
+
+@pytest.fixture
+def org(db_session):
+    """
+    Engineering > Backend, with:
+    
+    ceo -> vp -> lead1 -> dev1, dev2, dev3
+               -> lead2 -> dev4 (terminated)
+    """
+    from app.departments.models import Department
+    from app.employees.models import Employee, EmploymentStatus
+    from app.positions.models import Position
+    
+    engineering = Department(name="Engineering", code="ENG")
+    db_session.add(engineering)
+    db_session.flush()
+    backend = Department(name="Backend", code="BE", parent_department_id=engineering.id)
+    db_session.add(backend)
+    db_session.flush()
+    engineer = Position(title="Engineer", code="ENGR", department_id=backend.id)
+    db_session.add(engineer)
+    db_session.flush()
+    
+    people = {}
+    
+    def hire(name, manager=None, department=engineering, status=EmploymentStatus.ACTIVE):
+        employee = Employee(
+            employee_number=name.upper(),
+            first_name=name,
+            last_name="X",
+            email=f"{name}@example.com",
+            hire_date=date(2024, 1, 1),
+            manager_id=people[manager].id if manager else None,
+            department_id=department.id,
+            position_id=engineer.id if department is backend else None,
+            employment_status=status,
+        )
+        db_session.add(employee)
+        db_session.flush()
+        people[name] = employee
+    
+    hire("ceo")
+    hire("vp", "ceo")
+    hire("lead1", "vp", backend)
+    hire("lead2", "vp", backend)
+    for dev in ("dev1", "dev2", "dev3"):
+        hire(dev, "lead1", backend)
+    hire("dev4", "lead2", backend, EmploymentStatus.TERMINATED)
+    db_session.commit()
+    return {"engineering": engineering.id, "backend": backend.id, "engineer": engineer.id,
+            **{name: employee.id for name, employee in people.items()}}
+
+
+def test_org_analytics(client, auth_headers, org):
+    """Test span of control, depth, managers of managers and subtree headcount."""
+    base = f"{settings.API_V1_PREFIX}/org"
+    
+    span = client.get(f"{base}/span-of-control?limit=2", headers=auth_headers).json()
+    assert span["managers"] == 4
+    assert span["max"] == 3
+    assert span["top"] == [
+        {"employee_id": org["lead1"], "direct_reports": 3},
+        {"employee_id": org["vp"], "direct_reports": 2},
+    ]
+    
+    depth = client.get(f"{base}/depth", headers=auth_headers).json()
+    assert depth == {"max_depth": 3, "employees_by_depth": [1, 1, 2, 4]}
+    
+    assert client.get(f"{base}/managers-of-managers", headers=auth_headers).json() == [org["ceo"], org["vp"]]
+    
+    headcount = client.get(
+        f"{base}/headcount?department_id={org['engineering']}", headers=auth_headers
+    ).json()
+    assert {(group["position_id"], group["employment_status"], group["count"]) for group in headcount} == {
+        (None, "active", 2),
+        (org["engineer"], "active", 5),
+        (org["engineer"], "terminated", 1),
+    }
+    headcount = client.get(
+        f"{base}/headcount?department_id={org['backend']}&employment_status=terminated", headers=auth_headers
+    ).json()
+    assert headcount == [{"position_id": org["engineer"], "employment_status": "terminated", "count": 1}]
+
+
+def test_snapshot_follows_service_writes(client, auth_headers, org, fresh_snapshot):
+    """Test that writes through the API update the loaded snapshot without a reload."""
+    base = f"{settings.API_V1_PREFIX}/org"
+    client.get(f"{base}/stats", headers=auth_headers)
+    loaded_at = fresh_snapshot.loaded_at
+    
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/employees/",
+        headers=auth_headers,
+        json={
+            "employee_number": "DEV5",
+            "first_name": "dev5",
+            "last_name": "X",
+            "email": "dev5@example.com",
+            "hire_date": "2024-01-01",
+            "manager_id": org["dev1"],
+        },
+    )
+    assert response.status_code == 201
+    assert client.get(f"{base}/depth", headers=auth_headers).json()["max_depth"] == 4
+    
+    client.put(
+        f"{settings.API_V1_PREFIX}/employees/{response.json()['id']}",
+        headers=auth_headers,
+        json={"manager_id": org["ceo"]},
+    )
+    assert org["dev1"] not in [
+        item["employee_id"] for item in client.get(f"{base}/span-of-control", headers=auth_headers).json()["top"]
+    ]
+    
+    client.delete(f"{settings.API_V1_PREFIX}/employees/{response.json()['id']}", headers=auth_headers)
+    assert client.get(f"{base}/stats", headers=auth_headers).json()["employees"] == 8
+    assert fresh_snapshot.loaded_at == loaded_at
+
+
+def test_snapshot_memory_per_employee(db_session, fresh_snapshot):
+    """Test that the snapshot stays compact: well under 100 bytes per employee."""
+    from app.employees.models import Employee
+    
+    db_session.execute(insert(Employee), [
+        {
+            "employee_number": f"EMP{i:05d}",
+            "first_name": "Staff",
+            "last_name": str(i),
+            "email": f"staff{i}@example.com",
+            "hire_date": date(2024, 1, 1),
+            "manager_id": (i // 10) or None,
+        }
+        for i in range(1, 20001)
+    ])
+    db_session.commit()
+    
+    fresh_snapshot.load(db_session)
+    stats = fresh_snapshot.stats()
+    assert stats["employees"] == 20000
+    assert stats["memory_bytes"] / stats["employees"] < 100
+    assert fresh_snapshot.depth()["max_depth"] == 4
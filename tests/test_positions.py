@@ -0,0 +1,32 @@
+"""
+Tests for position endpoints.
+"""
+from app.config import settings
+
+
+def test_batch_get_positions(client, auth_headers, db_session):
+    """Test resolving several positions by ID in one request."""
+    from app.positions.models import Position
+    
+    engineer = Position(title="Engineer", code="ENG1")
+    analyst = Position(title="Analyst", code="ANL1")
+    db_session.add_all([engineer, analyst])
+    db_session.commit()
+    
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/positions/batch-get",
+        json={"ids": [analyst.id, 4242, engineer.id, analyst.id, 4242]},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    # Request order, with duplicates collapsed
+    assert [item["code"] for item in data["items"]] == ["ANL1", "ENG1"]
+    assert data["missing"] == [4242]
+    
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/positions/batch-get",
+        json={"ids": []},
+        headers=auth_headers
+    )
+    assert response.status_code == 422
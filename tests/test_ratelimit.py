@@ -0,0 +1,94 @@
+"""
+Tests for rate limiting and load shedding.
+"""
+import time
+
+import pytest
+from app.config import settings
+from app.database import PoolWaitMonitor, pool_wait
+from app.ratelimit.buckets import Limit, MemoryBuckets, memory_buckets
+
+
+@pytest.fixture
+def rate_limited(monkeypatch):
+    """Enable rate limits with in-process buckets."""
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "REDIS_ENABLED", False)
+    memory_buckets.clear()
+    yield
+    memory_buckets.clear()
+
+
+def test_token_bucket_refill():
+    """Test that a bucket allows a burst, then refills at its rate."""
+    buckets = MemoryBuckets()
+    limit = Limit(per_minute=60 * 50, burst=3)
+    assert [buckets.take("k", limit)[0] for _ in range(4)] == [True, True, True, False]
+    allowed, retry_after = buckets.take("k", limit)
+    assert not allowed
+    assert 0 < retry_after <= 0.02
+    time.sleep(0.03)
+    assert buckets.take("k", limit)[0]
+    assert buckets.take("other", limit)[0]
+
+
+def test_read_quota_per_user(client, auth_headers, rate_limited, monkeypatch):
+    """Test that reads are limited per authenticated user."""
+    monkeypatch.setattr(settings, "RATE_LIMIT_READ_BURST", 3)
+    monkeypatch.setattr(settings, "RATE_LIMIT_READ_PER_MINUTE", 1)
+    url = f"{settings.API_V1_PREFIX}/employees/"
+    
+    assert [client.get(url, headers=auth_headers).status_code for _ in range(3)] == [200] * 3
+    response = client.get(url, headers=auth_headers)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    
+    # Anonymous callers have their own bucket, and health checks are never limited
+    assert client.get(url).status_code == 401
+    assert client.get("/health").status_code == 200
+
+
+def test_token_decoded_once_per_request(client, auth_headers, rate_limited, monkeypatch):
+    """Test that the rate limiter, auth and read routing share one token verification."""
+    import app.auth.utils
+    
+    decode_token = app.auth.utils.decode_token
+    calls = []
+    
+    def counting_decode(token):
+        calls.append(token)
+        return decode_token(token)
+    
+    monkeypatch.setattr(app.auth.utils, "decode_token", counting_decode)
+    assert client.get(f"{settings.API_V1_PREFIX}/employees/", headers=auth_headers).status_code == 200
+    assert len(calls) == 1
+
+
+def test_login_quota_is_stricter(client, test_user, rate_limited):
+    """Test that logins exhaust their quota before reads would."""
+    url = f"{settings.API_V1_PREFIX}/auth/login"
+    data = {"username": "testuser", "password": "wrong"}
+    codes = [client.post(url, data=data).status_code for _ in range(settings.RATE_LIMIT_LOGIN_BURST + 1)]
+    assert codes[-1] == 429
+    assert 429 not in codes[:-1]
+
+
+def test_load_shedding(client, auth_headers, monkeypatch):
+    """Test that API requests fail fast while the pool wait is too long."""
+    monkeypatch.setattr(pool_wait, "wait_seconds", lambda: 2.0)
+    response = client.get(f"{settings.API_V1_PREFIX}/employees/", headers=auth_headers)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.LOAD_SHED_RETRY_AFTER_SECONDS)
+    assert client.get("/health").status_code == 200
+
+
+def test_pool_wait_monitor():
+    """Test that the pool wait reflects waiting checkouts and decays."""
+    monitor = PoolWaitMonitor(half_life=0.01)
+    token = monitor.start()
+    time.sleep(0.05)
+    assert monitor.wait_seconds() >= 0.05
+    monitor.finish(token)
+    assert monitor.wait_seconds() > 0
+    time.sleep(0.2)
+    assert monitor.wait_seconds() < 0.001
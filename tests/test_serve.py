@@ -0,0 +1,102 @@
+"""
+Tests for the server launcher, startup warmup and readiness.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.config import settings
+
+# Starts the app like a fresh deploy and times its first authenticated request
+FIRST_REQUEST_PROBE = """
+import json, time
+from fastapi.testclient import TestClient
+from app.auth.utils import create_access_token
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.users.models import User
+
+Base.metadata.create_all(bind=engine)
+db = SessionLocal()
+user = User(email="probe@example.com", hashed_password="unused")
+db.add(user)
+db.commit()
+user_id = user.id
+db.close()
+engine.dispose()
+
+headers = {"Authorization": "Bearer " + create_access_token({"sub": str(user_id)})}
+with TestClient(app) as client:
+    ready = client.get("/health/ready").status_code
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        status = client.get("/api/v1/employees/", headers=headers).status_code
+        timings.append((time.perf_counter() - start) * 1000)
+print(json.dumps({"ready": ready, "status": status, "first_ms": timings[0], "second_ms": timings[1]}))
+"""
+
+
+def test_readiness_reports_warmup_state(client, monkeypatch):
+    """Test that readiness is 503 until warmup succeeds."""
+    import app.main
+    
+    app.main.app.state.ready = False
+    monkeypatch.setattr(app.main, "warm_up", lambda application: ["connection pool"])
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    
+    monkeypatch.setattr(app.main, "warm_up", lambda application: [])
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+
+def test_readiness_stays_down_while_shutting_down(client, monkeypatch):
+    """Test that a probe during shutdown does not re-run warmup and report ready."""
+    import app.main
+    
+    monkeypatch.setattr(app.main, "warm_up", lambda application: [])
+    app.main.app.state.ready = False
+    app.main.app.state.shutting_down = True
+    response = client.get("/health/ready")
+    app.main.app.state.shutting_down = False
+    assert response.status_code == 503
+    assert response.json() == {"status": "shutting_down"}
+    assert app.main.app.state.ready is False
+
+
+def test_build_config_overrides():
+    """Test that command-line options override settings."""
+    from app.serve import build_config
+    
+    config = build_config(["--workers", "4", "--port", "9000", "--graceful-timeout", "5"])
+    assert config.workers == 4
+    assert config.port == 9000
+    assert config.host == settings.SERVER_HOST
+    assert config.timeout_graceful_shutdown == 5
+
+
+def test_first_request_latency_after_startup(tmp_path):
+    """Measure the first request served after a cold start with warmup enabled."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(Path(__file__).resolve().parent.parent),
+        "SECRET_KEY": "probe-secret",
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'probe.db'}",
+        "WARMUP_ON_STARTUP": "True",
+        "REDIS_ENABLED": "False",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST_PROBE],
+        env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    
+    assert measured["ready"] == 200
+    assert measured["status"] == 200
+    # A warm worker answers its first request in about steady-state time
+    assert measured["first_ms"] < max(10 * measured["second_ms"], 250)
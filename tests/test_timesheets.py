@@ -0,0 +1,115 @@
+"""
+Tests for timesheet aggregation.
+"""
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import insert
+from app.config import settings
+
+
+@pytest.fixture
+def punches(db_session):
+    """Insert two employees' punches for March 2024."""
+    from app.attendance.models import Punch, PunchType
+    from app.employees.models import Employee
+    
+    alice = Employee(employee_number="EMP001", first_name="Alice", last_name="A",
+                     email="alice@example.com", hire_date=datetime(2024, 1, 1).date())
+    bob = Employee(employee_number="EMP002", first_name="Bob", last_name="B",
+                   email="bob@example.com", hire_date=datetime(2024, 1, 1).date())
+    db_session.add_all([alice, bob])
+    db_session.commit()
+    
+    rows = [
+        # Alice: on time, 8h; then late and 10h (2h overtime)
+        (alice.id, PunchType.IN, datetime(2024, 3, 4, 9, 0)),
+        (alice.id, PunchType.OUT, datetime(2024, 3, 4, 17, 0)),
+        (alice.id, PunchType.IN, datetime(2024, 3, 5, 9, 30)),
+        (alice.id, PunchType.OUT, datetime(2024, 3, 5, 19, 30)),
+        # Bob: night shift on the last day that ends in April, plus a forgotten clock-out
+        (bob.id, PunchType.IN, datetime(2024, 3, 6, 8, 55)),
+        (bob.id, PunchType.IN, datetime(2024, 3, 31, 8, 0)),
+        (bob.id, PunchType.OUT, datetime(2024, 4, 1, 0, 0)),
+        # Outside the period
+        (alice.id, PunchType.IN, datetime(2024, 2, 28, 9, 0)),
+    ]
+    db_session.execute(insert(Punch), [
+        {"employee_id": e, "punch_type": t, "punched_at": at} for e, t, at in rows
+    ])
+    db_session.commit()
+    return alice.id, bob.id
+
+
+def test_timesheet_totals(client, auth_headers, punches):
+    """Test hours, overtime, lateness and unmatched punches per employee."""
+    alice, bob = punches
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/timesheets/?period=2024-03", headers=auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["closed"] is True
+    entries = {entry["employee_id"]: entry for entry in data["entries"]}
+    
+    assert entries[alice] == {
+        "employee_id": alice,
+        "worked_hours": 18.0,
+        "regular_hours": 16.0,
+        "overtime_hours": 2.0,
+        "days_worked": 2,
+        "late_arrivals": 1,
+        "late_minutes": 30.0,
+        "unmatched_punches": 0,
+    }
+    assert entries[bob]["worked_hours"] == 16.0
+    assert entries[bob]["overtime_hours"] == 8.0
+    assert entries[bob]["unmatched_punches"] == 1
+    assert entries[bob]["late_arrivals"] == 0
+
+
+def test_closed_period_cache_sees_late_corrections(client, auth_headers, db_session, punches):
+    """Test that a cached closed period is recomputed when its punches change."""
+    from app.attendance.models import Punch, PunchType
+    
+    alice, _ = punches
+    url = f"{settings.API_V1_PREFIX}/timesheets/?period=2024-03"
+    client.get(url, headers=auth_headers)
+    db_session.add(Punch(employee_id=alice, punch_type=PunchType.IN, punched_at=datetime(2024, 3, 7, 9, 0)))
+    db_session.commit()
+    
+    entries = {entry["employee_id"]: entry for entry in client.get(url, headers=auth_headers).json()["entries"]}
+    assert entries[alice]["unmatched_punches"] == 1
+
+
+def test_timesheet_rejects_invalid_period(client, auth_headers):
+    """Test that the period must be YYYY-MM."""
+    response = client.get(f"{settings.API_V1_PREFIX}/timesheets/?period=2024-13", headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_compute_benchmark_50k_employees_one_month():
+    """Benchmark a month of two punches per workday for 50k employees."""
+    from app.timesheets.service import PunchColumns, compute_timesheets
+    
+    employees, workdays = 50000, 22
+    rng = np.random.default_rng(0)
+    days = np.repeat(np.arange(workdays), employees)
+    clock_in = days * 86400 + 9 * 3600 + rng.integers(-600, 1800, days.size)
+    clock_out = clock_in + rng.integers(7 * 3600, 10 * 3600, days.size)
+    columns = PunchColumns(
+        employee_ids=np.tile(np.arange(employees, dtype=np.int64), workdays * 2),
+        seconds=np.concatenate([clock_in, clock_out]).astype(np.int64),
+        is_out=np.repeat([False, True], days.size),
+    )
+    
+    start = time.perf_counter()
+    totals = compute_timesheets(columns, 31)
+    elapsed = time.perf_counter() - start
+    
+    assert len(totals["employee_id"]) == employees
+    assert (totals["days_worked"] == workdays).all()
+    assert (totals["unmatched_punches"] == 0).all()
+    assert elapsed < 10